@@ -0,0 +1,52 @@
+* Смешение бензинов: 4 вида нефти, 2 марки, диапазоны спроса (RANGES)
+* OPTIMUM 129500
+NAME          BLEND
+OBJSENSE
+    MAX
+ROWS
+ N  PROFIT
+ L  AVCR1
+ L  AVCR2
+ L  AVCR3
+ L  AVCR4
+ G  OCREG
+ G  OCPRM
+ L  SUREG
+ L  SUPRM
+ E  DEMREG
+ E  DEMPRM
+COLUMNS
+    CR1REG    PROFIT    20             AVCR1     1
+    CR1REG    OCREG     -2             SUREG     0.1
+    CR1REG    DEMREG    1
+    CR2REG    PROFIT    14             AVCR2     1
+    CR2REG    OCREG     3              SUREG     -0.2
+    CR2REG    DEMREG    1
+    CR3REG    PROFIT    8              AVCR3     1
+    CR3REG    OCREG     10             SUREG     -0.7
+    CR3REG    DEMREG    1
+    CR4REG    PROFIT    23             AVCR4     1
+    CR4REG    OCREG     -6             SUREG     0.5
+    CR4REG    DEMREG    1
+    CR1PRM    PROFIT    29             AVCR1     1
+    CR1PRM    OCPRM     -7             SUPRM     0.4
+    CR1PRM    DEMPRM    1
+    CR2PRM    PROFIT    23             AVCR2     1
+    CR2PRM    OCPRM     -2             SUPRM     0.1
+    CR2PRM    DEMPRM    1
+    CR3PRM    PROFIT    17             AVCR3     1
+    CR3PRM    OCPRM     5              SUPRM     -0.4
+    CR3PRM    DEMPRM    1
+    CR4PRM    PROFIT    32             AVCR4     1
+    CR4PRM    OCPRM     -11            SUPRM     0.8
+    CR4PRM    DEMPRM    1
+RHS
+    RHS       AVCR1     3000           AVCR2     2500
+    RHS       AVCR3     1800           AVCR4     4000
+    RHS       DEMREG    2500           DEMPRM    1500
+RANGES
+    RNG       DEMREG    1500           DEMPRM    1200
+BOUNDS
+ UP BND       CR4PRM    500
+ LO BND       CR3PRM    200
+ENDATA
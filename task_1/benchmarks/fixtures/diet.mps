@@ -0,0 +1,46 @@
+* Задача о диете с верхними и нижними границами порций
+* OPTIMUM 32.8888888888889
+NAME          DIET
+ROWS
+ N  COST
+ G  CAL
+ G  PROT
+ L  FAT
+ G  CALC
+COLUMNS
+    BREAD     COST      2              CAL       90
+    BREAD     PROT      3              FAT       1
+    BREAD     CALC      6
+    MILK      COST      3.5            CAL       120
+    MILK      PROT      8              FAT       5
+    MILK      CALC      30
+    CHEESE    COST      8              CAL       106
+    CHEESE    PROT      7              FAT       9
+    CHEESE    CALC      20
+    POTATO    COST      1.5            CAL       97
+    POTATO    PROT      1.3            FAT       0.1
+    POTATO    CALC      1
+    FISH      COST      11             CAL       130
+    FISH      PROT      8              FAT       5
+    FISH      CALC      10
+    YOGURT    COST      1              CAL       180
+    YOGURT    PROT      9              FAT       2
+    YOGURT    CALC      18
+    BEANS     COST      2.5            CAL       150
+    BEANS     PROT      9              FAT       0.5
+    BEANS     CALC      4
+RHS
+    RHS       CAL       2000           PROT      55
+    RHS       FAT       70             CALC      80
+RANGES
+    RNG       CAL       400
+BOUNDS
+ UP BND       BREAD     6
+ UP BND       MILK      4
+ UP BND       CHEESE    3
+ UP BND       POTATO    5
+ UP BND       FISH      2
+ UP BND       YOGURT    3
+ UP BND       BEANS     4
+ LO BND       FISH      0.5
+ENDATA
@@ -0,0 +1,74 @@
+* Планирование производства на 6 периодов: запасы, сверхурочные, границы FX/MI
+* OPTIMUM 17180
+NAME          PLAN
+ROWS
+ N  COST
+ E  BAL1
+ E  BAL2
+ E  BAL3
+ E  BAL4
+ E  BAL5
+ E  BAL6
+ L  CAP1
+ L  CAP2
+ L  CAP3
+ L  CAP4
+ L  CAP5
+ L  CAP6
+ L  OTTOT
+COLUMNS
+    PROD1     COST      10             BAL1      1
+    PROD1     CAP1      1
+    OVT1      COST      15             BAL1      1
+    OVT1      OTTOT     1
+    INV1      COST      2              BAL1      -1
+    INV1      BAL2      1
+    PROD2     COST      11             BAL2      1
+    PROD2     CAP2      1
+    OVT2      COST      16             BAL2      1
+    OVT2      OTTOT     1
+    INV2      COST      2              BAL2      -1
+    INV2      BAL3      1
+    PROD3     COST      12             BAL3      1
+    PROD3     CAP3      1
+    OVT3      COST      17             BAL3      1
+    OVT3      OTTOT     1
+    INV3      COST      2              BAL3      -1
+    INV3      BAL4      1
+    PROD4     COST      13             BAL4      1
+    PROD4     CAP4      1
+    OVT4      COST      18             BAL4      1
+    OVT4      OTTOT     1
+    INV4      COST      2              BAL4      -1
+    INV4      BAL5      1
+    PROD5     COST      14             BAL5      1
+    PROD5     CAP5      1
+    OVT5      COST      19             BAL5      1
+    OVT5      OTTOT     1
+    INV5      COST      2              BAL5      -1
+    INV5      BAL6      1
+    PROD6     COST      15             BAL6      1
+    PROD6     CAP6      1
+    OVT6      COST      20             BAL6      1
+    OVT6      OTTOT     1
+    INV6      COST      2              BAL6      -1
+RHS
+    RHS       BAL1      120            BAL2      160
+    RHS       BAL3      300            BAL4      220
+    RHS       BAL5      180            BAL6      260
+    RHS       CAP1      200            CAP2      200
+    RHS       CAP3      200            CAP4      200
+    RHS       CAP5      200            CAP6      200
+    RHS       OTTOT     240
+BOUNDS
+ UP BND       OVT1      60
+ UP BND       OVT2      60
+ UP BND       OVT3      60
+ UP BND       OVT4      60
+ UP BND       OVT5      60
+ UP BND       OVT6      60
+ FX BND       INV6      40
+ UP BND       INV1      80
+ MI BND       INV2
+ UP BND       INV2      150
+ENDATA
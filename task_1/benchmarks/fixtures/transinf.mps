@@ -0,0 +1,43 @@
+* Транспортная задача: запасов меньше, чем спроса
+* STATUS infeasible
+NAME          TRANSINF
+ROWS
+ N  COST
+ L  S1
+ L  S2
+ L  S3
+ G  D1
+ G  D2
+ G  D3
+ G  D4
+COLUMNS
+    X11       COST      4              S1        1
+    X11       D1        1
+    X12       COST      6              S1        1
+    X12       D2        1
+    X13       COST      9              S1        1
+    X13       D3        1
+    X14       COST      5              S1        1
+    X14       D4        1
+    X21       COST      7              S2        1
+    X21       D1        1
+    X22       COST      3              S2        1
+    X22       D2        1
+    X23       COST      4              S2        1
+    X23       D3        1
+    X24       COST      8              S2        1
+    X24       D4        1
+    X31       COST      6              S3        1
+    X31       D1        1
+    X32       COST      5              S3        1
+    X32       D2        1
+    X33       COST      2              S3        1
+    X33       D3        1
+    X34       COST      7              S3        1
+    X34       D4        1
+RHS
+    RHS       S1        40             S2        35
+    RHS       S3        25             D1        30
+    RHS       D2        30             D3        25
+    RHS       D4        30
+ENDATA
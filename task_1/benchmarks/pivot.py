@@ -0,0 +1,96 @@
+"""
+Бенчмарк шага симплекс-метода (SimplexTable.pivot).
+
+Сравнивает векторизованный шаг с поэлементной реализацией на случайных
+таблицах разного размера и проверяет, что результаты совпадают бит в бит.
+
+Запуск из каталога task_1:
+    python -m benchmarks.pivot
+"""
+import time
+import numpy as np
+from src.simplex_table import SimplexTable
+from src.pricing import DantzigPricing
+from src.problem import CanonicalProblem
+
+# Размеры таблиц (строки, столбцы)
+SIZES = [(10, 20), (50, 100), (100, 200), (250, 500), (500, 1000), (1000, 2000)]
+
+# Для больших таблиц поэлементная версия слишком медленная
+REFERENCE_LIMIT = 500 * 1000
+
+
+def reference_pivot(table, pivot_row, pivot_col):
+    """Поэлементный шаг симплекс-метода (исходная реализация)"""
+    old_pivot = table[pivot_row, pivot_col]
+    old_row = table[pivot_row, :].copy()
+    old_col = table[:, pivot_col].copy()
+
+    table[pivot_row, pivot_col] = 1.0 / old_pivot
+
+    for j in range(table.shape[1]):
+        if j != pivot_col:
+            table[pivot_row, j] = old_row[j] / old_pivot
+
+    for i in range(table.shape[0]):
+        if i != pivot_row:
+            table[i, pivot_col] = -old_col[i] / old_pivot
+
+    for i in range(table.shape[0]):
+        if i != pivot_row:
+            for j in range(table.shape[1]):
+                if j != pivot_col:
+                    table[i, j] = table[i, j] - (old_row[j] * old_col[i]) / old_pivot
+
+
+def make_table(m, n, rng):
+    """
+    Симплекс-таблица задачи [A | I] со случайными данными (через конструктор,
+    чтобы все поля таблицы были заданы); элементы таблицы - случайные
+    """
+    problem = CanonicalProblem()
+    problem.A = np.hstack([rng.uniform(-10, 10, size=(m, n)), np.eye(m)])
+    problem.b = rng.uniform(0, 10, size=m)
+    problem.c = np.zeros(n + m)
+    table = SimplexTable(problem, np.arange(n, n + m), DantzigPricing())
+    table.table = rng.uniform(-10, 10, size=(m + 1, n + 1))
+    return table
+
+
+def time_pivots(table, pivots, step):
+    """Среднее время одного шага"""
+    start = time.perf_counter()
+    for row, col in pivots:
+        step(row, col)
+    return (time.perf_counter() - start) / len(pivots)
+
+
+def main():
+    rng = np.random.default_rng(0)
+
+    print(f"{'m x n':>12} {'векторно, мс':>14} {'поэлементно, мс':>16} {'ускорение':>10} {'совпадение':>11}")
+    for m, n in SIZES:
+        table = make_table(m, n, rng)
+        n_pivots = max(3, min(50, 2_000_000 // (m * n)))
+        pivots = [(rng.integers(m), rng.integers(n)) for _ in range(n_pivots)]
+        initial = table.table.copy()
+
+        fast = time_pivots(table, pivots, table.pivot)
+
+        if m * n <= REFERENCE_LIMIT:
+            reference = initial.copy()
+            pivots = pivots[:3]
+            slow = time_pivots(reference, pivots, lambda r, c: reference_pivot(reference, r, c))
+
+            check = make_table(m, n, rng)
+            check.table = initial.copy()
+            for row, col in pivots:
+                check.pivot(row, col)
+            same = np.array_equal(check.table, reference, equal_nan=True)
+            print(f"{m:>5} x {n:<5} {fast * 1e3:14.3f} {slow * 1e3:16.3f} {slow / fast:10.1f} {str(same):>11}")
+        else:
+            print(f"{m:>5} x {n:<5} {fast * 1e3:14.3f} {'-':>16} {'-':>10} {'-':>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Бенчмарк правил выбора разрешающего столбца.
+
+Для каждого правила (Данциг, наискорейшее ребро, Devex, частичный выбор)
+и обычного теста отношений / теста Харриса решает набор вырожденных задач
+и выводит суммарное число шагов симплекс-метода и время решения.
+
+Запуск из каталога task_1:
+    python -m benchmarks.pricing
+"""
+import time
+import numpy as np
+from src.problem import LinearProgrammingProblem
+from src.converter import to_canonical_form
+from src.solver import LinearProgrammingSolver
+from src.pricing import PRICING_RULES
+
+
+def klee_minty(n):
+    """Задача Кли-Минти: правило Данцига проходит все 2^n - 1 вершин"""
+    problem = LinearProgrammingProblem()
+    problem.objective = 'max'
+    problem.c = [2.0 ** (n - 1 - j) for j in range(n)]
+    for i in range(n):
+        coefficients = [2.0 ** (i - j + 1) for j in range(i)] + [1.0] + [0.0] * (n - i - 1)
+        problem.add_constraint(coefficients, '<=', 5.0 ** (i + 1))
+    problem.non_negative_vars = list(range(n))
+    return problem
+
+
+def transportation(m, n, rng):
+    """Транспортная задача с целочисленными запасами и потребностями (вырожденная)"""
+    supply = rng.integers(1, 6, m).astype(float)
+    demand = np.full(n, supply.sum() // n)
+    demand[: int(supply.sum() - demand.sum())] += 1
+
+    problem = LinearProgrammingProblem()
+    problem.objective = 'min'
+    problem.c = list(rng.integers(1, 10, m * n).astype(float))
+    for i in range(m):
+        coefficients = np.zeros(m * n)
+        coefficients[i * n:(i + 1) * n] = 1
+        problem.add_constraint(coefficients, '<=', supply[i])
+    for j in range(n):
+        coefficients = np.zeros(m * n)
+        coefficients[j::n] = 1
+        problem.add_constraint(coefficients, '>=', demand[j])
+    problem.non_negative_vars = list(range(m * n))
+    return problem
+
+
+def assignment(n, rng):
+    """Задача о назначениях: n строк и n столбцов с правыми частями 1"""
+    problem = transportation(n, n, rng)
+    problem.set_constraints(problem.rows.view, problem.cols.view, problem.values.view,
+                            ['='] * (2 * n), np.ones(2 * n))
+    return problem
+
+
+def degenerate_cone(m, n, rng):
+    """Конус a_i x <= 0 с ограничением sum x <= 10: все шаги из начальной вершины вырождены"""
+    problem = LinearProgrammingProblem()
+    problem.objective = 'max'
+    problem.c = list(rng.integers(1, 10, n).astype(float))
+    for _ in range(m):
+        problem.add_constraint(rng.integers(-5, 6, n).astype(float), '<=', 0.0)
+    problem.add_constraint(np.ones(n), '<=', 10.0)
+    problem.non_negative_vars = list(range(n))
+    return problem
+
+
+def make_problems(rng):
+    problems = [(f"klee-minty {n}", klee_minty(n)) for n in (4, 5, 6)]
+    problems += [(f"transport {m}x{n}", transportation(m, n, rng)) for m, n in ((4, 5), (5, 6), (6, 6))]
+    problems += [(f"assignment {n}", assignment(n, rng)) for n in (4, 5, 6)]
+    problems += [(f"cone {m}x{n}", degenerate_cone(m, n, rng)) for m, n in ((10, 8), (20, 12), (30, 20))]
+    return problems
+
+
+def run(problems, pricing, harris):
+    """Суммарное число шагов, время и число задач, решенных без ошибок"""
+    iterations, elapsed, solved = 0, 0.0, 0
+    for _, problem in problems:
+        canonical = to_canonical_form(problem)
+        solver = LinearProgrammingSolver(pricing=pricing, harris=harris)
+        start = time.perf_counter()
+        try:
+            solver.solve(canonical)
+            solved += 1
+        except ValueError:
+            pass
+        elapsed += time.perf_counter() - start
+        iterations += solver.iterations
+    return iterations, elapsed, solved
+
+
+def main():
+    rng = np.random.default_rng(0)
+    problems = make_problems(rng)
+
+    print(f"Задач: {len(problems)} ({', '.join(name for name, _ in problems)})\n")
+    print(f"{'правило':>10} {'Харрис':>7} {'шагов':>7} {'время, мс':>10} {'решено':>7}")
+    for pricing in PRICING_RULES:
+        for harris in (False, True):
+            iterations, elapsed, solved = run(problems, pricing, harris)
+            print(f"{pricing:>10} {'да' if harris else 'нет':>7} {iterations:>7} "
+                  f"{elapsed * 1e3:10.1f} {solved:>4}/{len(problems)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,378 @@
+"""
+Набор тестовых задач ЛП и контроль регрессий производительности.
+
+Генерирует случайные разреженные задачи четырех видов (допустимые,
+несовместные, неограниченные, вырожденные) размером от 10 до 10^4 строк
+и добавляет задачи-образцы в формате MPS из benchmarks/fixtures (в стиле
+Netlib: туда же можно положить и настоящие задачи Netlib). Каждая задача
+записывается в MPS и решается каждым методом; замеряется время разбора
+файла, приведения к канонической форме, этапа 1 (вспомогательная задача)
+и этапа 2 (основная задача), а также число шагов.
+
+Результаты сохраняются в JSON (--save) и сравниваются с сохраненными ранее,
+например для предыдущего коммита (--compare): если время решения или число
+шагов выросло больше порога либо изменился статус, программа завершается
+с кодом 1. Код 1 возвращается и тогда, когда какая-либо задача решена
+неверно (статус или значение цели не совпали с ожидаемыми).
+
+Запуск из каталога task_1:
+    python -m benchmarks.suite --save base.json
+    python -m benchmarks.suite --compare base.json
+    python -m benchmarks.suite --sizes 10 100 1000 10000 --methods revised interior
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+from src.problem import LinearProgrammingProblem
+from src.reader import read_problem_from_file
+from src.converter import to_canonical_form, SCALING_METHODS
+from src.solver import LinearProgrammingSolver
+
+KINDS = ('feasible', 'infeasible', 'unbounded', 'degenerate')
+SIZES = (10, 100, 1000)
+METHODS = ('tableau', 'revised', 'interior')
+
+# Ожидаемый статус решения для каждого вида задач
+EXPECTED_STATUS = {'feasible': 'solved', 'infeasible': 'infeasible',
+                   'unbounded': 'unbounded', 'degenerate': 'solved'}
+
+# Наибольшее число строк, при котором задача решается методом: симплекс-таблице
+# и модифицированному симплекс-методу с плотными обратными множителями LU нужно
+# O(m) шагов по O(m^2) операций, метод внутренней точки хранит плотные матрицы
+# m x m. Для больших задач замеряются только разбор и приведение к канонической форме
+MAX_ROWS = {'tableau': 300, 'revised': 300, 'interior': 1000}
+
+# Пороги регрессии: относительный рост времени и числа шагов; изменения времени
+# меньше TIME_NOISE секунд считаются шумом измерения
+TIME_THRESHOLD = 0.25
+PIVOT_THRESHOLD = 0.10
+TIME_NOISE = 0.005
+
+# Ненулевых коэффициентов в строке случайной задачи
+ROW_NONZEROS = 5
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+def _random_rows(m, n, rng, low, high):
+    """Тройки (строка, столбец, значение): ROW_NONZEROS различных столбцов в каждой строке"""
+    k = min(ROW_NONZEROS, n)
+    cols = np.concatenate([rng.choice(n, k, replace=False) for _ in range(m)])
+    rows = np.repeat(np.arange(m), k)
+    values = rng.integers(low, high, m * k).astype(float)
+    return rows, cols, values
+
+
+def feasible(m, rng):
+    """
+    max c x при A x <= b (3/4 строк) и A x >= b (1/4 строк), A >= 0, c > 0.
+    Точка x0 > 0 допустима, поэтому задача совместна; каждый столбец входит
+    в какое-нибудь ограничение <=, поэтому цель ограничена. Ограничения >= с
+    положительной правой частью требуют этапа 1.
+    """
+    n = 2 * m
+    m_le = m - m // 4
+    rows, cols, values = _random_rows(m, n, rng, 1, 10)
+    # Каждый столбец - хотя бы в одной строке <=
+    rows = np.concatenate([rows, np.arange(n) % m_le])
+    cols = np.concatenate([cols, np.arange(n)])
+    values = np.concatenate([values, rng.integers(1, 10, n).astype(float)])
+
+    x0 = rng.uniform(0.0, 1.0, n)
+    activity = np.bincount(rows, values * x0[cols], minlength=m)
+    constants = np.where(np.arange(m) < m_le, activity + rng.uniform(1.0, 5.0, m), 0.5 * activity)
+
+    problem = LinearProgrammingProblem()
+    problem.objective = 'max'
+    problem.c = list(rng.integers(1, 10, n).astype(float))
+    problem.set_constraints(rows, cols, values, ['<='] * m_le + ['>='] * (m - m_le), constants)
+    problem.non_negative_vars = list(range(n))
+    return problem
+
+
+def infeasible(m, rng):
+    """Допустимая задача с противоречащим ограничением a_1 x >= b_1 + 1 к строке a_1 x <= b_1"""
+    problem = feasible(m - 1, rng)
+    first = problem.rows.view == 0
+    problem.add_constraints(np.zeros(np.count_nonzero(first), dtype=np.int64), problem.cols.view[first],
+                            problem.values.view[first], ['>='], [problem.constants.view[0] + 1.0])
+    return problem
+
+
+def unbounded(m, rng):
+    """Допустимая задача с переменной, входящей только в ограничения >= с положительными коэффициентами"""
+    problem = feasible(m, rng)
+    n = len(problem.c)
+    ge = np.flatnonzero(np.array(problem.inequalities) == '>=')
+    rows, cols, values = problem.rows.view, problem.cols.view, problem.values.view
+    problem.set_constraints(np.concatenate([rows, ge]), np.concatenate([cols, np.full(len(ge), n)]),
+                            np.concatenate([values, np.ones(len(ge))]),
+                            problem.inequalities, problem.constants.view)
+    problem.c.append(1.0)
+    problem.non_negative_vars.append(n)
+    return problem
+
+
+def degenerate(m, rng):
+    """Конус a_i x <= 0 со знакопеременными a_i и ограничением sum x <= 10: все b_i = 0"""
+    n = 2 * m
+    rows, cols, values = _random_rows(m - 1, n, rng, -5, 6)
+    rows = np.concatenate([rows, np.full(n, m - 1)])
+    cols = np.concatenate([cols, np.arange(n)])
+    values = np.concatenate([values, np.ones(n)])
+
+    problem = LinearProgrammingProblem()
+    problem.objective = 'max'
+    problem.c = list(rng.integers(1, 10, n).astype(float))
+    problem.set_constraints(rows, cols, values, ['<='] * m, np.concatenate([np.zeros(m - 1), [10.0]]))
+    problem.non_negative_vars = list(range(n))
+    return problem
+
+
+GENERATORS = {'feasible': feasible, 'infeasible': infeasible,
+              'unbounded': unbounded, 'degenerate': degenerate}
+
+MPS_ROW_CODES = {'<=': 'L', '=': 'E', '>=': 'G'}
+
+
+def write_mps(problem, filename, name='PROBLEM'):
+    """Запись задачи (с неотрицательными переменными) в свободном формате MPS"""
+    A = problem.constraint_matrix().tocsc()
+    n = len(problem.c)
+    lines = [f"NAME          {name}"]
+    if problem.objective == 'max':
+        lines += ["OBJSENSE", "    MAX"]
+    lines += ["ROWS", " N  OBJ"]
+    lines += [f" {MPS_ROW_CODES[inequality]}  R{i + 1}" for i, inequality in enumerate(problem.inequalities)]
+    lines.append("COLUMNS")
+    for j in range(n):
+        if problem.c[j]:
+            lines.append(f"    X{j + 1}  OBJ  {problem.c[j]:.17g}")
+        start, end = A.indptr[j], A.indptr[j + 1]
+        lines += [f"    X{j + 1}  R{i + 1}  {value:.17g}"
+                  for i, value in zip(A.indices[start:end], A.data[start:end])]
+    lines.append("RHS")
+    lines += [f"    RHS  R{i + 1}  {value:.17g}" for i, value in enumerate(problem.constants.view) if value]
+    lines.append("ENDATA")
+    with open(filename, 'w', encoding='utf-8') as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def read_fixture_header(filename):
+    """
+    Ожидаемый результат задачи-образца из комментариев в начале файла:
+    "* OPTIMUM <значение>" или "* STATUS <статус>"
+    """
+    status, objective = 'solved', None
+    with open(filename, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.startswith('*'):
+                break
+            fields = line[1:].split()
+            if len(fields) == 2 and fields[0].upper() == 'OPTIMUM':
+                objective = float(fields[1])
+            elif len(fields) == 2 and fields[0].upper() == 'STATUS':
+                status = fields[1].lower()
+    return status, objective
+
+
+def make_problems(kinds, sizes, directory, rng):
+    """Файлы задач: (имя, вид, файл, ожидаемый статус, ожидаемое значение цели)"""
+    problems = []
+    for size in sizes:
+        for kind in kinds:
+            name = f"{kind}-{size}"
+            filename = os.path.join(directory, f"{name}.mps")
+            write_mps(GENERATORS[kind](size, rng), filename, name.upper())
+            problems.append((name, kind, filename, EXPECTED_STATUS[kind], None))
+
+    if os.path.isdir(FIXTURES_DIR):
+        for filename in sorted(os.listdir(FIXTURES_DIR)):
+            if filename.lower().endswith('.mps'):
+                path = os.path.join(FIXTURES_DIR, filename)
+                status, objective = read_fixture_header(path)
+                problems.append((os.path.splitext(filename)[0], 'fixture', path, status, objective))
+    return problems
+
+
+def run_one(filename, method, repeat, scaling=None):
+    """
+    Разбор, приведение к канонической форме и решение задачи методом method.
+    Время каждого этапа - наименьшее из repeat повторов.
+    """
+    times = {}
+    record = {}
+    for _ in range(repeat):
+        start = time.perf_counter()
+        problem = read_problem_from_file(filename)
+        parsed = time.perf_counter()
+        canonical = to_canonical_form(problem, sparse=True, bounded=method != 'revised',
+                                      scaling=scaling)
+        canonicalized = time.perf_counter()
+        sample = {'parse': parsed - start, 'canonicalize': canonicalized - parsed}
+
+        m = canonical.A.shape[0]
+        if m > MAX_ROWS[method]:
+            record = {'status': 'skipped', 'objective': None, 'iterations': 0, 'phases': {}, 'rows': m}
+        else:
+            solver = LinearProgrammingSolver(method=method)
+            solve_start = time.perf_counter()
+            try:
+                _, objective = solver.solve(canonical)
+                if problem.objective == 'max':
+                    objective = -objective
+            except (ValueError, np.linalg.LinAlgError):
+                objective = None
+            sample['solve'] = time.perf_counter() - solve_start
+            for phase, values in solver.phases.items():
+                sample[phase] = values['time']
+            record = {'status': solver.status, 'objective': objective, 'iterations': solver.iterations,
+                      'phases': {phase: values['iterations'] for phase, values in solver.phases.items()},
+                      'rows': m}
+        for key, value in sample.items():
+            times[key] = min(times.get(key, np.inf), value)
+
+    record['times'] = times
+    return record
+
+
+def check(record, status, objective, reference):
+    """Замечание о неверном результате (или None): статус, значение цели, расхождение методов"""
+    if record['status'] == 'skipped':
+        return None
+    if record['status'] != status:
+        return f"статус {record['status']}, ожидался {status}"
+    value = record['objective']
+    for expected in (objective, reference):
+        if value is not None and expected is not None and \
+                abs(value - expected) > 1e-6 * max(1.0, abs(expected)):
+            return f"цель {value:.8g}, ожидалось {expected:.8g}"
+    return None
+
+
+def run_suite(problems, methods, repeat, scaling=None):
+    results = []
+    for name, kind, filename, status, objective in problems:
+        reference = None  # Значение цели первого метода - для сравнения остальных
+        for method in methods:
+            record = run_one(filename, method, repeat, scaling)
+            record.update({'name': name, 'kind': kind, 'method': method,
+                           'problem': f"{name}:{method}",
+                           'error': check(record, status, objective, reference)})
+            if record['status'] == 'solved' and reference is None:
+                reference = record['objective']
+            results.append(record)
+            print_record(record)
+    return results
+
+
+def print_header():
+    print(f"{'задача':>20} {'метод':>9} {'статус':>12} {'шагов':>6} {'разбор':>8} {'канон.':>8} "
+          f"{'этап 1':>8} {'этап 2':>8} {'решение':>9}  (мс)")
+
+
+def print_record(record):
+    times = record['times']
+    columns = [f"{times[key] * 1e3:8.1f}" if key in times else f"{'-':>8}"
+               for key in ('parse', 'canonicalize', 'phase1', 'phase2')]
+    solve = f"{times['solve'] * 1e3:9.1f}" if 'solve' in times else f"{'-':>9}"
+    line = (f"{record['name']:>20} {record['method']:>9} {record['status']:>12} "
+            f"{record['iterations']:>6} {' '.join(columns)} {solve}")
+    if record['error']:
+        line += f"  ОШИБКА: {record['error']}"
+    print(line)
+
+
+def git_commit():
+    """Текущий коммит репозитория (None вне git)"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, time_threshold, pivot_threshold):
+    """Список регрессий относительно сохраненных результатов baseline"""
+    previous = {record['problem']: record for record in baseline['results']}
+    regressions = []
+    for record in results:
+        old = previous.get(record['problem'])
+        if old is None:
+            continue
+        if record['status'] != old['status']:
+            regressions.append(f"{record['problem']}: статус {old['status']} -> {record['status']}")
+            continue
+        for key in ('parse', 'canonicalize', 'solve'):
+            new_time, old_time = record['times'].get(key), old['times'].get(key)
+            if new_time is None or old_time is None:
+                continue
+            if new_time > old_time * (1 + time_threshold) and new_time - old_time > TIME_NOISE:
+                regressions.append(f"{record['problem']}: время ({key}) {old_time * 1e3:.1f} -> "
+                                   f"{new_time * 1e3:.1f} мс")
+        if record['iterations'] > old['iterations'] * (1 + pivot_threshold):
+            regressions.append(f"{record['problem']}: шагов {old['iterations']} -> {record['iterations']}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Набор тестовых задач ЛП и контроль регрессий")
+    parser.add_argument("--sizes", type=int, nargs='+', default=list(SIZES),
+                        help="Число строк случайных задач (от 10 до 10000)")
+    parser.add_argument("--kinds", nargs='+', choices=KINDS, default=list(KINDS))
+    parser.add_argument("--methods", nargs='+', choices=METHODS, default=list(METHODS))
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Число повторов: время этапа - наименьшее из повторов")
+    parser.add_argument("--scaling", choices=SCALING_METHODS, default=None,
+                        help="Масштабирование при приведении к канонической форме")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", help="Файл JSON для сохранения результатов")
+    parser.add_argument("--compare", help="Файл JSON с результатами для сравнения")
+    parser.add_argument("--time-threshold", type=float, default=TIME_THRESHOLD,
+                        help="Допустимый относительный рост времени")
+    parser.add_argument("--pivot-threshold", type=float, default=PIVOT_THRESHOLD,
+                        help="Допустимый относительный рост числа шагов")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    with tempfile.TemporaryDirectory() as directory:
+        problems = make_problems(args.kinds, args.sizes, directory, rng)
+        print(f"Задач: {len(problems)}, методы: {', '.join(args.methods)}, повторов: {args.repeat}\n")
+        print_header()
+        results = run_suite(problems, args.methods, args.repeat, args.scaling)
+
+    errors = [record for record in results if record['error']]
+    print(f"\nНеверных результатов: {len(errors)}")
+
+    if args.save:
+        report = {'commit': git_commit(), 'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+                  'python': platform.python_version(), 'numpy': np.__version__,
+                  'seed': args.seed, 'repeat': args.repeat, 'scaling': args.scaling,
+                  'results': results}
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=1)
+        print(f"Результаты сохранены в {args.save}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.time_threshold, args.pivot_threshold)
+        print(f"\nСравнение с {args.compare} (коммит {baseline.get('commit')}): "
+              f"регрессий {len(regressions)}")
+        for regression in regressions:
+            print(f"  {regression}")
+        if regressions:
+            sys.exit(1)
+
+    if errors:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+* Задача из data/input.txt в формате MPS
+NAME          EXAMPLE
+OBJSENSE
+    MAX
+ROWS
+ N  OBJ
+ L  C1
+ E  C2
+ G  C3
+COLUMNS
+    X1        OBJ       2              C1        1
+    X1        C2        1
+    X2        OBJ       1              C1        2
+    X2        C3        1
+    X3        OBJ       3              C1        1
+    X3        C2        1
+    X4        OBJ       2              C2        1
+    X4        C3        1
+RHS
+    RHS       C1        11             C2        8
+    RHS       C3        3
+ENDATA
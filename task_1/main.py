@@ -1,85 +1,122 @@
-import sys
+import argparse
 import os
-from src.problem import LinearProgrammingProblem
-from src.converter import to_canonical_form, get_original_solution
-from src.solver import LinearProgrammingSolver
+from contextlib import nullcontext
+import numpy as np
+from src.reader import read_problem_from_file
+from src.converter import to_canonical_form, get_original_solution, SCALING_METHODS
+from src.solver import LinearProgrammingSolver, METHODS, DUAL_MODES
+from src.batch import ProblemFamily, solve_batch, write_results
+from src.trace import Trace, LEVELS, SUMMARY
+from src.pricing import PRICING_RULES
+from src.presolve import presolve
+from src.branch_and_bound import BranchAndBoundSolver, NODE_SELECTION
 
-def read_problem_from_file(filename):
-    """Чтение задачи из файла"""
-    problem = LinearProgrammingProblem()
+# Задачи с большим числом строк не выводятся в журнал целиком: текст задачи
+# (строка на каждое ограничение) формируется дольше, чем она решается
+MAX_LOGGED_ROWS = 1000
+
+def parse_args():
+    """Разбор аргументов командной строки"""
+    parser = argparse.ArgumentParser(
+        description="Решение задачи линейного программирования симплекс-методом",
+        epilog="Пример: python main.py data/input.txt")
+    parser.add_argument("filenames", nargs="+", metavar="filename", help="файл с задачей")
+    parser.add_argument("--method", choices=METHODS, default="tableau",
+                        help="tableau - симплекс-таблица (по умолчанию), "
+                             "revised - модифицированный симплекс-метод с LU-разложением базиса, "
+                             "interior - метод внутренней точки, auto - выбор по размеру задачи")
+    parser.add_argument("--no-crossover", action="store_true",
+                        help="не переходить от решения метода внутренней точки к вершине")
+    parser.add_argument("--sparse", action="store_true",
+                        help="хранить матрицу ограничений в разреженном формате")
+    parser.add_argument("--pricing", choices=PRICING_RULES, default="dantzig",
+                        help="правило выбора разрешающего столбца: dantzig (по умолчанию), "
+                             "steepest - наискорейшее ребро, devex, partial - частичный выбор, "
+                             "bland - правило Бланда")
+    parser.add_argument("--harris", action="store_true",
+                        help="двухпроходный тест отношений Харриса")
+    parser.add_argument("--dual", choices=DUAL_MODES, default="auto",
+                        help="двойственный симплекс-метод без вспомогательной задачи: auto - если "
+                             "базис из фиктивных переменных двойственно допустим (по умолчанию)")
+    parser.add_argument("--scaling", choices=SCALING_METHODS, default=None,
+                        help="масштабирование строк и столбцов матрицы ограничений: geometric - "
+                             "геометрическое среднее, equilibration - по наибольшему элементу")
+    parser.add_argument("--presolve", action="store_true",
+                        help="упростить задачу перед приведением к канонической форме")
+    parser.add_argument("--trace", choices=LEVELS, default="tables",
+                        help="подробность журнала: summary - только итоги, pivots - разрешающие "
+                             "элементы шагов, tables - все симплекс-таблицы (по умолчанию)")
+    parser.add_argument("--dump", metavar="FILE",
+                        help="записывать симплекс-таблицы в двоичный файл "
+                             "(вывод: python -m src.trace FILE)")
     
-    with open(filename, 'r', encoding='utf-8') as f:
-        lines = [line.strip() for line in f if line.strip()]
+    integer = parser.add_argument_group("целочисленные переменные (метод ветвей и границ)")
+    integer.add_argument("--node-selection", choices=NODE_SELECTION, default="best",
+                         help="выбор узла: best - с наименьшей оценкой (по умолчанию), "
+                              "depth - поиск в глубину")
+    integer.add_argument("--max-nodes", type=int, default=1000,
+                         help="наибольшее число узлов дерева (по умолчанию 1000)")
     
-    # Парсинг целевой функции
-    objective_line = lines[0].lower()
-    if objective_line.startswith('max'):
-        problem.objective = 'max'
-        coefficients = list(map(float, objective_line[3:].split()))
-    elif objective_line.startswith('min'):
-        problem.objective = 'min'
-        coefficients = list(map(float, objective_line[3:].split()))
+    batch = parser.add_argument_group("пакетный режим")
+    batch.add_argument("--batch", metavar="OUTPUT",
+                       help="решить все задачи в пуле процессов и записать результаты "
+                            "в один файл (*.csv или *.json)")
+    batch.add_argument("--processes", type=int, default=None,
+                       help="число процессов (по умолчанию - число ядер; "
+                            "для метода ветвей и границ - 1)")
+    batch.add_argument("--rhs", metavar="FILE",
+                       help="семейство задач: матрица правых частей (строка - вектор b)")
+    batch.add_argument("--costs", metavar="FILE",
+                       help="семейство задач: матрица коэффициентов целевой функции (строка - вектор c)")
+    batch.add_argument("--warm-start", action="store_true",
+                       help="семейство задач: решать каждую задачу из оптимального базиса предыдущей")
+    return parser.parse_args()
+
+def run_batch(args):
+    """Пакетное решение: много файлов или семейство задач с общей матрицей A"""
+    if args.rhs or args.costs:
+        base = read_problem_from_file(args.filenames[0])
+        rhs = np.loadtxt(args.rhs, ndmin=2) if args.rhs else None
+        costs = np.loadtxt(args.costs, ndmin=2) if args.costs else None
+        problems = ProblemFamily(base, rhs, costs)
     else:
-        raise ValueError("Неверный формат целевой функции")
-    
-    problem.c = coefficients
+        problems = args.filenames
     
-    problem.non_negative_vars = []
-    
-    # Парсинг ограничений и информации о переменных
-    for line in lines[1:]:
-        line_lower = line.lower()
-        
-        if line_lower.startswith('var'):
-            # Обработка информации о переменных
-            parts = line_lower.split()
-            if '>=' in parts:
-                idx = parts.index('>=')
-                # Собираем все числа до '>='
-                var_indices = []
-                for part in parts[1:idx]:
-                    if part.isdigit():
-                        var_indices.append(int(part) - 1)  # Переводим в 0-based индексы
-                problem.non_negative_vars = var_indices
-            continue
-            
-        if '<=' in line:
-            idx = line.index('<=')
-            coeffs_str = line[:idx].strip()
-            constant_str = line[idx+2:].strip()
-            coeffs = list(map(float, coeffs_str.split()))
-            constant = float(constant_str)
-            problem.add_constraint(coeffs, '<=', constant)
-        elif '>=' in line:
-            idx = line.index('>=')
-            coeffs_str = line[:idx].strip()
-            constant_str = line[idx+2:].strip()
-            coeffs = list(map(float, coeffs_str.split()))
-            constant = float(constant_str)
-            problem.add_constraint(coeffs, '>=', constant)
-        elif '=' in line:
-            idx = line.index('=')
-            coeffs_str = line[:idx].strip()
-            constant_str = line[idx+1:].strip()
-            coeffs = list(map(float, coeffs_str.split()))
-            constant = float(constant_str)
-            problem.add_constraint(coeffs, '=', constant)
+    results = solve_batch(problems, method=args.method, sparse=args.sparse,
+                          processes=args.processes, warm_start=args.warm_start)
+    write_results(results, args.batch)
     
-    return problem
+    solved = sum(1 for r in results if r['status'] == "solved")
+    print(f"Решено задач: {solved} из {len(results)}")
+    print(f"Результаты сохранены в файл: {args.batch}")
+
+def write_problem(log_file, problem, m, n, level):
+    """Запись задачи в журнал: целиком, если она невелика и журнал подробнее summary, иначе - размер"""
+    if m <= MAX_LOGGED_ROWS and level > SUMMARY:
+        log_file.write(str(problem) + "\n")
+    else:
+        log_file.write(f"Ограничений: {m}, переменных: {n}\n")
 
 def main():
-    if len(sys.argv) != 2:
-        print("Использование: python main.py <файл_с_задачей>")
-        print("Пример: python main.py data/input1.txt")
+    args = parse_args()
+    
+    if args.batch or args.rhs or args.costs or len(args.filenames) > 1:
+        if not args.batch:
+            print("Для нескольких задач укажите файл результатов: --batch results.csv")
+            return
+        run_batch(args)
         return
     
     try:
         # Создаем файл для записи лога
-        input_filename = sys.argv[1]
+        input_filename = args.filenames[0]
         base_name = os.path.splitext(input_filename)[0]
         log_filename = f"{base_name}_solution.txt"
         
-        with open(log_filename, 'w', encoding='utf-8') as log_file:
+        with open(log_filename, 'w', encoding='utf-8') as log_file, \
+                (open(args.dump, 'wb') if args.dump else nullcontext()) as dump_file:
+            trace = Trace(log_file, args.trace, dump_file)
+            
             # Чтение и преобразование задачи
             log_file.write("=== РЕШЕНИЕ ЗАДАЧИ ЛИНЕЙНОГО ПРОГРАММИРОВАНИЯ ===\n\n")
             
@@ -87,17 +124,33 @@ def main():
             problem = read_problem_from_file(input_filename)
             
             log_file.write("\n=== ИСХОДНАЯ ЗАДАЧА ===\n")
-            log_file.write(str(problem) + "\n")
+            write_problem(log_file, problem, problem.num_constraints, problem.num_vars, trace.level)
+            
+            reduced_problem = problem
+            if args.presolve:
+                log_file.write("\n=== ПРЕДВАРИТЕЛЬНАЯ ОБРАБОТКА ===\n")
+                reduced_problem = presolve(problem, trace)
             
             log_file.write("\nПреобразование к канонической форме...\n")
-            canonical_problem = to_canonical_form(problem)
+            # Границы переменных без дополнительных строк обрабатывают все методы, кроме revised
+            canonical_problem = to_canonical_form(reduced_problem, sparse=args.sparse,
+                                                  bounded=args.method != 'revised',
+                                                  scaling=args.scaling)
             
             log_file.write("\n=== КАНОНИЧЕСКАЯ ФОРМА ===\n")
-            log_file.write(str(canonical_problem) + "\n")
+            write_problem(log_file, canonical_problem, *canonical_problem.A.shape, trace.level)
             
             # Решение
-            solver = LinearProgrammingSolver()
-            solution, objective_value = solver.solve(canonical_problem, log_file)
+            options = dict(method=args.method, pricing=args.pricing, harris=args.harris,
+                           dual=args.dual, crossover=not args.no_crossover)
+            if problem.integer_vars:
+                solver = BranchAndBoundSolver(node_selection=args.node_selection,
+                                              processes=args.processes or 1,
+                                              max_nodes=args.max_nodes, **options)
+                solution, objective_value = solver.solve(canonical_problem, problem.integer_vars, trace)
+            else:
+                solver = LinearProgrammingSolver(**options)
+                solution, objective_value = solver.solve(canonical_problem, trace)
             
             # Вывод результатов
             log_file.write("\n=== РЕЗУЛЬТАТ ===\n")
@@ -105,26 +158,35 @@ def main():
             # Преобразуем решение к исходным переменным
             original_solution = get_original_solution(canonical_problem, solution)
             
+            var_names = problem.var_names or [f"x{i+1}" for i in range(len(original_solution))]
             log_file.write("Оптимальное решение:\n")
-            for i, val in enumerate(original_solution):
-                log_file.write(f"x{i+1} = {val:.6f}\n")
+            for name, val in zip(var_names, original_solution):
+                log_file.write(f"{name} = {val:.6f}\n")
             
             # Корректировка значения целевой функции для исходной задачи
             if problem.objective == 'max':
                 final_objective = -objective_value
             else:
                 final_objective = objective_value
+            if canonical_problem.postsolve is not None:
+                final_objective = canonical_problem.postsolve.objective(final_objective)
                 
             log_file.write(f"Значение целевой функции: {final_objective:.6f}\n")
         
         print(f"Решение сохранено в файл: {log_filename}")
+        if args.dump:
+            print(f"Симплекс-таблицы сохранены в файл: {args.dump}")
         
         # Также выводим результат в консоль
         print("\n=== РЕЗУЛЬТАТ ===")
         print("Оптимальное решение:")
-        for i, val in enumerate(original_solution):
-            print(f"x{i+1} = {val:.6f}")
+        for name, val in zip(var_names, original_solution):
+            print(f"{name} = {val:.6f}")
         print(f"Значение целевой функции: {final_objective:.6f}")
+        if problem.integer_vars:
+            metrics = solver.metrics
+            print(f"Узлов: {metrics['nodes']} ({metrics['nodes_per_second']:.1f} узлов/с), "
+                  f"разрыв: {metrics['gap']:.2e}")
         
     except Exception as e:
         print(f"Ошибка: {e}")
@@ -1,13 +1,20 @@
 import numpy as np
 from .problem import CanonicalProblem
-from .simplex_table import SimplexTable
+from .simplex_table import SimplexTable, BOUND_FLIP
+from .sparse import AugmentedMatrix
+from .trace import as_trace, SUMMARY, PIVOTS
 
 class AuxiliaryProblemSolver:
     """Решение вспомогательной задачи"""
     
-    def __init__(self, canonical_problem):
+    def __init__(self, canonical_problem, pricing=None, harris=False, max_iterations=None):
         self.original = canonical_problem
+        self.pricing = pricing
+        self.harris = harris
+        self.max_iterations = max_iterations  # None - 10 * (m + n)
         self.auxiliary = None
+        self.iterations = 0
+        self.status = "not solved"
     
     def create_auxiliary_problem(self):
         """Создание вспомогательной задачи"""
@@ -18,11 +25,9 @@ class AuxiliaryProblemSolver:
         auxiliary_c = np.zeros(n + m)
         auxiliary_c[n:] = 1  # Коэффициенты для вспомогательных переменных
         
-        # Матрица ограничений
-        auxiliary_A = np.zeros((m, n + m))
-        auxiliary_A[:, :n] = self.original.A
-        for i in range(m):
-            auxiliary_A[i, n + i] = 1  # Вспомогательная переменная
+        # Матрица ограничений [A | I]: единичный блок вспомогательных
+        # переменных не строится явно
+        auxiliary_A = AugmentedMatrix(self.original.A)
         
         auxiliary_b = self.original.b.copy()
         
@@ -36,11 +41,17 @@ class AuxiliaryProblemSolver:
         self.auxiliary.b = auxiliary_b
         self.auxiliary.var_names = auxiliary_var_names
         self.auxiliary.original_var_count = self.original.original_var_count
+        if self.original.upper is not None:
+            self.auxiliary.upper = np.concatenate([self.original.upper, np.full(m, np.inf)])
         
         return self.auxiliary
     
     def solve(self, log_file=None):
-        """Решение вспомогательной задачи и возврат таблицы для основной задачи"""
+        """
+        Решение вспомогательной задачи и возврат таблицы для основной задачи.
+        log_file - файл журнала или Trace.
+        """
+        trace = as_trace(log_file)
         if self.auxiliary is None:
             self.create_auxiliary_problem()
         
@@ -48,53 +59,104 @@ class AuxiliaryProblemSolver:
         n_original = len(self.original.c)
         initial_basis = list(range(n_original, n_original + self.original.A.shape[0]))
         
-        table = SimplexTable(self.auxiliary, initial_basis)
+        table = SimplexTable(self.auxiliary, initial_basis, self.pricing, self.harris)
         
-        if log_file:
-            log_file.write("Начальная симплекс-таблица вспомогательной задачи:\n")
-            log_file.write(str(table) + "\n")
+        trace.table(table, "Начальная симплекс-таблица вспомогательной задачи:\n")
         
         # Решаем вспомогательную задачу
+        max_iterations = self.max_iterations or 10 * sum(self.original.A.shape)
         iteration = 0
-        while iteration < 100:
-            pivot_row, pivot_col = table.find_pivot()
+        while iteration < max_iterations:
+            if table.needs_rebuild:
+                table.rebuild()
+                trace.message(PIVOTS, "\nТаблица пересчитана по базису\n")
             
-            if pivot_row is None:
-                break
+            if not table.is_primal_feasible():
+                # После снятия возмущения правых частей решение может стать
+                # недопустимым: допустимость восстанавливается двойственными шагами
+                pivot_row, pivot_col = table.find_dual_pivot()
+                trace.message(PIVOTS, "\nШаг {} (двойственный):\nРазрешающий элемент: строка {}, столбец {}\n",
+                              iteration + 1, pivot_row, pivot_col)
+                table.pivot(pivot_row, pivot_col, dual=True)
+            else:
+                pivot_row, pivot_col = table.find_pivot()
                 
-            if log_file:
-                log_file.write(f"\nШаг {iteration + 1}:\n")
-                log_file.write(f"Разрешающий элемент: строка {pivot_row}, столбец {pivot_col}\n")
-            
-            table.pivot(pivot_row, pivot_col)
+                if pivot_row is None and table.perturbation is not None:
+                    table.remove_perturbation()
+                    trace.message(PIVOTS, "\nВозмущение правых частей снято\n")
+                    continue
+                
+                if pivot_row is None:
+                    break
+                    
+                if pivot_row == BOUND_FLIP:
+                    trace.message(PIVOTS, "\nШаг {}:\nПеременная {} переходит на другую границу\n",
+                                  iteration + 1, table.var_names[table.free_indices[pivot_col]])
+                    table.flip(pivot_col)
+                else:
+                    trace.message(PIVOTS, "\nШаг {}:\nРазрешающий элемент: строка {}, столбец {}\n",
+                                  iteration + 1, pivot_row, pivot_col)
+                    table.pivot(pivot_row, pivot_col)
             
             # Удаляем столбцы вспомогательных переменных
             table.remove_auxiliary_columns(n_original)
             
-            if log_file:
-                log_file.write(str(table) + "\n")
+            trace.table(table, step=iteration + 1)
             
             iteration += 1
+            self.iterations = iteration
+        else:
+            self.status = "max iterations reached"
+            raise ValueError("Достигнуто максимальное число итераций")
         
         # Проверяем результат
         solution, objective_value = table.get_solution()
         
-        if log_file:
-            log_file.write(f"\nРезультат вспомогательной задачи: W = {objective_value:.6f}\n")
+        trace.message(SUMMARY, "\nРезультат вспомогательной задачи: W = {:.6f}\n", objective_value)
         
-        if abs(objective_value) > 1e-6:
+        # Значение вспомогательной переменной в базисе сравнивается с правой частью ее строки
+        artificial = np.flatnonzero(table.basis_indices >= n_original)
+        rows = table.basis_indices[artificial] - n_original
+        if np.any(table.table[artificial, -1] > 1e-6 * np.maximum(1.0, np.abs(self.original.b[rows]))):
+            self.status = "infeasible"
             raise ValueError("Исходная задача не имеет допустимых решений")
         
-        # Проверяем, что в базисе нет вспомогательных переменных
-        for basis_idx in table.basis_indices:
-            if basis_idx >= n_original:
-                raise ValueError("В базисе остались вспомогательные переменные")
+        # Выводим из базиса оставшиеся вспомогательные переменные (с нулевыми значениями)
+        self._drive_out_artificials(table, n_original, trace)
         
         # Замена целевой функции на исходную
-        table.replace_objective(self.original.c, self.original.var_names)
+        table.replace_objective(self.original.c, self.original.var_names,
+                                self.original.objective_offset)
+        
+        trace.table(table, "\nСимплекс-таблица после замены целевой функции на исходную:\n")
         
-        if log_file:
-            log_file.write("\nСимплекс-таблица после замены целевой функции на исходную:\n")
-            log_file.write(str(table) + "\n")
+        return table
+    
+    def _drive_out_artificials(self, table, n_original, trace):
+        """
+        Вывод вспомогательных переменных с нулевым значением из базиса вырожденным
+        шагом по наибольшему элементу строки. Строка без ненулевых элементов
+        линейно зависима от остальных ограничений и удаляется из таблицы.
+        """
+        redundant = []
+        for r in range(len(table.basis_indices)):
+            if table.basis_indices[r] < n_original:
+                continue
+            
+            row = np.abs(table.table[r, :-1])
+            pivot_col = np.argmax(row) if len(row) else None
+            if pivot_col is None or row[pivot_col] < table.tolerance:
+                redundant.append(r)
+                continue
+            
+            trace.message(PIVOTS, "\nВывод из базиса: {} -> {}\n",
+                          self.auxiliary.var_names[table.basis_indices[r]],
+                          self.auxiliary.var_names[table.free_indices[pivot_col]])
+            table.pivot(r, pivot_col)
+            table.remove_auxiliary_columns(n_original)
+            trace.table(table)
         
-        return table
\ No newline at end of file
+        if redundant:
+            trace.message(SUMMARY, "\nЛинейно зависимые ограничения удалены: {}\n",
+                          ", ".join(str(r + 1) for r in redundant))
+            table.remove_rows(redundant)
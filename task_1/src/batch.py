@@ -0,0 +1,164 @@
+import copy
+import csv
+import json
+import os
+import time
+from multiprocessing import Pool
+import numpy as np
+from .converter import to_canonical_form, get_original_solution
+from .reader import read_problem_from_file
+from .solver import LinearProgrammingSolver
+from .branch_and_bound import BranchAndBoundSolver
+from .sparse import GrowableArray
+
+
+class ProblemFamily:
+    """
+    Семейство задач, отличающихся только правыми частями b и/или коэффициентами c.
+    rhs - матрица k x m (строка - вектор b), costs - матрица k x n (строка - вектор c).
+    """
+
+    def __init__(self, base, rhs=None, costs=None):
+        self.base = base
+        self.rhs = None if rhs is None else np.atleast_2d(np.asarray(rhs, dtype=float))
+        self.costs = None if costs is None else np.atleast_2d(np.asarray(costs, dtype=float))
+
+        sizes = {len(a) for a in (self.rhs, self.costs) if a is not None}
+        if len(sizes) > 1:
+            raise ValueError("Число векторов b и c в семействе должно совпадать")
+        self.size = sizes.pop() if sizes else 1
+
+    def __len__(self):
+        return self.size
+
+    def instance(self, k):
+        """Задача семейства с номером k (матрица ограничений общая с базовой задачей)"""
+        problem = copy.copy(self.base)
+        if self.rhs is not None:
+            problem.constants = GrowableArray(float)
+            problem.constants.extend(self.rhs[k])
+        if self.costs is not None:
+            problem.c = list(self.costs[k])
+        return problem
+
+
+def solve_problem(problem, method='tableau', sparse=False, name=None, solver=None):
+    """
+    Решение одной задачи без журнала; результат - словарь.
+    Если передан решатель, задача решается из его последнего оптимального базиса.
+    Задача с целочисленными переменными решается методом ветвей и границ.
+    """
+    start_time = time.perf_counter()
+    result = {'name': name, 'status': None, 'objective': None, 'solution': None,
+              'iterations': 0, 'time': 0.0}
+
+    warm_start = solver is not None and not problem.integer_vars
+    if problem.integer_vars:
+        solver = BranchAndBoundSolver(method=method)
+    elif not warm_start:
+        solver = LinearProgrammingSolver(method=method)
+    try:
+        canonical = to_canonical_form(problem, sparse=sparse, bounded=method != 'revised')
+        if problem.integer_vars:
+            solution, objective_value = solver.solve(canonical, problem.integer_vars)
+        elif warm_start:
+            solution, objective_value = solver.reoptimize(canonical)
+        else:
+            solution, objective_value = solver.solve(canonical)
+        result['solution'] = list(get_original_solution(canonical, solution))
+        result['objective'] = -objective_value if problem.objective == 'max' else objective_value
+    except ValueError as e:
+        result['error'] = str(e)
+
+    result['status'] = solver.status if solver.status != "not solved" else "error"
+    result['iterations'] = solver.iterations
+    result['time'] = time.perf_counter() - start_time
+    return result
+
+
+# Состояние процесса-исполнителя: задается один раз при запуске пула
+_worker = {}
+
+
+def _init_worker(family, method, sparse, warm_start=False):
+    _worker['family'] = family
+    _worker['method'] = method
+    _worker['sparse'] = sparse
+    # Решатель, сохраняющий оптимальный базис между задачами семейства
+    _worker['solver'] = LinearProgrammingSolver(method=method) if warm_start and family is not None else None
+
+
+def _solve_task(task):
+    """Решение одной задачи пакета в процессе-исполнителе"""
+    index, item = task
+    if _worker['family'] is not None:
+        problem, name = _worker['family'].instance(item), str(item)
+    elif isinstance(item, str):
+        name = item
+        try:
+            problem = read_problem_from_file(item)
+        except (OSError, ValueError) as e:
+            return index, {'name': name, 'status': "error", 'objective': None, 'solution': None,
+                           'iterations': 0, 'time': 0.0, 'error': str(e)}
+    else:
+        problem, name = item, str(index)
+
+    return index, solve_problem(problem, _worker['method'], _worker['sparse'], name, _worker['solver'])
+
+
+def solve_batch(problems, method='tableau', sparse=False, processes=None, chunksize=None,
+                warm_start=False):
+    """
+    Пакетное решение задач в пуле процессов.
+
+    problems - список задач LinearProgrammingProblem, список имен файлов
+    или ProblemFamily. Для семейства базовая задача передается каждому
+    процессу один раз, а задания содержат только номера задач.
+    Результаты возвращаются в порядке входных задач.
+
+    warm_start - задачи семейства решаются из оптимального базиса предыдущей
+    задачи того же процесса (соседние задачи попадают в одну порцию заданий).
+    """
+    family = problems if isinstance(problems, ProblemFamily) else None
+    items = range(len(family)) if family is not None else problems
+    tasks = list(enumerate(items))
+
+    if processes is None:
+        processes = os.cpu_count() or 1
+    processes = max(1, min(processes, len(tasks)))
+
+    results = [None] * len(tasks)
+    if processes == 1:
+        _init_worker(family, method, sparse, warm_start)
+        for task in tasks:
+            index, result = _solve_task(task)
+            results[index] = result
+        return results
+
+    # Крупные порции заданий снижают накладные расходы на обмен между процессами
+    if chunksize is None:
+        chunksize = max(1, len(tasks) // (4 * processes))
+
+    with Pool(processes, initializer=_init_worker, initargs=(family, method, sparse, warm_start)) as pool:
+        for index, result in pool.imap_unordered(_solve_task, tasks, chunksize):
+            results[index] = result
+
+    return results
+
+
+def write_results(results, filename):
+    """Запись результатов пакета в один файл: CSV (*.csv) или JSON (иначе)"""
+    if os.path.splitext(filename)[1].lower() != '.csv':
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=1)
+        return
+
+    n = max((len(r['solution']) for r in results if r['solution'] is not None), default=0)
+    with open(filename, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['name', 'status', 'objective', 'iterations', 'time']
+                        + [f"x{i+1}" for i in range(n)])
+        for r in results:
+            solution = r['solution'] or []
+            writer.writerow([r['name'], r['status'], r['objective'], r['iterations'],
+                             f"{r['time']:.6f}"] + list(solution) + [''] * (n - len(solution)))
@@ -0,0 +1,259 @@
+import heapq
+import time
+from multiprocessing import Pool
+import numpy as np
+from .converter import get_original_solution, original_variable_expression
+from .solver import LinearProgrammingSolver
+from .trace import as_trace, SUMMARY, PIVOTS
+
+# Выбор узла: best - с наименьшей оценкой (best-bound), depth - последний созданный (поиск в глубину)
+NODE_SELECTION = ('best', 'depth')
+
+
+class Node:
+    """
+    Узел дерева ветвей и границ: каноническая задача с ограничениями ветвления,
+    оценка снизу (оптимум задачи родителя) и оптимальная таблица родителя,
+    из базиса которой решается задача узла.
+    """
+
+    def __init__(self, problem, bound, depth, table=None, parent_problem=None, branch=None):
+        self.problem = problem
+        self.bound = bound
+        self.depth = depth
+        self.table = table
+        self.parent_problem = parent_problem
+        self.branch = branch  # Описание ветвления для журнала
+
+
+# Состояние процесса-исполнителя: параметры решателя задач ЛП
+_worker = {}
+
+
+def _init_worker(options):
+    _worker['options'] = options
+
+
+def _evaluate_node(task):
+    """
+    Решение задачи ЛП узла: из таблицы родителя (строка ветвления добавляется
+    в таблицу, допустимость восстанавливает двойственный симплекс-метод)
+    или заново, если таблицы нет. Возвращает статус, решение, значение цели,
+    оптимальную таблицу и число шагов.
+    """
+    table, parent_problem, problem = task
+    solver = LinearProgrammingSolver(**_worker['options'])
+    if table is not None:
+        solver.table, solver.problem = table.copy(), parent_problem
+    try:
+        solution, objective_value = solver.reoptimize(problem)
+    except ValueError:
+        return solver.status, None, None, None, solver.iterations
+    return solver.status, solution, objective_value, solver.table, solver.iterations
+
+
+class BranchAndBoundSolver:
+    """
+    Метод ветвей и границ для задач с целочисленными переменными.
+
+    Задачи ЛП узлов решаются LinearProgrammingSolver (options - его параметры).
+    Ветвление по наиболее дробной переменной x_i = v добавляет к задаче строку
+    x_i <= floor(v) или x_i >= ceil(v); потомок решается из оптимальной таблицы
+    родителя (без таблицы, как у method='revised', - заново). При processes > 1
+    узлы решаются порциями в пуле процессов.
+    """
+
+    def __init__(self, node_selection='best', processes=1, max_nodes=1000,
+                 gap_tolerance=1e-6, integrality_tolerance=1e-6, **options):
+        if node_selection not in NODE_SELECTION:
+            raise ValueError(f"Неизвестное правило выбора узла: {node_selection}")
+        LinearProgrammingSolver(**options)  # Проверка параметров решателя ЛП
+        self.node_selection = node_selection
+        self.processes = max(1, processes)
+        self.max_nodes = max_nodes
+        self.gap_tolerance = gap_tolerance              # Относительный разрыв для отсечения узлов
+        self.integrality_tolerance = integrality_tolerance
+        self.options = options
+        self.solution = None
+        self.objective_value = None
+        self.status = "not solved"
+
+        # Метрики поиска
+        self.nodes = 0        # Решено задач ЛП узлов
+        self.iterations = 0   # Шагов симплекс-метода во всех узлах
+        self.pruned = 0       # Узлов отсечено по оценке
+        self.infeasible = 0   # Узлов без допустимых решений
+        self.failed = 0       # Узлов, задачу ЛП которых решить не удалось
+        self.elapsed = 0.0
+        self.history = []     # (время, узлов, рекорд, оценка, разрыв) после каждой порции узлов
+
+    @property
+    def bound(self):
+        """Нижняя оценка оптимума по открытым узлам (рекорд, если их нет)"""
+        if self._open:
+            return min(node.bound for _, _, node in self._open)
+        return self.objective_value if self.objective_value is not None else np.inf
+
+    @property
+    def gap(self):
+        """Относительный разрыв между рекордом и нижней оценкой"""
+        if self.objective_value is None:
+            return np.inf
+        return max(self.objective_value - self.bound, 0.0) / max(1.0, abs(self.objective_value))
+
+    @property
+    def metrics(self):
+        """Сводка поиска: число узлов, пропускная способность и разрыв"""
+        return {
+            'nodes': self.nodes,
+            'iterations': self.iterations,
+            'pruned': self.pruned,
+            'infeasible': self.infeasible,
+            'failed': self.failed,
+            'time': self.elapsed,
+            'nodes_per_second': self.nodes / self.elapsed if self.elapsed > 0 else 0.0,
+            'gap': self.gap,
+        }
+
+    def _push(self, node):
+        # best: куча по оценке; depth: стек (порядковый номер - по убыванию)
+        self._counter += 1
+        key = node.bound if self.node_selection == 'best' else -self._counter
+        heapq.heappush(self._open, (key, self._counter, node))
+
+    def _cutoff(self):
+        """Узлы с оценкой не меньше этого значения не могут улучшить рекорд"""
+        if self.objective_value is None:
+            return np.inf
+        return self.objective_value - self.gap_tolerance * max(1.0, abs(self.objective_value))
+
+    def solve(self, canonical_problem, integer_vars, log_file=None):
+        """
+        Решение канонической задачи, в которой исходные переменные integer_vars
+        должны быть целыми. Возвращает решение и значение цели, как LinearProgrammingSolver.
+        """
+        if self.processes == 1:
+            _init_worker(self.options)
+            return self._search(canonical_problem, integer_vars, log_file, map)
+        with Pool(self.processes, initializer=_init_worker, initargs=(self.options,)) as pool:
+            return self._search(canonical_problem, integer_vars, log_file, pool.map)
+
+    def _search(self, canonical_problem, integer_vars, log_file, evaluate):
+        trace = as_trace(log_file)
+        self._start_time = start_time = time.perf_counter()
+        self.solution = self.objective_value = None
+        self.status = "not solved"
+        self.nodes = self.iterations = self.pruned = self.infeasible = self.failed = 0
+        self.history = []
+        self._open, self._counter = [], 0
+
+        integer_vars = sorted(integer_vars)
+        expressions = {i: original_variable_expression(canonical_problem, i) for i in integer_vars}
+        n = len(canonical_problem.c)
+
+        trace.message(SUMMARY, "=== МЕТОД ВЕТВЕЙ И ГРАНИЦ ===\n")
+        trace.message(SUMMARY, "Целочисленные переменные: {}, выбор узла: {}, процессов: {}\n",
+                      ", ".join(f"x{i+1}" for i in integer_vars), self.node_selection, self.processes)
+
+        self._push(Node(canonical_problem, -np.inf, 0))
+        root_status = None
+        while self._open:
+            if self.nodes >= self.max_nodes:
+                self.status = "node limit reached"
+                break
+
+            # Порция узлов для пула: отсеченные по оценке узлы не решаются
+            batch = []
+            while self._open and len(batch) < self.processes:
+                node = heapq.heappop(self._open)[2]
+                if node.bound >= self._cutoff():
+                    self.pruned += 1
+                else:
+                    batch.append(node)
+            if not batch:
+                continue
+
+            results = evaluate(_evaluate_node, [(node.table, node.parent_problem, node.problem)
+                                                for node in batch])
+            for node, (status, solution, objective_value, table, iterations) in zip(batch, results):
+                self.nodes += 1
+                self.iterations += iterations
+                root_status = root_status or status
+                self._process(node, status, solution, objective_value, table,
+                              canonical_problem, expressions, n, trace)
+
+            elapsed = time.perf_counter() - start_time
+            self.history.append((elapsed, self.nodes, self.objective_value, self.bound, self.gap))
+
+        self.elapsed = time.perf_counter() - start_time
+        metrics = self.metrics
+        trace.message(SUMMARY, "\nУзлов: {} ({:.1f} узлов/с), отсечено по оценке: {}, без решений: {}, "
+                      "шагов симплекс-метода: {}\n", metrics['nodes'], metrics['nodes_per_second'],
+                      metrics['pruned'], metrics['infeasible'], metrics['iterations'])
+        if self.failed:
+            trace.message(SUMMARY, "Задачи ЛП не решены в {} узлах\n", self.failed)
+
+        if self.objective_value is None:
+            if self.status == "node limit reached":
+                raise ValueError("Достигнуто максимальное число узлов")
+            if root_status == "unbounded":
+                self.status = "unbounded"
+                raise ValueError("Целевая функция не ограничена")
+            if self.failed:
+                # Без решенных задач ЛП отсутствие целочисленных решений не доказано
+                self.status = root_status if self.nodes == 1 else "not solved"
+                raise ValueError(f"Задачи ЛП не решены в {self.failed} узлах")
+            self.status = "infeasible"
+            raise ValueError("Задача не имеет целочисленных решений")
+
+        trace.message(SUMMARY, "Рекорд: {:.6f}, оценка: {:.6f}, разрыв: {:.2e}\n",
+                      self.objective_value, self.bound, self.gap)
+        if self.status != "node limit reached":
+            self.status = "solved"
+        return self.solution, self.objective_value
+
+    def _process(self, node, status, solution, objective_value, table,
+                 canonical_problem, expressions, n, trace):
+        """Обработка решенного узла: отсечение, новый рекорд или ветвление"""
+        if status != "solved":
+            if status == "infeasible":
+                self.infeasible += 1
+                reason = "нет допустимых решений"
+            else:
+                self.failed += 1
+                reason = f"задача ЛП не решена ({status})"
+            trace.message(PIVOTS, "Узел {} ({}): {}\n", self.nodes, node.branch or "корень", reason)
+            return
+
+        if objective_value >= self._cutoff():
+            self.pruned += 1
+            trace.message(PIVOTS, "Узел {} ({}): оценка {:.6f} не лучше рекорда\n",
+                          self.nodes, node.branch or "корень", objective_value)
+            return
+
+        # Наиболее дробная целочисленная переменная
+        x = get_original_solution(canonical_problem, solution[:n])
+        indices = list(expressions)
+        fractions = np.abs(x[indices] - np.round(x[indices]))
+        k = int(np.argmax(fractions)) if indices else 0
+        if not indices or fractions[k] <= self.integrality_tolerance:
+            self.solution, self.objective_value = solution[:n], objective_value
+            trace.message(SUMMARY, "Узел {} ({}): новый рекорд {:.6f}, разрыв {:.2e}, {:.3f} с\n",
+                          self.nodes, node.branch or "корень", objective_value, self.gap,
+                          time.perf_counter() - self._start_time)
+            return
+
+        i, value = indices[k], x[indices[k]]
+        trace.message(PIVOTS, "Узел {} ({}): оценка {:.6f}, ветвление по x{} = {:.6f}\n",
+                      self.nodes, node.branch or "корень", objective_value, i + 1, value)
+
+        constant, coefficients = expressions[i]
+        if not np.any(coefficients):
+            # Переменная зафиксирована предварительной обработкой в дробном значении
+            self.infeasible += 1
+            return
+        coefficients = np.concatenate([coefficients, np.zeros(len(node.problem.c) - n)])
+        for inequality, bound in (('>=', np.ceil(value)), ('<=', np.floor(value))):
+            child = node.problem.add_row(coefficients, inequality, bound - constant)
+            self._push(Node(child, objective_value, node.depth + 1, table, node.problem,
+                            f"x{i+1} {inequality} {bound:g}"))
@@ -1,14 +1,43 @@
 import numpy as np
 from .problem import CanonicalProblem
+from .sparse import SparseMatrix
 
-def to_canonical_form(problem):
-    """Приведение общей задачи к канонической форме"""
+# Масштабирование матрицы ограничений: geometric - строки и столбцы делятся на среднее
+# геометрическое наибольшего и наименьшего по модулю элемента, equilibration - на наибольший
+SCALING_METHODS = ('geometric', 'equilibration')
+
+# Число проходов геометрического масштабирования (строки, затем столбцы)
+GEOMETRIC_PASSES = 4
+
+def to_canonical_form(problem, sparse=False, bounded=False, scaling=None):
+    """
+    Приведение общей задачи к канонической форме.
+    При sparse=True матрица A хранится в разреженном формате (CSC).
+    
+    При bounded=True границы переменных не превращаются в строки: переменная
+    с нижней границей l заменяется на x = l + x′, с одной верхней границей u -
+    на x = u - x′, а верхняя граница x′ остается в canonical.upper и
+    обрабатывается симплекс-таблицей. Иначе границы записываются ограничениями.
+    
+    scaling - масштабирование строк и столбцов A (SCALING_METHODS, None - без него):
+    каноническая задача решается в переменных x / column_scale, решение
+    к исходным переменным возвращает get_original_solution.
+    """
+    if scaling is not None and scaling not in SCALING_METHODS:
+        raise ValueError(f"Неизвестный метод масштабирования: {scaling}")
+    if not bounded:
+        problem = problem.bounds_as_constraints()
+    
     canonical = CanonicalProblem()
     n_original = len(problem.c)
     canonical.original_var_count = n_original
     
-    # Определяем неотрицательные переменные
-    non_negative_vars = set(problem.non_negative_vars)
+    # Переменные с хотя бы одной конечной границей после сдвига становятся неотрицательными
+    lower, upper = problem.variable_bounds()
+    has_lower, has_upper = np.isfinite(lower), np.isfinite(upper)
+    non_negative_vars = set(np.flatnonzero(has_lower | has_upper).tolist())
+    shift = np.where(has_lower, lower, np.where(has_upper, upper, 0.0))
+    sign = np.where(has_lower | ~has_upper, 1.0, -1.0)
     
     # Создаем mapping для замены свободных переменных
     free_var_replacements = {}
@@ -34,51 +63,70 @@ def to_canonical_form(problem):
             canonical_var_indices[i] = [current_var_index, current_var_index + 1]
             current_var_index += 2
     
-    # Подсчитываем фиктивные переменные
-    num_slack_vars = 0
-    for constraint in problem.constraints:
-        if constraint['inequality'] != '=':
-            num_slack_vars += 1
+    # Фиктивные переменные: по одной на каждое неравенство
+    num_constraints = problem.num_constraints
+    inequalities = np.array(problem.inequalities, dtype=object)
+    has_slack = inequalities != '='
+    num_slack_vars = int(np.count_nonzero(has_slack))
     
     # Общее количество переменных в канонической форме
     total_vars = current_var_index + num_slack_vars
     
-    # Инициализируем матрицу A и вектор b
-    num_constraints = len(problem.constraints)
-    canonical.A = np.zeros((num_constraints, total_vars))
-    canonical.b = np.zeros(num_constraints)
-    
-    # Заполняем матрицу ограничений
-    slack_var_idx = current_var_index
-    for i, constraint in enumerate(problem.constraints):
-        coefficients = constraint['coefficients']
-        constant = constraint['constant']
-        
-        # Заполняем коэффициенты для всех исходных переменных
-        for j, coeff in enumerate(coefficients):
-            if j in free_var_replacements:
-                # Свободная переменная: x_j = x_j⁺ - x_j⁻
-                pos_idx, neg_idx = free_var_replacements[j]
-                canonical.A[i, pos_idx] = coeff
-                canonical.A[i, neg_idx] = -coeff
-            else:
-                # Неотрицательная переменная
-                canonical_idx = canonical_var_indices[j][0]
-                canonical.A[i, canonical_idx] = coeff
-        
-        # Добавляем фиктивные переменные
-        if constraint['inequality'] == '<=':
-            canonical.A[i, slack_var_idx] = 1
-            slack_var_idx += 1
-        elif constraint['inequality'] == '>=':
-            canonical.A[i, slack_var_idx] = -1
-            slack_var_idx += 1
-        
-        # Устанавливаем правую часть
-        canonical.b[i] = constant
-        if canonical.b[i] < 0:
-            canonical.b[i] = -canonical.b[i]
-            canonical.A[i, :] = -canonical.A[i, :]
+    # Отображение исходных столбцов в канонические (x⁺ и x⁻ для свободных)
+    pos_index = np.full(n_original, -1, dtype=np.int64)
+    neg_index = np.full(n_original, -1, dtype=np.int64)
+    for j, indices in canonical_var_indices.items():
+        pos_index[j] = indices[0]
+        if len(indices) > 1:
+            neg_index[j] = indices[1]
+    
+    # Тройки исходной матрицы ограничений
+    A = problem.constraint_matrix()
+    rows, cols, values = A.to_triplets()
+    if np.any(cols >= n_original):
+        raise ValueError("Число коэффициентов ограничения больше числа переменных")
+    
+    # Сдвиг переменных: b - A * shift, столбцы x = u - x′ меняют знак
+    constants = np.array(problem.constants.view, dtype=float)
+    if np.any(shift):
+        constants -= np.bincount(rows, weights=values * shift[cols], minlength=num_constraints)
+    if np.any(sign < 0):
+        values = values * sign[cols]
+    
+    # Свободная переменная: x_j = x_j⁺ - x_j⁻
+    split = neg_index[cols] >= 0
+    slack_rows = np.flatnonzero(has_slack)
+    slack_values = np.where(inequalities[slack_rows] == '<=', 1.0, -1.0)
+    
+    all_rows = np.concatenate([rows, rows[split], slack_rows])
+    all_cols = np.concatenate([pos_index[cols], neg_index[cols[split]],
+                               current_var_index + np.arange(num_slack_vars)])
+    all_values = np.concatenate([values, -values[split], slack_values])
+    
+    # Правая часть должна быть неотрицательной: меняем знак строк с b < 0
+    canonical.b = constants
+    flip = canonical.b < 0
+    canonical.b[flip] = -canonical.b[flip]
+    
+    # Множители масштабирования; столбец фиктивной переменной строки i делится
+    # на множитель строки, чтобы остаться единичным
+    if scaling is not None:
+        structural = len(all_values) - num_slack_vars  # Тройки фиктивных переменных - последние
+        row_scale, column_scale = _scale_factors(all_rows[:structural], all_cols[:structural],
+                                                 all_values[:structural],
+                                                 (num_constraints, total_vars), scaling)
+        column_scale[current_var_index:] = 1.0 / row_scale[slack_rows]
+        all_values = all_values * row_scale[all_rows] * column_scale[all_cols]
+        canonical.b *= row_scale
+    
+    if sparse:
+        all_values[flip[all_rows]] *= -1
+        canonical.A = SparseMatrix.from_triplets(all_rows, all_cols, all_values,
+                                                 (num_constraints, total_vars), format='csc')
+    else:
+        canonical.A = np.zeros((num_constraints, total_vars))
+        canonical.A[all_rows, all_cols] = all_values
+        canonical.A[flip, :] = -canonical.A[flip, :]
     
     # Формируем целевую функцию
     canonical.c = np.zeros(total_vars)
@@ -95,21 +143,22 @@ def to_canonical_form(problem):
                 canonical.c[pos_idx] = problem.c[j]
                 canonical.c[neg_idx] = -problem.c[j]
         else:
-            # Для неотрицательной переменной
+            # Для неотрицательной (или сдвинутой) переменной
             canonical_idx = canonical_var_indices[j][0]
             if problem.objective == 'max':
-                canonical.c[canonical_idx] = -problem.c[j]
+                canonical.c[canonical_idx] = -problem.c[j] * sign[j]
             else:
-                canonical.c[canonical_idx] = problem.c[j]
+                canonical.c[canonical_idx] = problem.c[j] * sign[j]
     
     # Создаем имена переменных
     canonical.var_names = [""] * total_vars
     
-    # Заполняем имена для неотрицательных переменных
+    # Заполняем имена для неотрицательных переменных (x′ - для сдвинутых)
     for i in range(n_original):
         if i in non_negative_vars:
             canonical_idx = canonical_var_indices[i][0]
-            canonical.var_names[canonical_idx] = f"x{i+1}"
+            shifted = shift[i] != 0 or sign[i] < 0
+            canonical.var_names[canonical_idx] = f"x{i+1}′" if shifted else f"x{i+1}"
     
     # Заполняем имена для замен свободных переменных
     for i in range(n_original):
@@ -123,15 +172,68 @@ def to_canonical_form(problem):
         idx = current_var_index + i
         canonical.var_names[idx] = f"s{i+1}"
     
+    # Фиктивная переменная каждой строки (-1 для равенств): базис для двойственного симплекс-метода
+    canonical.slack_indices = np.full(num_constraints, -1, dtype=np.int64)
+    canonical.slack_indices[slack_rows] = current_var_index + np.arange(num_slack_vars)
+    
+    # Границы сдвинутых переменных: 0 <= x′ <= u - l
+    if np.any(has_lower & has_upper):
+        canonical.upper = np.full(total_vars, np.inf)
+        bounded_vars = np.flatnonzero(has_lower & has_upper)
+        canonical.upper[pos_index[bounded_vars]] = upper[bounded_vars] - lower[bounded_vars]
+    if np.any(shift != 0) or np.any(sign < 0):
+        canonical.variable_shift, canonical.variable_sign = shift, sign
+        offset = float(np.dot(problem.c, shift))
+        canonical.objective_offset = -offset if problem.objective == 'max' else offset
+    
+    if scaling is not None:
+        canonical.c *= column_scale
+        if canonical.upper is not None:
+            canonical.upper /= column_scale
+        canonical.row_scale, canonical.column_scale = row_scale, column_scale
+    
+    canonical.postsolve = problem.postsolve
     canonical.free_var_mapping = free_var_replacements
     canonical.canonical_var_indices = canonical_var_indices
     
     return canonical
 
+def _scale_factors(rows, cols, values, shape, scaling):
+    """
+    Множители строк и столбцов для матрицы, заданной тройками. Множители
+    округляются до степеней двойки, поэтому масштабирование не вносит ошибок округления.
+    """
+    m, n = shape
+    magnitudes = np.abs(values)
+    row_scale, column_scale = np.ones(m), np.ones(n)
+    
+    def factors(index, scaled, size):
+        largest = np.zeros(size)
+        np.maximum.at(largest, index, scaled)
+        if scaling == 'equilibration':
+            norm = largest
+        else:
+            smallest = np.full(size, np.inf)
+            np.minimum.at(smallest, index, scaled)
+            norm = np.sqrt(largest * np.where(np.isfinite(smallest), smallest, 0.0))
+        # Пустые строки и столбцы не масштабируются
+        return np.where(norm > 0, 1.0 / np.where(norm > 0, norm, 1.0), 1.0)
+    
+    passes = GEOMETRIC_PASSES if scaling == 'geometric' else 1
+    for _ in range(passes):
+        row_scale *= factors(rows, magnitudes * row_scale[rows] * column_scale[cols], m)
+        column_scale *= factors(cols, magnitudes * row_scale[rows] * column_scale[cols], n)
+    
+    return np.exp2(np.round(np.log2(row_scale))), np.exp2(np.round(np.log2(column_scale)))
+
 def get_original_solution(canonical_problem, solution):
     """Преобразование решения канонической задачи к исходным переменным"""
     original_solution = np.zeros(canonical_problem.original_var_count)
     
+    # Задача была масштабирована: x = column_scale * x_s
+    if canonical_problem.column_scale is not None:
+        solution = np.asarray(solution, dtype=float) * canonical_problem.column_scale
+    
     for i in range(canonical_problem.original_var_count):
         if i in canonical_problem.free_var_mapping:
             pos_idx, neg_idx = canonical_problem.free_var_mapping[i]
@@ -141,4 +243,45 @@ def get_original_solution(canonical_problem, solution):
             canonical_idx = canonical_problem.canonical_var_indices[i][0]
             original_solution[i] = solution[canonical_idx]
     
-    return original_solution
\ No newline at end of file
+    # Переменные были сдвинуты: x = shift + sign * x′
+    if canonical_problem.variable_shift is not None:
+        original_solution = (canonical_problem.variable_shift
+                             + canonical_problem.variable_sign * original_solution)
+    
+    # Задача была упрощена: восстанавливаем удаленные и сдвинутые переменные
+    if canonical_problem.postsolve is not None:
+        original_solution = canonical_problem.postsolve.solution(original_solution)
+    
+    return original_solution
+
+def original_variable_expression(canonical_problem, i):
+    """
+    Исходная переменная x_i как функция переменных канонической задачи:
+    x_i = constant + coefficients * x (ограничения на исходные переменные).
+    """
+    coefficients = np.zeros(len(canonical_problem.c))
+    constant, scale = 0.0, 1.0
+    
+    # Задача была упрощена: x_i = value + scale * y (y нет - переменная зафиксирована)
+    postsolve = canonical_problem.postsolve
+    if postsolve is not None:
+        constant, scale, i = postsolve.value[i], postsolve.scale[i], postsolve.index[i]
+        if i < 0:
+            return constant, coefficients
+    
+    # Сдвиг переменной: x = shift + sign * x′
+    if canonical_problem.variable_shift is not None:
+        constant += scale * canonical_problem.variable_shift[i]
+        scale *= canonical_problem.variable_sign[i]
+    
+    if i in canonical_problem.free_var_mapping:
+        pos_idx, neg_idx = canonical_problem.free_var_mapping[i]
+        coefficients[pos_idx], coefficients[neg_idx] = scale, -scale
+    else:
+        coefficients[canonical_problem.canonical_var_indices[i][0]] = scale
+    
+    # Масштабирование: x = column_scale * x_s
+    if canonical_problem.column_scale is not None:
+        coefficients *= canonical_problem.column_scale
+    
+    return constant, coefficients
\ No newline at end of file
@@ -0,0 +1,244 @@
+import numpy as np
+from .linalg import solve_triangular
+from .sparse import take_columns, issparse
+from .trace import as_trace, SUMMARY, PIVOTS
+
+
+class InteriorPointSolver:
+    """
+    Прямо-двойственный метод внутренней точки (предиктор-корректор Мехротры)
+    для канонической задачи min cx, Ax = b, 0 <= x <= u.
+
+    На каждой итерации решается система нормальных уравнений A D A^T dy = r
+    разложением Холецкого; число итераций почти не зависит от размера задачи.
+    Решение лежит внутри оптимальной грани (не обязательно в вершине):
+    базис для перехода к симплекс-методу дает crossover_basis.
+    """
+
+    def __init__(self, canonical_problem, tolerance=1e-8, max_iterations=100):
+        self.problem = canonical_problem
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+        self.iterations = 0
+        self.status = "not solved"
+
+        # Прямые и двойственные переменные последней итерации
+        self.x = self.w = None  # x и запас до верхней границы w = u - x
+        self.y = None
+        self.z = self.v = None  # Двойственные к x >= 0 и x <= u
+
+    def _dense(self):
+        """Плотная матрица A, правые части, цель и конечные верхние границы"""
+        A = self.problem.A
+        n = len(self.problem.c)
+        if issparse(A):
+            A = take_columns(A, np.arange(n))
+        upper = self.problem.upper
+        if upper is None:
+            upper = np.full(n, np.inf)
+        return (np.asarray(A, dtype=float), np.asarray(self.problem.b, dtype=float),
+                np.asarray(self.problem.c, dtype=float), np.asarray(upper, dtype=float))
+
+    @staticmethod
+    def _cholesky_factor(M):
+        """
+        Разложение Холецкого M = L L^T; возвращает функцию решения M dy = r
+        двумя треугольными системами. Если M численно вырождена, к диагонали
+        добавляется регуляризация; точность восстанавливается одним шагом
+        итеративного уточнения.
+        """
+        regularization = 0.0
+        while True:
+            try:
+                L = np.linalg.cholesky(M + regularization * np.eye(len(M)) if regularization else M)
+                break
+            except np.linalg.LinAlgError:
+                scale = 1.0 + np.max(np.diag(M), initial=0.0)
+                regularization = regularization * 100 if regularization else 1e-14 * scale
+                if regularization > 1e-2 * scale:
+                    raise
+
+        def triangular_solve(r):
+            return solve_triangular(L.T, solve_triangular(L, r), lower=False)
+
+        def solve(r):
+            dy = triangular_solve(r)
+            return dy + triangular_solve(r - M @ dy)
+
+        return solve
+
+    def _starting_point(self, A, b, c, upper, bounded):
+        """Начальная точка Мехротры: решения наименьшей нормы, сдвинутые внутрь"""
+        solve = self._cholesky_factor(A @ A.T)
+        x = A.T @ solve(b)
+        y = solve(A @ c)
+        z = c - A.T @ y
+
+        x += max(-1.5 * np.min(x, initial=0.0), 0.0)
+        z += max(-1.5 * np.min(z, initial=0.0), 0.0)
+        x[bounded] = np.minimum(x[bounded], upper[bounded])
+        w = np.where(bounded, upper - x, 1.0)
+        v = np.where(bounded, np.maximum(z, 1.0), 0.0)
+
+        gap = x @ z + w[bounded] @ v[bounded]
+        x += 0.5 * gap / (np.sum(z) + 1.0) + 1e-2
+        z += 0.5 * gap / (np.sum(x) + 1.0) + 1e-2
+        w[bounded] = np.maximum(upper[bounded] - x[bounded], 1e-2 * (1.0 + upper[bounded]))
+        return x, y, z, w, v
+
+    @staticmethod
+    def _max_step(values, steps):
+        """Наибольший шаг alpha <= 1, при котором values + alpha * steps >= 0"""
+        negative = steps < 0
+        if not np.any(negative):
+            return 1.0
+        return min(1.0, float(np.min(-values[negative] / steps[negative])))
+
+    # Расходящиеся итерации (несовместная или неограниченная задача) переполняют
+    # Theta; это обнаруживается проверкой конечности, а не предупреждениями NumPy
+    @np.errstate(over='ignore', divide='ignore', invalid='ignore')
+    def solve(self, log_file=None):
+        """Решение задачи; при отсутствии сходимости - ValueError (status "not converged")"""
+        trace = as_trace(log_file)
+        A, b, c, upper = self._dense()
+        m, n = A.shape
+        bounded = np.isfinite(upper)
+        self.iterations = 0
+
+        trace.message(SUMMARY, "=== МЕТОД ВНУТРЕННЕЙ ТОЧКИ ===\n")
+
+        # Переменные с u = 0 фиксированы в нуле и не участвуют в итерациях
+        active = ~(bounded & (upper <= 0))
+        if not np.all(active):
+            A, c, upper, bounded = A[:, active], c[active], upper[active], bounded[active]
+
+        x, y, z, w, v = self._starting_point(A, b, c, upper, bounded)
+        n_pairs = len(x) + np.count_nonzero(bounded)
+        b_norm, c_norm = 1.0 + np.linalg.norm(b), 1.0 + np.linalg.norm(c)
+
+        while True:
+            # Невязки прямой и двойственной задач и разрыв двойственности
+            r_primal = b - A @ x
+            r_upper = np.where(bounded, upper - x - w, 0.0)
+            r_dual = c - A.T @ y - z + v
+            mu = (x @ z + w[bounded] @ v[bounded]) / n_pairs
+            primal_objective = c @ x
+            dual_objective = b @ y - upper[bounded] @ v[bounded]
+
+            primal_error = (np.linalg.norm(r_primal) + np.linalg.norm(r_upper)) / b_norm
+            dual_error = np.linalg.norm(r_dual) / c_norm
+            gap = abs(primal_objective - dual_objective) / (1.0 + abs(primal_objective))
+
+            if trace.enabled(PIVOTS):
+                trace.message(PIVOTS, "Итерация {}: цель {:.8g}, невязки {:.2e} / {:.2e}, "
+                              "разрыв {:.2e}, mu = {:.2e}\n", self.iterations, primal_objective,
+                              primal_error, dual_error, gap, mu)
+
+            if max(primal_error, dual_error, gap) < self.tolerance:
+                break
+            # Нормальные уравнения: A Theta A^T dy = r_primal + A Theta h
+            theta = 1.0 / (z / x + np.where(bounded, v / w, 0.0))
+            M = (A * theta) @ A.T
+
+            if (self.iterations >= self.max_iterations or not np.isfinite(mu)
+                    or not np.all(np.isfinite(M))
+                    or max(np.max(x), np.max(np.abs(y), initial=0.0)) > 1e12):
+                self.status = "not converged"
+                raise ValueError("Метод внутренней точки не сошелся")
+            solve = self._cholesky_factor(M)  # Одно разложение для предиктора и корректора
+
+            def direction(r_xz, r_wv):
+                h = r_dual - r_xz / x + np.where(bounded, (r_wv - v * r_upper) / w, 0.0)
+                dy = solve(r_primal + A @ (theta * h))
+                dx = theta * (A.T @ dy - h)
+                dz = (r_xz - z * dx) / x
+                dw = np.where(bounded, r_upper - dx, 0.0)
+                dv = np.where(bounded, (r_wv - v * dw) / w, 0.0)
+                return dx, dy, dz, dw, dv
+
+            def step_lengths(dx, dz, dw, dv):
+                alpha_primal = min(self._max_step(x, dx), self._max_step(w[bounded], dw[bounded]))
+                alpha_dual = min(self._max_step(z, dz), self._max_step(v[bounded], dv[bounded]))
+                return alpha_primal, alpha_dual
+
+            # Предиктор: аффинное направление (sigma = 0)
+            dx, dy, dz, dw, dv = direction(-x * z, np.where(bounded, -w * v, 0.0))
+            alpha_primal, alpha_dual = step_lengths(dx, dz, dw, dv)
+            mu_affine = ((x + alpha_primal * dx) @ (z + alpha_dual * dz)
+                         + (w + alpha_primal * dw)[bounded] @ (v + alpha_dual * dv)[bounded]) / n_pairs
+            sigma = (mu_affine / mu) ** 3
+
+            # Корректор: центрирование и поправка второго порядка
+            r_xz = sigma * mu - x * z - dx * dz
+            r_wv = np.where(bounded, sigma * mu - w * v - dw * dv, 0.0)
+            dx, dy, dz, dw, dv = direction(r_xz, r_wv)
+            alpha_primal, alpha_dual = step_lengths(dx, dz, dw, dv)
+            alpha_primal, alpha_dual = 0.99995 * alpha_primal, 0.99995 * alpha_dual
+
+            x = x + alpha_primal * dx
+            w = np.where(bounded, w + alpha_primal * dw, 1.0)
+            y = y + alpha_dual * dy
+            z = z + alpha_dual * dz
+            v = np.where(bounded, v + alpha_dual * dv, 0.0)
+            self.iterations += 1
+
+        # Возврат фиксированных переменных; w = inf - у переменной нет верхней границы
+        self.x, self.z, self.v = np.zeros(len(active)), np.zeros(len(active)), np.zeros(len(active))
+        self.w = np.full(len(active), np.inf)
+        self.x[active], self.z[active], self.v[active] = x, z, v
+        self.w[active] = np.where(bounded, w, np.inf)
+        self.y = y
+        self.status = "solved"
+
+        trace.message(SUMMARY, "Итераций: {}, значение целевой функции: {:.6f}\n",
+                      self.iterations, primal_objective)
+
+        return self.x.copy(), primal_objective
+
+    @staticmethod
+    def _independent_columns(A, order):
+        """Жадный набор линейно независимых столбцов A в порядке order (Грам-Шмидт)"""
+        m = A.shape[0]
+        Q = np.zeros((m, m))
+        chosen = []
+        for j in order:
+            a = A[:, j]
+            norm = np.linalg.norm(a)
+            if norm == 0.0:
+                continue
+            k = len(chosen)
+            # Повторная ортогонализация сохраняет точность Q
+            r = a - Q[:, :k] @ (Q[:, :k].T @ a)
+            r -= Q[:, :k] @ (Q[:, :k].T @ r)
+            r_norm = np.linalg.norm(r)
+            if r_norm > 1e-7 * norm:
+                Q[:, k] = r / r_norm
+                chosen.append(j)
+                if len(chosen) == m:
+                    break
+        return np.array(chosen, dtype=int)
+
+    def crossover_basis(self):
+        """
+        Базис для перехода к симплекс-методу по решению метода внутренней точки.
+
+        Переменные упорядочиваются по отношению расстояния до ближайшей границы
+        к двойственной оценке (вверху - заведомо базисные) и жадно набираются
+        линейно независимые столбцы A. Возвращает номера базисных переменных,
+        маску небазисных переменных на верхней границе и номера линейно
+        независимых строк (если ранг A меньше числа ограничений, остальные
+        строки - их линейные комбинации).
+        """
+        A = self._dense()[0]
+        m = A.shape[0]
+        distance = np.minimum(self.x, self.w)
+        score = distance / (self.z + self.v + 1e-300)
+        basis = self._independent_columns(A, np.argsort(-score, kind='stable'))
+
+        rows = np.arange(m)
+        if len(basis) < m:
+            rows = np.sort(self._independent_columns(A[:, basis].T, np.arange(m)))
+
+        at_upper = self.w < self.x
+        at_upper[basis] = False
+        return basis, at_upper, rows
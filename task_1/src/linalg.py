@@ -0,0 +1,53 @@
+import numpy as np
+
+# Размер диагональных блоков при решении треугольных систем
+TRIANGULAR_BLOCK = 64
+
+
+def solve_triangular(T, r, lower=True):
+    """
+    Решение T x = r с нижне- (lower) или верхнетреугольной T блочной подстановкой:
+    диагональные блоки решаются np.linalg.solve, остальные элементы учитываются
+    умножением блока на вектор (матрицу), всего O(n^2) операций для вектора r
+    """
+    x = np.array(r, dtype=float)
+    n = len(T)
+    starts = range(0, n, TRIANGULAR_BLOCK)
+    for start in (starts if lower else reversed(starts)):
+        stop = min(start + TRIANGULAR_BLOCK, n)
+        x[start:stop] = np.linalg.solve(T[start:stop, start:stop], x[start:stop])
+        if lower:
+            x[stop:] -= T[stop:, start:stop] @ x[start:stop]
+        else:
+            x[:start] -= T[:start, start:stop] @ x[start:stop]
+    return x
+
+
+class TriangularSolver:
+    """
+    Многократное решение T x = r с одной треугольной матрицей T. Блочная
+    подстановка, как в solve_triangular, но диагональные блоки (TRIANGULAR_BLOCK
+    x TRIANGULAR_BLOCK) разлагаются один раз: решение для каждой правой части -
+    только умножения блоков на вектор, O(n^2) операций.
+    """
+
+    def __init__(self, T, lower=True):
+        self.T = T
+        self.lower = lower
+        n = len(T)
+        self.blocks = [(start, min(start + TRIANGULAR_BLOCK, n)) for start in range(0, n, TRIANGULAR_BLOCK)]
+        if not lower:
+            self.blocks.reverse()
+        # Обратные к диагональным блокам (сама T не обращается)
+        self.inverses = [np.linalg.inv(T[start:stop, start:stop]) for start, stop in self.blocks]
+
+    def solve(self, r):
+        x = np.array(r, dtype=float)
+        T = self.T
+        for (start, stop), inverse in zip(self.blocks, self.inverses):
+            x[start:stop] = inverse @ x[start:stop]
+            if self.lower:
+                x[stop:] -= T[stop:, start:stop] @ x[start:stop]
+            else:
+                x[:start] -= T[:start, start:stop] @ x[start:stop]
+        return x
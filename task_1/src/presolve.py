@@ -0,0 +1,356 @@
+import numpy as np
+from .problem import LinearProgrammingProblem
+from .trace import as_trace, SUMMARY
+
+# Правила предварительной обработки в порядке применения и их названия в журнале
+RULES = {
+    'empty_rows': "пустые строки",
+    'singleton_rows': "строки с одной переменной (границы)",
+    'fixed_vars': "фиксированные переменные",
+    'duplicate_rows': "повторяющиеся строки",
+    'redundant_rows': "избыточные строки",
+    'forcing_rows': "вынуждающие строки",
+    'empty_columns': "пустые столбцы",
+}
+
+# Смена знака неравенства при умножении строки на отрицательное число
+FLIPPED = {'<=': '>=', '>=': '<=', '=': '='}
+
+
+class Postsolve:
+    """
+    Обратное преобразование решения упрощенной задачи к исходным переменным.
+
+    Каждая исходная переменная либо зафиксирована (x_j = value_j), либо
+    выражается через переменную упрощенной задачи: x_j = value_j + scale_j * y_index_j.
+    """
+
+    def __init__(self, n):
+        self.value = np.zeros(n)
+        self.scale = np.ones(n)
+        self.index = np.full(n, -1, dtype=np.int64)
+        self.objective_offset = 0.0  # Постоянное слагаемое целевой функции (в смысле исходной задачи)
+        self.removed_rows = dict.fromkeys(RULES, 0)
+        self.removed_cols = dict.fromkeys(RULES, 0)
+
+    def solution(self, reduced_solution):
+        """Решение исходной задачи по решению упрощенной"""
+        x = self.value.copy()
+        kept = self.index >= 0
+        x[kept] += self.scale[kept] * np.asarray(reduced_solution, dtype=float)[self.index[kept]]
+        return x
+
+    def objective(self, reduced_objective):
+        """Значение целевой функции исходной задачи"""
+        return reduced_objective + self.objective_offset
+
+
+class _Presolver:
+    """
+    Рабочее состояние предварительной обработки. Строки хранятся словарями
+    {переменная: коэффициент}, переменные - в исходной нумерации; нижняя граница
+    каждой переменной 0 или -inf (прочие границы сдвигом переменной сводятся к ним),
+    верхняя - любая.
+    """
+
+    def __init__(self, problem, tolerance):
+        self.tolerance = tolerance
+        n = problem.num_vars
+        self.n = n
+        self.sense = 1.0 if problem.objective == 'min' else -1.0
+        self.c = np.zeros(n)
+        self.c[:len(problem.c)] = problem.c
+        self.lower, self.upper = problem.variable_bounds(n)
+
+        # Границы целочисленных переменных округляются внутрь: сдвиги переменных
+        # остаются целыми, и переменные упрощенной задачи тоже целочисленные
+        self.integer = np.zeros(n, dtype=bool)
+        self.integer[list(problem.integer_vars)] = True
+        self.lower[self.integer] = np.ceil(self.lower[self.integer] - tolerance)
+        self.upper[self.integer] = np.floor(self.upper[self.integer] + tolerance)
+        self.fixed = np.zeros(n, dtype=bool)
+        self.postsolve = Postsolve(n)
+
+        A = problem.constraint_matrix()
+        self.rows = [dict(zip(A.indices[A.indptr[i]:A.indptr[i + 1]].tolist(),
+                              A.data[A.indptr[i]:A.indptr[i + 1]].tolist()))
+                     for i in range(A.shape[0])]
+        self.inequalities = list(problem.inequalities)
+        self.constants = [float(b) for b in problem.constants.view]
+        self.alive = [True] * len(self.rows)
+
+        # Строки, в которые входит каждая переменная (могут содержать удаленные строки)
+        self.columns = [set() for _ in range(n)]
+        for i, row in enumerate(self.rows):
+            for j in row:
+                self.columns[j].add(i)
+
+        # Нижние границы, отличные от 0 и -inf, сводятся к ним сдвигом переменной
+        for j in range(n):
+            low, high = self.lower[j], self.upper[j]
+            if low > high + tolerance:
+                self._infeasible()
+            if high - low <= tolerance:
+                self._fix(j, low, 'fixed_vars')
+            elif np.isfinite(low) and low != 0.0:
+                self._shift(j, low)
+            elif low == -np.inf and high < np.inf:
+                self._shift(j, high, negate=True)
+
+    def _remove_row(self, i, rule):
+        self.alive[i] = False
+        self.postsolve.removed_rows[rule] += 1
+
+    def _infeasible(self):
+        raise ValueError("Исходная задача не имеет допустимых решений")
+
+    def _rows_of(self, j):
+        return [i for i in self.columns[j] if self.alive[i]]
+
+    def _fix(self, j, value, rule):
+        """Фиксация переменной: подстановка значения в строки и целевую функцию"""
+        for i in self._rows_of(j):
+            self.constants[i] -= self.rows[i].pop(j) * value
+        self.columns[j] = set()
+        self.postsolve.value[j] += self.postsolve.scale[j] * value
+        self.postsolve.scale[j] = 0.0
+        self.postsolve.objective_offset += self.c[j] * value
+        self.c[j] = 0.0
+        self.fixed[j] = True
+        self.postsolve.removed_cols[rule] += 1
+
+    def _shift(self, j, value, negate=False):
+        """Замена x_j = value + y (или value - y при x_j <= value), y >= 0"""
+        sign = -1.0 if negate else 1.0
+        for i in self._rows_of(j):
+            row = self.rows[i]
+            self.constants[i] -= row[j] * value
+            row[j] *= sign
+        self.postsolve.value[j] += self.postsolve.scale[j] * value
+        self.postsolve.scale[j] *= sign
+        self.postsolve.objective_offset += self.c[j] * value
+        self.c[j] *= sign
+        self.upper[j] = np.inf if negate else self.upper[j] - value
+        self.lower[j] = 0.0
+
+    def _activity_bounds(self, row):
+        """Наименьшее и наибольшее значения левой части по границам переменных"""
+        low = high = 0.0
+        for j, a in row.items():
+            if a > 0:
+                low += a * self.lower[j]
+                high += a * self.upper[j]
+            else:
+                low += a * self.upper[j]
+                high += a * self.lower[j]
+        return low, high
+
+    def empty_and_bound_rows(self):
+        """Пустые, избыточные и вынуждающие строки по границам левой части"""
+        changed = False
+        tol = self.tolerance
+        for i, row in enumerate(self.rows):
+            if not self.alive[i]:
+                continue
+            inequality, b = self.inequalities[i], self.constants[i]
+            low, high = self._activity_bounds(row)
+
+            # Ограничение нарушается при любых значениях переменных
+            if ((inequality != '>=' and low > b + tol) or
+                    (inequality != '<=' and high < b - tol)):
+                self._infeasible()
+
+            if not row:
+                self._remove_row(i, 'empty_rows')
+                changed = True
+            elif ((inequality == '<=' and high <= b + tol) or
+                  (inequality == '>=' and low >= b - tol)):
+                self._remove_row(i, 'redundant_rows')
+                changed = True
+            elif (low == 0.0 and inequality != '>=' and abs(b) <= tol) or \
+                    (high == 0.0 and inequality != '<=' and abs(b) <= tol):
+                # Все слагаемые одного знака, сумма равна нулю: все переменные нулевые
+                self._remove_row(i, 'forcing_rows')
+                for j in list(row):
+                    self._fix(j, 0.0, 'forcing_rows')
+                changed = True
+        return changed
+
+    def singleton_rows(self):
+        """Строки с одной переменной превращаются в границы этой переменной"""
+        bounds = {}  # переменная -> [нижняя граница, верхняя граница, номера строк]
+        for i, row in enumerate(self.rows):
+            if self.alive[i] and len(row) == 1:
+                (j, a), = row.items()
+                bound = bounds.setdefault(j, [self.lower[j], self.upper[j], []])
+                inequality = self.inequalities[i] if a > 0 else FLIPPED[self.inequalities[i]]
+                value = self.constants[i] / a
+                if inequality != '<=':
+                    bound[0] = max(bound[0], value)
+                if inequality != '>=':
+                    bound[1] = min(bound[1], value)
+                bound[2].append(i)
+
+        changed = False
+        for j, (low, high, rows) in bounds.items():
+            if self.integer[j]:
+                low, high = np.ceil(low - self.tolerance), np.floor(high + self.tolerance)
+            if low > high + self.tolerance:
+                self._infeasible()
+
+            for i in rows:
+                self._remove_row(i, 'singleton_rows')
+            changed = True
+
+            self.upper[j] = high
+            if high - low <= self.tolerance:
+                self._fix(j, low, 'fixed_vars')
+            elif low > self.lower[j]:
+                self._shift(j, low)
+            elif low == -np.inf and high < np.inf:
+                self._shift(j, high, negate=True)
+        return changed
+
+    def duplicate_rows(self):
+        """Пропорциональные строки объединяются в одну (или две для диапазона)"""
+        groups = {}
+        for i, row in enumerate(self.rows):
+            if not self.alive[i] or len(row) < 2:
+                continue
+            first = min(row)
+            factor = row[first]
+            key = tuple(sorted((j, a / factor) for j, a in row.items()))
+            groups.setdefault(key, []).append((i, factor))
+
+        changed = False
+        for key, members in groups.items():
+            if len(members) < 2:
+                continue
+
+            # Границы общей левой части из всех строк группы
+            low, high = -np.inf, np.inf
+            for i, factor in members:
+                inequality = self.inequalities[i] if factor > 0 else FLIPPED[self.inequalities[i]]
+                value = self.constants[i] / factor
+                if inequality != '<=':
+                    low = max(low, value)
+                if inequality != '>=':
+                    high = min(high, value)
+            if low > high + self.tolerance:
+                self._infeasible()
+
+            # Строки группы заменяются равенством или парой неравенств (диапазоном)
+            if high - low <= self.tolerance:
+                merged = [('=', low)]
+            else:
+                merged = [(inequality, value) for inequality, value in (('>=', low), ('<=', high))
+                          if abs(value) < np.inf]
+            if len(merged) >= len(members):
+                continue
+
+            for i, _ in members:
+                self._remove_row(i, 'duplicate_rows')
+            for inequality, value in merged:
+                self._append_row(dict(key), inequality, value)
+                self.postsolve.removed_rows['duplicate_rows'] -= 1
+            changed = True
+        return changed
+
+    def _append_row(self, row, inequality, constant):
+        i = len(self.rows)
+        self.rows.append(row)
+        self.inequalities.append(inequality)
+        self.constants.append(constant)
+        self.alive.append(True)
+        for j in row:
+            self.columns[j].add(i)
+
+    def empty_columns(self):
+        """Переменные вне ограничений фиксируются на границе, если это не ухудшает цель"""
+        changed = False
+        for j in np.flatnonzero(~self.fixed):
+            if self._rows_of(j):
+                continue
+            cost = self.sense * self.c[j]
+            if cost == 0.0 or (self.lower[j] == 0.0 and cost > 0):
+                self._fix(j, 0.0, 'empty_columns')
+                changed = True
+            elif self.lower[j] == 0.0 and self.upper[j] < np.inf:
+                self._fix(j, self.upper[j], 'empty_columns')
+                changed = True
+            elif not any(self.alive):
+                raise ValueError("Целевая функция не ограничена")
+        return changed
+
+    def run(self, max_passes=10):
+        for _ in range(max_passes):
+            changed = self.empty_and_bound_rows()
+            changed |= self.singleton_rows()
+            changed |= self.duplicate_rows()
+            changed |= self.empty_columns()
+            if not changed:
+                break
+
+    def reduced_problem(self, problem):
+        """Упрощенная задача в общей форме"""
+        kept = np.flatnonzero(~self.fixed)
+        self.postsolve.index[kept] = np.arange(len(kept))
+
+        reduced = LinearProgrammingProblem()
+        reduced.objective = problem.objective
+        reduced.c = list(self.c[kept])
+        reduced.non_negative_vars = [k for k, j in enumerate(kept) if self.lower[j] == 0.0]
+        reduced.upper_bounds = {k: self.upper[j] for k, j in enumerate(kept) if self.upper[j] < np.inf}
+        integer = set(problem.integer_vars)
+        reduced.integer_vars = [k for k, j in enumerate(kept) if j in integer]
+        if problem.var_names is not None:
+            reduced.var_names = [problem.var_names[j] for j in kept]
+
+        rows, cols, values, inequalities, constants = [], [], [], [], []
+        index = self.postsolve.index
+        for i, row in enumerate(self.rows):
+            if not self.alive[i]:
+                continue
+            r = len(inequalities)
+            for j, a in row.items():
+                rows.append(r)
+                cols.append(index[j])
+                values.append(a)
+            inequalities.append(self.inequalities[i])
+            constants.append(self.constants[i])
+
+        reduced.set_constraints(np.array(rows, dtype=np.int64), np.array(cols, dtype=np.int64),
+                                np.array(values, dtype=float), inequalities, constants)
+        reduced.postsolve = self.postsolve
+        return reduced
+
+
+def presolve(problem, log_file=None, tolerance=1e-9):
+    """
+    Предварительная обработка задачи перед приведением к канонической форме:
+    удаляет пустые, избыточные, вынуждающие и повторяющиеся строки,
+    превращает строки с одной переменной в границы переменных (сдвиг, верхняя
+    граница или фиксация),
+    фиксирует переменные, не входящие в ограничения. Границы целочисленных
+    переменных округляются до целых.
+
+    Возвращает упрощенную задачу; ее атрибут postsolve (Postsolve) переносится
+    в каноническую форму и используется get_original_solution.
+    """
+    trace = as_trace(log_file)
+    presolver = _Presolver(problem, tolerance)
+    presolver.run()
+    reduced = presolver.reduced_problem(problem)
+
+    postsolve = presolver.postsolve
+    trace.message(SUMMARY, "Строк: {} -> {}, переменных: {} -> {}\n",
+                  problem.num_constraints, reduced.num_constraints, presolver.n, len(reduced.c))
+    for rule, name in RULES.items():
+        rows, cols = postsolve.removed_rows[rule], postsolve.removed_cols[rule]
+        if rows or cols:
+            trace.message(SUMMARY, "  {}: удалено строк {}, переменных {}\n", name, rows, cols)
+    if postsolve.objective_offset:
+        trace.message(SUMMARY, "  постоянное слагаемое целевой функции: {:.6f}\n",
+                      postsolve.objective_offset)
+
+    return reduced
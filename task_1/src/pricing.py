@@ -0,0 +1,209 @@
+import numpy as np
+
+# Защита от зацикливания: после DEGENERATE_LIMIT вырожденных шагов подряд
+# (значение цели не меняется) правые части возмущаются; если и после этого
+# шаги остаются вырожденными, они выбираются по правилу Бланда, пока не будет
+# сделан невырожденный шаг
+DEGENERATE_LIMIT = 50
+
+# Относительный допуск равенства отношений в тесте отношений по правилу Бланда
+BLAND_TIE_TOLERANCE = 1e-12
+
+
+class DantzigPricing:
+    """
+    Правило Данцига: входит переменная с наименьшей (самой отрицательной) оценкой.
+
+    Правило выбора разрешающего столбца работает с симплекс-таблицей:
+    select возвращает номер столбца или None (решение оптимально),
+    update вызывается перед каждым шагом, reset - при смене целевой функции.
+    Оценки сравниваются с -tolerance (None - допуск таблицы optimality_tolerance).
+    """
+
+    name = 'dantzig'
+
+    def __init__(self, tolerance=None):
+        self.tolerance = tolerance
+
+    def _tolerance(self, table):
+        return table.optimality_tolerance if self.tolerance is None else self.tolerance
+
+    def reset(self, table):
+        pass
+
+    def update(self, table, pivot_row, pivot_col):
+        pass
+
+    def select(self, table):
+        last_row = table.table[-1, :-1]
+        if np.all(last_row >= -self._tolerance(table)):
+            return None
+        return np.argmin(last_row)
+
+
+class SteepestEdgePricing(DantzigPricing):
+    """
+    Наискорейшее ребро: оценка делится на длину ребра sqrt(1 + ||B^(-1) a_j||^2).
+    Столбцы B^(-1) a_j уже есть в таблице, поэтому веса считаются точно.
+    """
+
+    name = 'steepest'
+
+    def select(self, table):
+        m = len(table.basis_indices)
+        last_row = table.table[-1, :-1]
+        candidates = np.flatnonzero(last_row < -self._tolerance(table))
+        if len(candidates) == 0:
+            return None
+
+        columns = table.table[:m, candidates]
+        weights = 1.0 + np.einsum('ij,ij->j', columns, columns)
+        return candidates[np.argmax(last_row[candidates] ** 2 / weights)]
+
+
+class DevexPricing(DantzigPricing):
+    """
+    Devex: приближенные веса наискорейшего ребра в опорной системе координат.
+    Веса хранятся по номерам переменных, а не столбцов таблицы.
+    """
+
+    name = 'devex'
+
+    def __init__(self, tolerance=None):
+        super().__init__(tolerance)
+        self.weights = None
+
+    def reset(self, table):
+        self.weights = np.ones(len(table.problem.c))
+
+    def update(self, table, pivot_row, pivot_col):
+        if self.weights is None:
+            self.reset(table)
+
+        row = table.table[pivot_row, :-1]
+        pivot = row[pivot_col]
+        entering = table.free_indices[pivot_col]
+        leaving = table.basis_indices[pivot_row]
+        weight = self.weights[entering]
+
+        free = table.free_indices
+        self.weights[free] = np.maximum(self.weights[free], (row / pivot) ** 2 * weight)
+        self.weights[leaving] = max(weight / pivot ** 2, 1.0)
+
+    def select(self, table):
+        if self.weights is None:
+            self.reset(table)
+
+        last_row = table.table[-1, :-1]
+        candidates = np.flatnonzero(last_row < -self._tolerance(table))
+        if len(candidates) == 0:
+            return None
+
+        weights = self.weights[table.free_indices[candidates]]
+        return candidates[np.argmax(last_row[candidates] ** 2 / weights)]
+
+
+class PartialPricing(DantzigPricing):
+    """
+    Частичный выбор: столбцы просматриваются сегментами по кругу, входит лучшая
+    переменная первого сегмента с отрицательной оценкой. Следующий просмотр
+    начинается с места, где остановился предыдущий.
+    """
+
+    name = 'partial'
+
+    def __init__(self, segment_size=None, tolerance=None):
+        super().__init__(tolerance)
+        self.segment_size = segment_size
+        self.start = 0
+
+    def reset(self, table):
+        self.start = 0
+
+    def select(self, table):
+        last_row = table.table[-1, :-1]
+        k = len(last_row)
+        if k == 0:
+            return None
+        size = self.segment_size or max(1, int(np.ceil(np.sqrt(k))))
+
+        for offset in range(0, k, size):
+            segment = (self.start + offset + np.arange(min(size, k - offset))) % k
+            best = np.argmin(last_row[segment])
+            if last_row[segment[best]] < -self._tolerance(table):
+                self.start = (segment[-1] + 1) % k
+                return segment[best]
+        return None
+
+
+class BlandPricing(DantzigPricing):
+    """
+    Правило Бланда: входит переменная с наименьшим номером среди переменных
+    с отрицательной оценкой. Медленнее остальных, но не зацикливается
+    (вместе с тестом отношений, выбирающим из равных отношений строку
+    базисной переменной с наименьшим номером)
+    """
+
+    name = 'bland'
+
+    def select(self, table):
+        last_row = table.table[-1, :-1]
+        candidates = np.flatnonzero(last_row < -self._tolerance(table))
+        if len(candidates) == 0:
+            return None
+        return candidates[np.argmin(table.free_indices[candidates])]
+
+
+PRICING_RULES = {rule.name: rule for rule in (DantzigPricing, SteepestEdgePricing,
+                                              DevexPricing, PartialPricing, BlandPricing)}
+
+
+def make_pricing(pricing):
+    """Правило выбора столбца по имени (объект правила возвращается как есть)"""
+    if pricing is None:
+        return DantzigPricing()
+    if isinstance(pricing, str):
+        if pricing not in PRICING_RULES:
+            raise ValueError(f"Неизвестное правило выбора столбца: {pricing}")
+        return PRICING_RULES[pricing]()
+    return pricing
+
+
+def ratio_test(column, b, tolerance=1e-10, basis_indices=None):
+    """
+    Выбор разрешающей строки по наименьшему отношению b_i / a_i (a_i > 0).
+    При равенстве отношений выбирается первая строка, а если заданы номера
+    базисных переменных строк basis_indices - строка с наименьшим номером
+    (правило Бланда).
+    """
+    positive = column > tolerance
+    if not np.any(positive):
+        raise ValueError("Целевая функция не ограничена")
+
+    ratios = np.full(len(column), np.inf)
+    ratios[positive] = b[positive] / column[positive]
+    if basis_indices is None:
+        return np.argmin(ratios)
+    theta = np.min(ratios)
+    ties = np.flatnonzero(ratios <= theta + BLAND_TIE_TOLERANCE * max(1.0, abs(theta)))
+    return ties[np.argmin(basis_indices[ties])]
+
+
+def harris_ratio_test(column, b, tolerance=1e-10, feasibility=1e-9):
+    """
+    Двухпроходный тест отношений Харриса.
+
+    1-й проход: наибольший шаг theta при допустимом нарушении b_i >= -feasibility.
+    2-й проход: среди строк с отношением не больше theta выбирается строка
+    с наибольшим |a_i| - это устойчивее и уменьшает зацикливание на вырожденных задачах.
+    """
+    positive = column > tolerance
+    if not np.any(positive):
+        raise ValueError("Целевая функция не ограничена")
+
+    rows = np.flatnonzero(positive)
+    alpha = column[rows]
+    theta = np.min((b[rows] + feasibility) / alpha)
+
+    eligible = b[rows] / alpha <= theta
+    return rows[eligible][np.argmax(alpha[eligible])]
@@ -1,4 +1,6 @@
+import copy
 import numpy as np
+from .sparse import SparseMatrix, GrowableArray, row
 
 class LinearProgrammingProblem:
     """Задача линейного программирования в общей форме"""
@@ -6,16 +8,121 @@ class LinearProgrammingProblem:
     def __init__(self):
         self.objective = None  # 'min' или 'max'
         self.c = []           # Коэффициенты целевой функции
-        self.constraints = [] # Ограничения
         self.non_negative_vars = []  # Индексы неотрицательных переменных
+        self.lower_bounds = {}       # Нижние границы, отличные от 0: {индекс: значение}
+        self.upper_bounds = {}       # Верхние границы: {индекс: значение}
+        self.integer_vars = []       # Индексы целочисленных переменных
+        
+        # Ограничения хранятся построчно в виде троек (строка, столбец, значение),
+        # нулевые коэффициенты не сохраняются
+        self.rows = GrowableArray(np.int64)   # Номера строк ненулевых коэффициентов
+        self.cols = GrowableArray(np.int64)   # Номера столбцов ненулевых коэффициентов
+        self.values = GrowableArray(float)    # Ненулевые коэффициенты
+        self.inequalities = []                # '<=', '=', '>='
+        self.constants = GrowableArray(float) # Правые части
+        self.var_names = None                 # Имена переменных (если заданы во входном файле)
+        self.postsolve = None                 # Обратное преобразование после presolve
         
     def add_constraint(self, coefficients, inequality, constant):
-        """Добавление ограничения"""
-        self.constraints.append({
-            'coefficients': coefficients,
-            'inequality': inequality,  # '<=', '=', '>='
-            'constant': constant
-        })
+        """Добавление ограничения (список коэффициентов или словарь {индекс: коэффициент})"""
+        if isinstance(coefficients, dict):
+            cols = np.fromiter(coefficients.keys(), dtype=np.int64, count=len(coefficients))
+            values = np.fromiter(coefficients.values(), dtype=float, count=len(coefficients))
+        else:
+            values = np.asarray(coefficients, dtype=float)
+            cols = np.arange(len(values))
+        
+        self.add_constraints(np.zeros(len(values), dtype=np.int64), cols, values,
+                             [inequality], [constant])
+    
+    def add_constraints(self, rows, cols, values, inequalities, constants):
+        """
+        Добавление блока ограничений тройками (строка, столбец, значение).
+        Номера строк отсчитываются от первого ограничения блока.
+        """
+        values = np.asarray(values, dtype=float)
+        nonzero = values != 0
+        self.rows.extend(np.asarray(rows)[nonzero] + self.num_constraints)
+        self.cols.extend(np.asarray(cols)[nonzero])
+        self.values.extend(values[nonzero])
+        self.inequalities.extend(inequalities)  # '<=', '=', '>='
+        self.constants.extend(constants)
+    
+    def set_constraints(self, rows, cols, values, inequalities, constants):
+        """Замена всех ограничений тройками (строка, столбец, значение)"""
+        self.rows, self.cols, self.values = GrowableArray(np.int64), GrowableArray(np.int64), GrowableArray(float)
+        self.constants = GrowableArray(float)
+        self.inequalities = []
+        self.add_constraints(rows, cols, values, inequalities, constants)
+    
+    def variable_bounds(self, n=None):
+        """
+        Массивы нижних и верхних границ переменных. Переменные из non_negative_vars
+        имеют нижнюю границу 0, остальные - -inf, если граница не задана явно.
+        """
+        n = len(self.c) if n is None else n
+        lower = np.full(n, -np.inf)
+        upper = np.full(n, np.inf)
+        lower[list(self.non_negative_vars)] = 0.0
+        for j, value in self.lower_bounds.items():
+            lower[j] = value
+        for j, value in self.upper_bounds.items():
+            upper[j] = value
+        return lower, upper
+    
+    def bounds_as_constraints(self):
+        """
+        Задача, в которой границы переменных (кроме x >= 0) записаны
+        дополнительными строками ограничений. Без границ возвращается сама задача.
+        """
+        if not self.lower_bounds and not self.upper_bounds:
+            return self
+        
+        lower, upper = self.variable_bounds(self.num_vars)
+        rows, cols, inequalities, constants = [], [], [], []
+        for j in range(len(lower)):
+            for inequality, value in (('>=', lower[j]), ('<=', upper[j])):
+                if np.isfinite(value) and not (inequality == '>=' and value == 0.0):
+                    rows.append(self.num_constraints + len(rows))
+                    cols.append(j)
+                    inequalities.append(inequality)
+                    constants.append(value)
+        
+        problem = copy.copy(self)
+        problem.set_constraints(np.concatenate([self.rows.view, np.array(rows, dtype=np.int64)]),
+                                np.concatenate([self.cols.view, np.array(cols, dtype=np.int64)]),
+                                np.concatenate([self.values.view, np.ones(len(rows))]),
+                                self.inequalities + inequalities,
+                                np.concatenate([self.constants.view, constants]))
+        problem.non_negative_vars = list(np.flatnonzero(lower == 0.0))
+        problem.lower_bounds, problem.upper_bounds = {}, {}
+        return problem
+    
+    @property
+    def num_constraints(self):
+        return len(self.inequalities)
+    
+    @property
+    def num_vars(self):
+        n = len(self.c)
+        if len(self.cols):
+            n = max(n, int(self.cols.view.max()) + 1)
+        return n
+    
+    def constraint_matrix(self):
+        """Матрица ограничений в формате CSR"""
+        return SparseMatrix.from_triplets(self.rows.view, self.cols.view, self.values.view,
+                                          (self.num_constraints, self.num_vars))
+    
+    @property
+    def constraints(self):
+        """Ограничения в виде списка словарей с плотными строками коэффициентов"""
+        A = self.constraint_matrix()
+        return [{
+            'coefficients': list(A.row(i)),
+            'inequality': self.inequalities[i],
+            'constant': float(self.constants.view[i])
+        } for i in range(self.num_constraints)]
     
     def __str__(self):
         result = f"Целевая функция: {self.objective} "
@@ -29,6 +136,13 @@ class LinearProgrammingProblem:
             result += f"Неотрицательные переменные: {', '.join(var_names)}\n"
         else:
             result += "Все переменные могут иметь любой знак\n"
+        bounds = [f"x{j+1} >= {value}" for j, value in sorted(self.lower_bounds.items())]
+        bounds += [f"x{j+1} <= {value}" for j, value in sorted(self.upper_bounds.items())]
+        if bounds:
+            result += f"Границы переменных: {', '.join(bounds)}\n"
+        if self.integer_vars:
+            var_names = [f"x{i+1}" for i in sorted(self.integer_vars)]
+            result += f"Целочисленные переменные: {', '.join(var_names)}\n"
         return result
 
 class CanonicalProblem:
@@ -36,12 +150,61 @@ class CanonicalProblem:
     
     def __init__(self):
         self.c = None        # Коэффициенты целевой функции (min)
-        self.A = None        # Матрица ограничений
+        self.A = None        # Матрица ограничений (numpy или SparseMatrix)
         self.b = None        # Правые части
         self.var_names = []  # Имена переменных
         self.free_var_mapping = {}  # Отображение свободных переменных
         self.canonical_var_indices = {}  # Сопоставление исходных индексов с каноническими
         self.original_var_count = 0 # Количество исходных переменных
+        self.slack_indices = None   # Фиктивная переменная каждой строки (-1, если ее нет)
+        self.postsolve = None       # Обратное преобразование после presolve
+        self.upper = None           # Верхние границы переменных (None - границ нет)
+        self.objective_offset = 0.0 # Постоянное слагаемое целевой функции (после сдвига переменных)
+        self.variable_shift = None  # Сдвиг исходных переменных: x = shift + sign * x′
+        self.variable_sign = None
+        self.row_scale = None       # Множители масштабирования строк и столбцов (None - без него):
+        self.column_scale = None    # A_s = diag(row_scale) A diag(column_scale), x = column_scale * x_s
+    
+    def add_row(self, coefficients, inequality, constant):
+        """
+        Копия задачи с дополнительным ограничением coefficients * x <= (>=) constant
+        и его фиктивной переменной (последний столбец). Строка с constant < 0
+        умножается на -1, чтобы правые части оставались неотрицательными.
+        """
+        coefficients = np.asarray(coefficients, dtype=float)
+        m, n = self.A.shape
+        slack = 1.0 if inequality == '<=' else -1.0
+        if constant < 0:
+            coefficients, constant, slack = -coefficients, -constant, -slack
+        
+        problem = copy.copy(self)
+        if isinstance(self.A, SparseMatrix):
+            rows, cols, values = self.A.to_triplets()
+            nonzero = np.flatnonzero(coefficients)
+            problem.A = SparseMatrix.from_triplets(
+                np.concatenate([rows, np.full(len(nonzero) + 1, m)]),
+                np.concatenate([cols, nonzero, [n]]),
+                np.concatenate([values, coefficients[nonzero], [slack]]),
+                (m + 1, n + 1), self.A.format)
+        else:
+            problem.A = np.zeros((m + 1, n + 1))
+            problem.A[:m, :n] = self.A
+            problem.A[m, :n] = coefficients
+            problem.A[m, n] = slack
+        problem.b = np.append(np.asarray(self.b, dtype=float), constant)
+        problem.c = np.append(np.asarray(self.c, dtype=float), 0.0)
+        
+        slack_count = sum(1 for name in self.var_names if name.startswith('s'))
+        problem.var_names = list(self.var_names) + [f"s{slack_count + 1}"]
+        if self.slack_indices is not None:
+            problem.slack_indices = np.append(self.slack_indices, n)
+        if self.upper is not None:
+            problem.upper = np.append(self.upper, np.inf)
+        if self.column_scale is not None:
+            # Новая строка не масштабируется
+            problem.row_scale = np.append(self.row_scale, 1.0)
+            problem.column_scale = np.append(self.column_scale, 1.0)
+        return problem
     
     def __str__(self):
         result = "Каноническая форма:\n"
@@ -52,17 +215,20 @@ class CanonicalProblem:
             if abs(self.c[i]) > 1e-10:  # Показываем только ненулевые коэффициенты
                 obj_terms.append(f"{self.c[i]:.2f}*{self.var_names[i]}")
         
+        if self.objective_offset:
+            obj_terms.append(f"{self.objective_offset:.2f}")
+        
         if obj_terms:
             result += "Целевая функция: min " + " + ".join(obj_terms) + "\n"
         else:
             result += "Целевая функция: min 0\n"
         
         result += "Ограничения:\n"
-        for i in range(len(self.A)):
+        for i in range(self.A.shape[0]):
+            a_i = row(self.A, i)
             equation_terms = []
-            for j in range(self.A.shape[1]):
-                if abs(self.A[i, j]) > 1e-10:  # Показываем только ненулевые коэффициенты
-                    equation_terms.append(f"{self.A[i, j]:.2f}*{self.var_names[j]}")
+            for j in np.flatnonzero(np.abs(a_i) > 1e-10):  # Показываем только ненулевые коэффициенты
+                equation_terms.append(f"{a_i[j]:.2f}*{self.var_names[j]}")
             
             if equation_terms:
                 equation = " + ".join(equation_terms)
@@ -71,4 +237,22 @@ class CanonicalProblem:
                 
             result += f"{equation} = {self.b[i]:.2f}\n"
         
+        if self.upper is not None:
+            bounds = [f"{self.var_names[j]} <= {self.upper[j]:.2f}"
+                      for j in np.flatnonzero(np.isfinite(self.upper))]
+            result += "Верхние границы: " + ", ".join(bounds) + "\n"
+        
+        if self.variable_shift is not None:
+            changes = []
+            for j in np.flatnonzero((self.variable_shift != 0) | (self.variable_sign < 0)):
+                sign = '+' if self.variable_sign[j] > 0 else '-'
+                changes.append(f"x{j+1} = {self.variable_shift[j]:.2f} {sign} x{j+1}′")
+            if changes:
+                result += "Замена переменных: " + ", ".join(changes) + "\n"
+        
+        if self.column_scale is not None:
+            result += "Масштабирование строк: " + ", ".join(f"{r:g}" for r in self.row_scale) + "\n"
+            result += "Масштабирование столбцов (x = k * x_s): " + ", ".join(
+                f"{name}: {k:g}" for name, k in zip(self.var_names, self.column_scale)) + "\n"
+        
         return result
\ No newline at end of file
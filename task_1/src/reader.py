@@ -0,0 +1,314 @@
+import os
+from array import array
+import numpy as np
+from .problem import LinearProgrammingProblem
+
+# Типы строк MPS и соответствующие знаки ограничений
+MPS_ROW_TYPES = {'L': '<=', 'G': '>=', 'E': '='}
+
+# Границы целочисленных переменных MPS и соответствующие обычные границы
+MPS_INTEGER_BOUNDS = {'UI': 'UP', 'LI': 'LO'}
+
+
+def read_problem_from_file(filename):
+    """Чтение задачи из файла: формат MPS (*.mps) или формат программы"""
+    if os.path.splitext(filename)[1].lower() == '.mps':
+        return read_mps(filename)
+
+    with open(filename, 'r', encoding='utf-8') as f:
+        for line in f:
+            first = line.split()
+            if first:
+                break
+        else:
+            raise ValueError("Пустой файл задачи")
+
+    if first[0].upper() in ('NAME', 'ROWS'):
+        return read_mps(filename)
+    return read_text(filename)
+
+
+def _parse_row(text):
+    """Коэффициенты строки в виде массива numpy"""
+    return np.array(text.split(), dtype=float)
+
+
+class _RowBlock:
+    """
+    Накопитель строк ограничений: токены строк копятся в общем списке и
+    разом превращаются в массив троек, чтобы не вызывать numpy на каждую строку.
+    """
+
+    def __init__(self, problem, block_size=4096):
+        self.problem = problem
+        self.block_size = block_size
+        self._clear()
+
+    def _clear(self):
+        self.tokens = []
+        self.lengths = []
+        self.inequalities = []
+        self.constants = []
+
+    def add(self, coefficients_text, inequality, constant_text):
+        row = coefficients_text.split()
+        self.tokens.extend(row)
+        self.lengths.append(len(row))
+        self.inequalities.append(inequality)
+        self.constants.append(float(constant_text))
+        if len(self.lengths) >= self.block_size:
+            self.flush()
+
+    def flush(self):
+        if not self.lengths:
+            return
+        values = np.array(self.tokens, dtype=float)
+        lengths = np.array(self.lengths, dtype=np.int64)
+        rows = np.repeat(np.arange(len(lengths)), lengths)
+        cols = np.arange(len(values)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        self.problem.add_constraints(rows, cols, values, self.inequalities, self.constants)
+        self._clear()
+
+
+def read_text(filename):
+    """
+    Потоковое чтение задачи в формате программы:
+        max 2 1 3 2
+        1 2 1 0 <= 11
+        var 1 2 3 4 >= 0
+        var 2 3 <= 5
+        int 1 2
+    Строки var задают неотрицательность (>= 0) и границы переменных (>= l, <= u),
+    строки int - целочисленные переменные.
+    Строки читаются по одной и блоками переводятся в массивы троек.
+    """
+    problem = LinearProgrammingProblem()
+    problem.non_negative_vars = []
+    block = _RowBlock(problem)
+
+    with open(filename, 'r', encoding='utf-8') as f:
+        lines = (line.strip() for line in f)
+        lines = (line for line in lines if line)
+
+        # Парсинг целевой функции
+        objective_line = next(lines, '').lower()
+        if objective_line.startswith('max'):
+            problem.objective = 'max'
+        elif objective_line.startswith('min'):
+            problem.objective = 'min'
+        else:
+            raise ValueError("Неверный формат целевой функции")
+        problem.c = list(_parse_row(objective_line[3:]))
+
+        # Парсинг ограничений и информации о переменных
+        for line in lines:
+            if line[:3].lower() == 'int':
+                problem.integer_vars.extend(int(part) - 1 for part in line.split()[1:])
+                continue
+
+            if line[:3].lower() == 'var':
+                # Обработка информации о переменных
+                parts = line.lower().split()
+                for inequality in ('>=', '<='):
+                    if inequality in parts:
+                        idx = parts.index(inequality)
+                        # Собираем все числа до знака, граница - после него
+                        indices = [int(part) - 1 for part in parts[1:idx] if part.isdigit()]
+                        value = float(parts[idx + 1]) if idx + 1 < len(parts) else 0.0
+                        if inequality == '<=':
+                            problem.upper_bounds.update(dict.fromkeys(indices, value))
+                        elif value == 0.0:
+                            problem.non_negative_vars.extend(indices)
+                        else:
+                            problem.lower_bounds.update(dict.fromkeys(indices, value))
+                        break
+                continue
+
+            for inequality in ('<=', '>=', '='):
+                idx = line.find(inequality)
+                if idx >= 0:
+                    block.add(line[:idx], inequality, line[idx + len(inequality):])
+                    break
+
+    block.flush()
+    return problem
+
+
+def read_mps(filename):
+    """
+    Потоковое чтение задачи в формате MPS (свободный формат: поля разделены пробелами).
+
+    Поддерживаются секции NAME, OBJSENSE, ROWS, COLUMNS, RHS, RANGES, BOUNDS.
+    Границы переменных сохраняются в задаче как границы (lower_bounds, upper_bounds).
+    Столбцы между маркерами INTORG и INTEND и переменные с границей BV - целочисленные.
+    """
+    problem = LinearProgrammingProblem()
+    problem.objective = 'min'
+
+    row_index = {}      # Имя строки -> номер ограничения
+    inequalities = []
+    objective_row = None
+    col_index = {}      # Имя столбца -> номер переменной
+    col_names = []
+
+    # Поэлементное добавление: компактные массивы модуля array (8 байт на элемент)
+    rows = array('q')
+    cols = array('q')
+    values = array('d')
+    objective = array('d')
+    constants = None
+    ranges = {}
+    lower, upper = {}, {}
+    integer = set()
+    in_integer_block = False
+
+    section = None
+    with open(filename, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip() or line.startswith('*'):
+                continue
+
+            fields = line.split()
+            if not line[0].isspace():
+                # Заголовок секции
+                section = fields[0].upper()
+                if section == 'OBJSENSE' and len(fields) > 1:
+                    problem.objective = fields[1].lower()[:3]
+                elif section == 'RHS' or section == 'ENDATA':
+                    if constants is None:
+                        constants = np.zeros(len(inequalities))
+                if section == 'ENDATA':
+                    break
+                continue
+
+            if section == 'OBJSENSE':
+                problem.objective = fields[0].lower()[:3]
+
+            elif section == 'ROWS':
+                row_type, name = fields[0].upper(), fields[1]
+                if row_type == 'N':
+                    if objective_row is None:
+                        objective_row = name
+                    continue
+                if row_type not in MPS_ROW_TYPES:
+                    raise ValueError(f"Неизвестный тип строки MPS: {row_type}")
+                row_index[name] = len(inequalities)
+                inequalities.append(MPS_ROW_TYPES[row_type])
+
+            elif section == 'COLUMNS':
+                if len(fields) >= 3 and fields[1].upper() == "'MARKER'":
+                    marker = fields[2].upper()
+                    if marker == "'INTORG'":
+                        in_integer_block = True
+                    elif marker == "'INTEND'":
+                        in_integer_block = False
+                    continue
+                name = fields[0]
+                j = col_index.get(name)
+                if j is None:
+                    j = col_index[name] = len(col_names)
+                    col_names.append(name)
+                    objective.append(0.0)
+                if in_integer_block:
+                    integer.add(j)
+                for row_name, value in zip(fields[1::2], fields[2::2]):
+                    if row_name == objective_row:
+                        objective[j] = float(value)
+                    elif row_name in row_index:
+                        rows.append(row_index[row_name])
+                        cols.append(j)
+                        values.append(float(value))
+
+            elif section == 'RHS':
+                # Первое поле - имя вектора правых частей (может отсутствовать)
+                pairs = fields[1:] if len(fields) % 2 else fields
+                for row_name, value in zip(pairs[::2], pairs[1::2]):
+                    if row_name in row_index:
+                        constants[row_index[row_name]] = float(value)
+
+            elif section == 'RANGES':
+                pairs = fields[1:] if len(fields) % 2 else fields
+                for row_name, value in zip(pairs[::2], pairs[1::2]):
+                    ranges[row_index[row_name]] = float(value)
+
+            elif section == 'BOUNDS':
+                # Поля: тип [имя набора границ] столбец [значение]
+                bound_type = fields[0].upper()
+                if bound_type in MPS_INTEGER_BOUNDS:
+                    # Граница целочисленной переменной: как UP / LO
+                    bound_type = MPS_INTEGER_BOUNDS[bound_type]
+                    integer.add(col_index[fields[-2]])
+                has_value = bound_type in ('UP', 'LO', 'FX')
+                if len(fields) == (4 if has_value else 3):
+                    fields = fields[:1] + fields[2:]
+                j = col_index[fields[1]]
+                value = float(fields[2]) if has_value else 0.0
+                if bound_type == 'UP':
+                    upper[j] = value
+                    if value < 0 and lower.get(j, 0.0) == 0.0:
+                        lower[j] = -np.inf
+                elif bound_type == 'LO':
+                    lower[j] = value
+                elif bound_type == 'FX':
+                    lower[j] = upper[j] = value
+                elif bound_type == 'FR':
+                    lower[j], upper[j] = -np.inf, np.inf
+                elif bound_type == 'MI':
+                    lower[j] = -np.inf
+                elif bound_type == 'PL':
+                    upper[j] = np.inf
+                elif bound_type == 'BV':
+                    lower[j], upper[j] = 0.0, 1.0
+                    integer.add(j)
+                else:
+                    raise ValueError(f"Неподдерживаемый тип границы MPS: {bound_type}")
+
+    if constants is None:
+        constants = np.zeros(len(inequalities))
+    constants = list(constants)
+
+    # Диапазоны (RANGES): второе ограничение строки добавляется отдельной строкой
+    extra_rows, extra_cols, extra_values = [], [], []
+    matrix_rows = np.frombuffer(rows, dtype=np.int64)
+    matrix_cols = np.frombuffer(cols, dtype=np.int64)
+    matrix_values = np.frombuffer(values, dtype=float)
+    order = np.argsort(matrix_rows, kind='stable') if ranges else None
+    for i, r in ranges.items():
+        in_row = order[np.searchsorted(matrix_rows[order], i, 'left'):np.searchsorted(matrix_rows[order], i, 'right')]
+        b = constants[i]
+        if inequalities[i] == '=':
+            inequalities[i] = '>=' if r > 0 else '<='
+            second = ('<=', b + abs(r)) if r > 0 else ('>=', b - abs(r))
+        elif inequalities[i] == '<=':
+            second = ('>=', b - abs(r))
+        else:
+            second = ('<=', b + abs(r))
+        new_row = len(inequalities)
+        inequalities.append(second[0])
+        constants.append(second[1])
+        extra_rows.append(np.full(len(in_row), new_row))
+        extra_cols.append(matrix_cols[in_row])
+        extra_values.append(matrix_values[in_row])
+
+    # Границы переменных: x >= 0 по умолчанию
+    n = len(col_names)
+    problem.non_negative_vars = []
+    for j in range(n):
+        lo, up = lower.get(j, 0.0), upper.get(j, np.inf)
+        if lo == 0.0:
+            problem.non_negative_vars.append(j)
+        elif lo > -np.inf:
+            problem.lower_bounds[j] = lo
+        if up < np.inf:
+            problem.upper_bounds[j] = up
+
+    if extra_rows:
+        matrix_rows = np.concatenate([matrix_rows] + [np.asarray(r, dtype=np.int64) for r in extra_rows])
+        matrix_cols = np.concatenate([matrix_cols] + [np.asarray(c, dtype=np.int64) for c in extra_cols])
+        matrix_values = np.concatenate([matrix_values] + [np.asarray(v, dtype=float) for v in extra_values])
+
+    problem.c = list(objective)
+    problem.var_names = col_names
+    problem.integer_vars = sorted(integer)
+    problem.set_constraints(matrix_rows, matrix_cols, matrix_values, inequalities, constants)
+    return problem
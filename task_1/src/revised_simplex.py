@@ -0,0 +1,338 @@
+import numpy as np
+from .linalg import TriangularSolver
+from .pricing import harris_ratio_test, DEGENERATE_LIMIT
+from .simplex_table import TOLERANCE, PIVOT_TOLERANCE, PERTURBATION
+from .sparse import column
+from .trace import as_trace, timed_phase, SUMMARY, PIVOTS
+
+
+class BasisFactorization:
+    """
+    LU-разложение базисной матрицы с обновлениями в мультипликативной форме.
+
+    После разложения B = P^T L U каждая смена базиса добавляет
+    элементарную eta-матрицу E, так что B_new^{-1} = E B^{-1}.
+    Когда eta-матриц становится слишком много, базис разлагается заново.
+    Множители L и U хранятся как есть (не обращаются), прямой и обратный
+    ход - решение треугольных систем с ними (TriangularSolver).
+    """
+
+    def __init__(self, refactor_frequency=50):
+        self.refactor_frequency = refactor_frequency
+        self.perm = None   # Перестановка строк (частичный выбор ведущего элемента)
+        self.L = None      # Нижнетреугольный множитель (единичная диагональ)
+        self.U = None      # Верхнетреугольный множитель
+        self._solvers = None  # Решатели систем с L, U, U^T, L^T
+        self.etas = []     # Список (строка r, столбец eta)
+        self.factorizations = 0
+
+    def factorize(self, B):
+        """
+        LU-разложение с частичным выбором ведущего элемента. Если базисная матрица
+        вырождена, линейно зависимые столбцы заменяются единичными векторами e_i
+        строк, оставшихся без ведущего элемента; возвращается список замен
+        (позиция столбца в базисе, строка i)
+        """
+        m = B.shape[0]
+        LU = np.array(B, dtype=float)
+        perm = np.arange(m)
+        replaced = []
+        tolerance = 1e-12 * max(1.0, np.max(np.abs(LU), initial=0.0))
+
+        for k in range(m):
+            p = k + np.argmax(np.abs(LU[k:, k]))
+            if abs(LU[p, k]) < tolerance:
+                # Столбец e_i строки perm[k] после исключения первых k столбцов
+                # равен e_k: U[:k, k] = 0, ведущий элемент 1
+                replaced.append((k, perm[k]))
+                LU[:, k] = 0.0
+                LU[k, k] = 1.0
+                continue
+            if p != k:
+                LU[[k, p], :] = LU[[p, k], :]
+                perm[[k, p]] = perm[[p, k]]
+
+            LU[k + 1:, k] /= LU[k, k]
+            LU[k + 1:, k + 1:] -= np.multiply.outer(LU[k + 1:, k], LU[k, k + 1:])
+
+        self.perm = perm
+        self.L = np.tril(LU, -1) + np.eye(m)
+        self.U = np.triu(LU)
+        self._solvers = (TriangularSolver(self.L), TriangularSolver(self.U, lower=False),
+                         TriangularSolver(self.U.T), TriangularSolver(self.L.T, lower=False))
+        self.etas = []
+        self.factorizations += 1
+        return replaced
+
+    @property
+    def needs_refactor(self):
+        return len(self.etas) >= self.refactor_frequency
+
+    def ftran(self, a):
+        """Решение B x = a (прямой ход)"""
+        # L z = P a, U x = z
+        L, U = self._solvers[:2]
+        x = U.solve(L.solve(np.asarray(a, dtype=float)[self.perm]))
+
+        # Eta-матрицы в порядке добавления
+        for r, eta in self.etas:
+            x_r = x[r]
+            x += x_r * eta
+            x[r] = x_r * eta[r]
+
+        return x
+
+    def btran(self, c):
+        """Решение y B = c (обратный ход)"""
+        y = np.array(c, dtype=float)
+
+        # Eta-матрицы в обратном порядке: меняется только компонента r
+        for r, eta in reversed(self.etas):
+            y[r] = y @ eta
+
+        # U^T z = y, L^T w = z, затем возврат к исходному порядку строк
+        result = np.empty(len(y))
+        U_T, L_T = self._solvers[2:]
+        result[self.perm] = L_T.solve(U_T.solve(y))
+        return result
+
+    def update(self, r, d):
+        """Смена базиса: d = B^{-1} a_q, r - позиция выходящей переменной"""
+        eta = -d / d[r]
+        eta[r] = 1.0 / d[r]
+        self.etas.append((r, eta))
+
+
+class RevisedSimplexSolver:
+    """
+    Модифицированный (revised) симплекс-метод для канонической задачи.
+
+    Вместо полной симплекс-таблицы хранится только разложение базисной
+    матрицы. Вспомогательные переменные первого этапа не добавляются
+    в матрицу A: их столбцы - единичные векторы, которые строятся по запросу.
+    """
+
+    def __init__(self, canonical_problem, refactor_frequency=50, max_iterations=None):
+        self.problem = canonical_problem
+        self.refactor_frequency = refactor_frequency
+        self.max_iterations = max_iterations
+        self.factorization = None
+        self.basis_indices = None
+        self.x_basis = None
+        self.iterations = 0
+        self.status = "not solved"
+        self.repairs = 0  # Столбцов вырожденного базиса, замененных при разложении
+        self.perturbation = None  # Возмущение правых частей при зацикливании (см. _perturb)
+        # Допустимое нарушение x_B >= 0 в тесте Харриса (относительно правых частей)
+        self.feasibility_tolerance = TOLERANCE * max(1.0, np.max(np.abs(canonical_problem.b), initial=0.0))
+        self.phases = {}  # Время и число шагов этапов: {'phase1': {'time': ..., 'iterations': ...}, ...}
+
+    def _column(self, j):
+        """Столбец матрицы [A | I] вспомогательной задачи"""
+        n = len(self.problem.c)
+        if j < n:
+            return column(self.problem.A, j)
+        unit = np.zeros(self.problem.A.shape[0])
+        unit[j - n] = 1.0
+        return unit
+
+    def _var_name(self, j):
+        n = len(self.problem.c)
+        if j < n and self.problem.var_names:
+            return self.problem.var_names[j]
+        return f"y{j - n + 1}"
+
+    def _slack_column(self, i):
+        """
+        Столбец для замены линейно зависимого столбца базиса в строке i:
+        фиктивная переменная строки, если она есть и не в базисе, иначе вспомогательная
+        """
+        slack = self.problem.slack_indices
+        if slack is not None and slack[i] >= 0 and slack[i] not in self.basis_indices:
+            return int(slack[i])
+        return len(self.problem.c) + i
+
+    def _refactor(self):
+        """
+        Повторное разложение базиса и пересчет базисного решения. Линейно
+        зависимые столбцы вырожденного базиса заменяются столбцами фиктивных
+        (вспомогательных) переменных их строк, и базис разлагается заново
+        """
+        B = np.column_stack([self._column(j) for j in self.basis_indices])
+        replaced = self.factorization.factorize(B)
+        if replaced:
+            for k, i in replaced:
+                self.basis_indices[k] = self._slack_column(i)
+            B = np.column_stack([self._column(j) for j in self.basis_indices])
+            self.factorization.factorize(B)
+            self.repairs += len(replaced)
+        b = self.problem.b if self.perturbation is None else self.problem.b + self.perturbation
+        self.x_basis = self.factorization.ftran(b)
+
+    def _perturb(self):
+        """
+        Возмущение базисного решения на случайные величины порядка PERTURBATION
+        (как SimplexTable.perturb): вырожденные шаги становятся невырожденными
+        """
+        rng = np.random.default_rng(len(self.x_basis))
+        delta = PERTURBATION * (1.0 + np.abs(self.x_basis)) * rng.uniform(0.5, 1.0, len(self.x_basis))
+        B = np.column_stack([self._column(j) for j in self.basis_indices])
+        self.perturbation = B @ delta
+        self.x_basis = self.x_basis + delta
+
+    def _reduced_costs(self, cost, y):
+        """Оценки d_j = c_j - y a_j для всех переменных"""
+        n = len(self.problem.c)
+        d = np.empty(len(cost))
+        d[:n] = cost[:n] - self.problem.A.T @ y
+        d[n:] = cost[n:] - y
+        return d
+
+    def _pivot(self, r, q, alpha):
+        """Смена базиса: переменная q входит в базис на позицию r"""
+        theta = max(self.x_basis[r] / alpha[r], 0.0)  # Тест Харриса допускает x_r чуть меньше 0
+        self.x_basis -= theta * alpha
+        self.x_basis[r] = theta
+        self.basis_indices[r] = q
+        self.factorization.update(r, alpha)
+        return theta
+
+    def _run_phase(self, cost, allowed, trace):
+        """
+        Итерации симплекс-метода с заданной целевой функцией. После
+        DEGENERATE_LIMIT вырожденных шагов подряд правые части возмущаются;
+        в конце этапа возмущение снимается
+        """
+        degenerate_steps = 0
+        while True:
+            if self.iterations >= self.max_iterations:
+                self.status = "max iterations reached"
+                raise ValueError("Достигнуто максимальное число итераций")
+
+            if self.factorization.needs_refactor:
+                self._refactor()
+            if self.perturbation is None and degenerate_steps >= DEGENERATE_LIMIT:
+                self._perturb()
+
+            # Двойственные переменные и оценки
+            y = self.factorization.btran(cost[self.basis_indices])
+            d = self._reduced_costs(cost, y)
+            d[self.basis_indices] = 0
+            d[~allowed] = 0
+
+            q = np.argmin(d)
+            if d[q] >= -1e-10:
+                if self.perturbation is not None:
+                    self.perturbation = None
+                    self._refactor()
+                    trace.message(PIVOTS, "Возмущение правых частей снято\n")
+                    if np.min(self.x_basis, initial=0.0) < -1e-6 * max(1.0, np.max(np.abs(self.problem.b))):
+                        self.status = "not solved"
+                        raise ValueError("Базисное решение недопустимо после снятия возмущения")
+                return
+
+            # Разрешающий столбец и выбор выходящей переменной
+            # Тест отношений Харриса с относительным допуском разрешающего элемента:
+            # крошечные alpha_i не становятся разрешающими, из равных отношений
+            # выбирается строка с наибольшим alpha_i (базис остается хорошо обусловленным)
+            alpha = self.factorization.ftran(self._column(q))
+            tolerance = max(1e-10, PIVOT_TOLERANCE * np.max(np.abs(alpha), initial=0.0))
+            try:
+                r = harris_ratio_test(alpha, self.x_basis, tolerance, self.feasibility_tolerance)
+            except ValueError:
+                self.status = "unbounded"
+                raise
+
+            self.iterations += 1
+            if trace.enabled(PIVOTS):
+                trace.message(PIVOTS, "Шаг {}: входит {}, выходит {}\n", self.iterations,
+                              self._var_name(q), self._var_name(self.basis_indices[r]))
+
+            objective = cost[self.basis_indices] @ self.x_basis
+            theta = self._pivot(r, q, alpha)
+            # Шаг вырожден, если значение цели не изменилось
+            degenerate = -theta * d[q] <= PIVOT_TOLERANCE * max(1.0, abs(objective))
+            degenerate_steps = degenerate_steps + 1 if degenerate else 0
+
+    def _drive_out_artificials(self, trace):
+        """Вывод вспомогательных переменных с нулевым значением из базиса"""
+        m, n = self.problem.A.shape[0], len(self.problem.c)
+
+        for r in range(m):
+            if self.basis_indices[r] < n:
+                continue
+
+            # Строка r матрицы B^{-1} A
+            e_r = np.zeros(m)
+            e_r[r] = 1.0
+            row = self.problem.A.T @ self.factorization.btran(e_r)
+            row[self.basis_indices[self.basis_indices < n]] = 0
+
+            q = np.argmax(np.abs(row))
+            if abs(row[q]) < 1e-10:
+                # Ограничение линейно зависимо от остальных
+                continue
+
+            if trace.enabled(PIVOTS):
+                trace.message(PIVOTS, "Вывод из базиса: {} -> {}\n",
+                              self._var_name(self.basis_indices[r]), self._var_name(q))
+
+            self._pivot(r, q, self.factorization.ftran(self._column(q)))
+
+    def solve(self, log_file=None):
+        """Двухэтапное решение канонической задачи (log_file - файл журнала или Trace)"""
+        trace = as_trace(log_file)
+        m, n = self.problem.A.shape[0], len(self.problem.c)
+        if self.max_iterations is None:
+            self.max_iterations = 10 * (m + n)
+
+        # Начальный базис - вспомогательные переменные, B = I
+        self.basis_indices = np.arange(n, n + m)
+        self.factorization = BasisFactorization(self.refactor_frequency)
+        self._refactor()
+        self.iterations = 0
+        self.phases = {}
+
+        # Этап 1: минимизация суммы вспомогательных переменных
+        trace.message(SUMMARY, "=== ЭТАП 1 (модифицированный симплекс-метод) ===\n")
+
+        phase1_cost = np.zeros(n + m)
+        phase1_cost[n:] = 1
+        with timed_phase(self, 'phase1'):
+            self._run_phase(phase1_cost, np.ones(n + m, dtype=bool), trace)
+
+            W = phase1_cost[self.basis_indices] @ self.x_basis
+            trace.message(SUMMARY, "Результат вспомогательной задачи: W = {:.6f}\n", W)
+
+            if abs(W) > 1e-6:
+                self.status = "infeasible"
+                raise ValueError("Исходная задача не имеет допустимых решений")
+
+            self._drive_out_artificials(trace)
+
+        # Этап 2: исходная целевая функция, вспомогательные переменные не входят в базис
+        trace.message(SUMMARY, "\n=== ЭТАП 2 (модифицированный симплекс-метод) ===\n")
+
+        phase2_cost = np.zeros(n + m)
+        phase2_cost[:n] = self.problem.c
+        allowed = np.zeros(n + m, dtype=bool)
+        allowed[:n] = True
+        with timed_phase(self, 'phase2'):
+            self._run_phase(phase2_cost, allowed, trace)
+
+        artificial = self.basis_indices >= n
+        if np.any(np.abs(self.x_basis[artificial]) > 1e-6):
+            # Вспомогательная переменная, введенная при восстановлении базиса, не обнулилась
+            self.status = "not solved"
+            raise ValueError("Вырожденный базис не удалось восстановить")
+
+        solution = np.zeros(n)
+        structural = self.basis_indices < n
+        solution[self.basis_indices[structural]] = self.x_basis[structural]
+        objective_value = self.problem.c @ solution
+        self.status = "solved"
+
+        trace.message(SUMMARY, "\nИтераций: {}, разложений базиса: {}\n",
+                      self.iterations, self.factorization.factorizations)
+
+        return solution, objective_value
@@ -1,16 +1,84 @@
+import copy
 import numpy as np
+from .sparse import take_columns, row
+from .pricing import make_pricing, ratio_test, harris_ratio_test, BlandPricing, DEGENERATE_LIMIT
+
+# Результат теста отношений вместо номера строки: входящая переменная
+# достигает своей верхней границы раньше, чем какая-либо базисная
+BOUND_FLIP = -1
+
+# Относительный допуск сравнений с нулем: умножается на наибольший модуль
+# элементов A (разрешающие элементы), правых частей (допустимость) или
+# коэффициентов цели (оценки), поэтому не зависит от единиц измерения данных
+TOLERANCE = 1e-10
+
+# Разрешающий элемент не меньше этой доли наибольшего по модулю элемента
+# своего столбца (строки): крошечные элементы делают базис почти вырожденным
+PIVOT_TOLERANCE = 1e-9
+
+# Наибольший размер временного массива шага симплекс-метода (элементов)
+PIVOT_BLOCK = 1 << 16
+
+# Наименьшее число шагов между пересчетами таблицы по базису (rebuild)
+REBUILD_FREQUENCY = 100
+
+# Относительная величина возмущения правых частей при зацикливании (perturb)
+PERTURBATION = 1e-6
 
 class SimplexTable:
-    """Симплекс-таблица"""
+    """
+    Симплекс-таблица.
     
-    def __init__(self, problem, basis_indices):
+    Переменные с верхней границей (problem.upper) обрабатываются без
+    дополнительных строк: свободная переменная, стоящая на верхней границе,
+    хранится в таблице как ~x = u - x (столбец с обратным знаком, flipped),
+    поэтому все свободные переменные таблицы по-прежнему равны нулю.
+    
+    Шаги пересчитывают таблицу обновлениями, и ошибки округления накапливаются:
+    после rebuild_frequency шагов (по умолчанию - max(REBUILD_FREQUENCY, m))
+    таблицу следует построить заново по текущему базису (needs_rebuild, rebuild).
+    """
+    
+    upper = None  # Верхние границы переменных (None - границ нет)
+    rows = None   # Строки задачи, оставшиеся в таблице (None - все)
+    rebuild_frequency = None
+    perturbation = None  # Возмущение правых частей задачи (None - нет, см. perturb)
+    
+    # Допуски (см. TOLERANCE); пересчитываются по данным задачи
+    tolerance = TOLERANCE              # Разрешающие элементы
+    feasibility_tolerance = TOLERANCE  # Значения базисных переменных
+    optimality_tolerance = TOLERANCE   # Оценки
+    
+    def __init__(self, problem, basis_indices, pricing=None, harris=False):
         self.problem = problem
+        self.pricing = make_pricing(pricing)  # Правило выбора разрешающего столбца
+        self.harris = harris                  # Тест отношений Харриса вместо обычного
         self.basis_indices = np.array(basis_indices, dtype=int)
-        self.free_indices = np.array([j for j in range(len(problem.c)) if j not in basis_indices], dtype=int)
+        is_free = np.ones(len(problem.c), dtype=bool)
+        is_free[self.basis_indices] = False
+        self.free_indices = np.flatnonzero(is_free)
         self.table = None
         
+        # Границы переменных и переменные, замененные на ~x = u - x
+        if problem.upper is not None:
+            self.upper = np.asarray(problem.upper, dtype=float)
+        self.flipped = np.zeros(len(problem.c), dtype=bool)
+        self.objective_offset = problem.objective_offset
+        self.updates = 0  # Шагов с последнего построения таблицы
+        self.degenerate_steps = 0  # Вырожденных прямых шагов подряд (см. DEGENERATE_LIMIT)
+        self._bland = BlandPricing()
+        
         self._build_table()
     
+    @classmethod
+    def from_basis(cls, problem, basis_indices, pricing=None, harris=False):
+        """Симплекс-таблица для произвольного базиса: строки ограничений умножаются на B^(-1)"""
+        table = cls(problem, basis_indices, pricing, harris)
+        B = take_columns(problem.A, table.basis_indices)
+        table.table[:-1, :] = np.linalg.solve(B, table.table[:-1, :]) + 0.0  # Без -0.0 в журнале
+        table._recalculate_estimates()
+        return table
+    
     def _build_table(self):
         """Построение начальной симплекс-таблицы"""
         m, n = len(self.problem.A), len(self.problem.c)
@@ -18,122 +86,380 @@ class SimplexTable:
         if len(self.basis_indices) != m:
             raise ValueError(f"Неверный размер базиса: {len(self.basis_indices)} != {m}")
         
-        # Строим таблицу
+        # Строим таблицу: столбцы свободных переменных и столбец b
         self.table = np.zeros((m + 1, len(self.free_indices) + 1))
-        
-        # Заполняем строки базисных переменных
-        for i, basis_idx in enumerate(self.basis_indices):
-            for j, free_idx in enumerate(self.free_indices):
-                self.table[i, j] = self.problem.A[i, free_idx]
-            self.table[i, -1] = self.problem.b[i]
+        self.table[:m, :-1] = take_columns(self.problem.A, self.free_indices)
+        self.table[:m, -1] = self.problem.b
+        self.tolerance = TOLERANCE * max(1.0, np.max(np.abs(self.table[:m, :-1]), initial=0.0))
+        self.feasibility_tolerance = TOLERANCE * max(1.0, np.max(np.abs(self.problem.b), initial=0.0))
         
         # Изначально заполняем последнюю строку нулями, затем пересчитаем
         self.table[-1, :] = 0
         self._recalculate_estimates()
     
+    def _costs(self):
+        """Коэффициенты целевой функции в переменных таблицы и ее постоянное слагаемое"""
+        c = np.asarray(self.problem.c, dtype=float)
+        flipped = np.flatnonzero(self.flipped[:len(c)])
+        constant = self.objective_offset
+        if len(flipped):
+            constant += np.dot(c[flipped], self.upper[flipped])
+            c = c.copy()
+            c[flipped] = 0.0 - c[flipped]
+        return c, constant
+    
     def _recalculate_estimates(self):
         """Пересчет оценок через базисные переменные"""
         m = len(self.basis_indices)
+        c, constant = self._costs()
+        self.optimality_tolerance = TOLERANCE * max(1.0, np.max(np.abs(c), initial=0.0))
+        
+        # Начальное значение: коэффициенты целевой функции свободных переменных
+        # (для столбца b - постоянное слагаемое целевой функции)
+        delta = np.zeros(len(self.free_indices) + 1)
+        delta[:-1] = c[self.free_indices]
+        delta[-1] -= constant
         
-        for j in range(len(self.free_indices) + 1):
-            # Начальное значение: коэффициент целевой функции для этой переменной
-            if j < len(self.free_indices):
-                # Свободная переменная
-                delta = self.problem.c[self.free_indices[j]]
-            else:
-                # Столбец b
-                delta = 0
-            
-            # Вычитаем вклад базисных переменных
-            for i in range(m):
-                basis_idx = self.basis_indices[i]
-                delta -= self.problem.c[basis_idx] * self.table[i, j]
-            
-            self.table[-1, j] = delta
+        # Вычитаем вклад базисных переменных
+        for i in range(m):
+            delta -= c[self.basis_indices[i]] * self.table[i, :]
+        
+        self.table[-1, :] = delta
     
+    @property
+    def anti_cycling(self):
+        """
+        Шаги выбираются по правилу Бланда: слишком много вырожденных шагов
+        подряд, хотя правые части уже возмущены
+        """
+        return self.perturbation is not None and self.degenerate_steps >= DEGENERATE_LIMIT
+
     def find_pivot(self):
-        """Нахождение разрешающего элемента"""
-        m = len(self.basis_indices)
-        last_row = self.table[-1, :-1]  # Все кроме последнего столбца
-        
+        """
+        Нахождение разрешающего элемента. После DEGENERATE_LIMIT вырожденных
+        шагов подряд правые части возмущаются (perturb); если таблица возмущена
+        и решение найдено, возмущение следует снять (remove_perturbation).
+        """
+        if self.perturbation is None and self.degenerate_steps >= DEGENERATE_LIMIT:
+            self.perturb()
+
         # 1. Выбор разрешающего столбца
-        if np.all(last_row >= -1e-10):  # Учитываем погрешность вычислений
+        pivot_col = (self._bland if self.anti_cycling else self.pricing).select(self)
+        if pivot_col is None:
             return None, None  # Решение найдено
         
-        pivot_col = np.argmin(last_row)
-        
         # 2. Выбор разрешающей строки
-        ratios = []
-        for i in range(m):
-            a_ij = self.table[i, pivot_col]
-            if a_ij > 1e-10:  # Учитываем погрешность вычислений
-                ratio = self.table[i, -1] / a_ij
-                ratios.append(ratio)
-            else:
-                ratios.append(np.inf)
-        
-        if np.all(np.isinf(ratios)):
-            raise ValueError("Целевая функция не ограничена")
-        
-        pivot_row = np.argmin(ratios)
+        column, b = self.table[:-1, pivot_col], self.table[:-1, -1]
+        if self.anti_cycling:
+            def test(column, b, tolerance):
+                return ratio_test(column, b, tolerance, self.basis_indices)
+        elif self.harris:
+            # Нарушение границ в тесте Харриса - в пределах допуска допустимости таблицы
+            def test(column, b, tolerance):
+                return harris_ratio_test(column, b, tolerance, self.feasibility_tolerance)
+        else:
+            test = ratio_test
+        tolerance = self._pivot_tolerance(column)
+        if self.upper is None:
+            return test(column, b, tolerance), pivot_col
         
-        return pivot_row, pivot_col
-    
-    def pivot(self, pivot_row, pivot_col):
-        """Шаг симплекс-метода"""
-        # Сохраняем старые значения для пересчета
-        old_pivot = self.table[pivot_row, pivot_col]
-        old_row = self.table[pivot_row, :].copy()
-        old_col = self.table[:, pivot_col].copy()
+        # Базисная переменная убывает до нуля (a_i > 0) или растет до верхней границы (a_i < 0):
+        # оба случая сводятся к обычному тесту отношений запаса до границы к скорости
+        upper = self.upper[self.basis_indices]
+        to_upper = (column < 0) & np.isfinite(upper)
+        rate = np.where(to_upper, -column, np.maximum(column, 0.0))
+        distance = np.where(to_upper, upper - b, b)
+        entering_upper = self.upper[self.free_indices[pivot_col]]
         
-        # Перерасчет разрешающего элемента
-        self.table[pivot_row, pivot_col] = 1.0 / old_pivot
-        
-        # Перерасчет элементов разрешающей строки
-        for j in range(self.table.shape[1]):
-            if j != pivot_col:
-                self.table[pivot_row, j] = old_row[j] / old_pivot
+        if not np.any(rate > tolerance):
+            if np.isfinite(entering_upper):
+                return BOUND_FLIP, pivot_col
+            raise ValueError("Целевая функция не ограничена")
         
-        # Перерасчет элементов разрешающего столбца
-        for i in range(self.table.shape[0]):
-            if i != pivot_row:
-                self.table[i, pivot_col] = -old_col[i] / old_pivot
+        pivot_row = test(rate, distance, tolerance)
+        if entering_upper <= distance[pivot_row] / rate[pivot_row]:
+            return BOUND_FLIP, pivot_col
+        return pivot_row, pivot_col
+
+    def _pivot_tolerance(self, values):
+        """Допуск разрешающего элемента среди values (столбец или строка таблицы)"""
+        return max(self.tolerance, PIVOT_TOLERANCE * np.max(np.abs(values), initial=0.0))
+
+    def _basic_upper(self):
+        """Верхние границы базисных переменных"""
+        if self.upper is None:
+            return np.full(len(self.basis_indices), np.inf)
+        return self.upper[self.basis_indices]
+
+    def find_dual_pivot(self):
+        """Нахождение разрешающего элемента двойственного симплекс-метода"""
+        b = self.table[:-1, -1]
+
+        # 1. Выбор разрешающей строки: наибольшее нарушение границ базисной переменной
+        infeasibility = np.maximum(-b, b - self._basic_upper())
+        if np.all(infeasibility <= self.feasibility_tolerance):
+            return None, None  # Решение допустимо
+
+        pivot_row = np.argmax(infeasibility)
+
+        # 2. Выбор разрешающего столбца: оценки должны остаться неотрицательными.
+        # Переменная ниже нуля растет (a_rj < 0), выше верхней границы - убывает (a_rj > 0)
+        row = self.table[pivot_row, :-1]
+        if b[pivot_row] > 0:
+            row = -row
+        candidates = np.flatnonzero(row < -self._pivot_tolerance(row))
+        if len(candidates) == 0:
+            raise ValueError("Исходная задача не имеет допустимых решений")
+
+        ratios = self.table[-1, candidates] / -row[candidates]
+        pivot_col = candidates[np.argmin(ratios)]
+
+        return pivot_row, pivot_col
+
+    def is_primal_feasible(self):
+        """Базисное решение допустимо (0 <= b <= u)"""
+        b = self.table[:-1, -1]
+        tolerance = self.feasibility_tolerance
+        return bool(np.all(b >= -tolerance) and np.all(b <= self._basic_upper() + tolerance))
+
+    def is_dual_feasible(self):
+        """Оценки неотрицательны (базис оптимален, если решение допустимо)"""
+        return bool(np.all(self.table[-1, :-1] >= -self.optimality_tolerance))
+
+    def pivot(self, pivot_row, pivot_col, dual=False):
+        """
+        Шаг симплекс-метода. Выходящая переменная уходит на верхнюю границу, если растет
+        к ней (прямой шаг, a_rs < 0) или была выше нее (dual - двойственный шаг).
+        """
+        self.pricing.update(self, pivot_row, pivot_col)
         
-        # Перерасчет оставшихся элементов таблицы
-        for i in range(self.table.shape[0]):
-            if i != pivot_row:
-                for j in range(self.table.shape[1]):
-                    if j != pivot_col:
-                        self.table[i, j] = self.table[i, j] - (old_row[j] * old_col[i]) / old_pivot
+        table = self.table
+        pivot = table[pivot_row, pivot_col]
         
+        to_upper = False
+        leaving_upper = np.inf if self.upper is None else self.upper[self.basis_indices[pivot_row]]
+        if np.isfinite(leaving_upper):
+            to_upper = table[pivot_row, -1] > 0 if dual else pivot < 0
+
+        if not dual:
+            # Тест Харриса допускает нарушение границ в пределах допуска: значение
+            # выходящей переменной сдвигается на границу, иначе шаг был бы
+            # отрицательным и нарушал границы остальных базисных переменных
+            bound = leaving_upper if to_upper else 0.0
+            if (table[pivot_row, -1] - bound) * pivot < 0:
+                table[pivot_row, -1] = bound
+
+        objective = table[-1, -1]
+        row = table[pivot_row, :]  # Представление (view), а не копия
+        col = table[:, pivot_col].copy()
+
+        # Перерасчет оставшихся элементов таблицы на месте: rank-1 обновление
+        # блоками строк выше и ниже разрешающей, временный массив - не больше
+        # PIVOT_BLOCK элементов. Порядок операций (a_is * a_rj) / a_rs совпадает
+        # с поэлементной формулой, поэтому результат совпадает с ней бит в бит.
+        step = max(1, PIVOT_BLOCK // len(row))
+        buffer = np.empty((min(step, len(col)), len(row)))
+        for start, stop in ((0, pivot_row), (pivot_row + 1, len(col))):
+            for i in range(start, stop, step):
+                j = min(i + step, stop)
+                update = np.multiply.outer(col[i:j], row, out=buffer[:j - i])
+                update /= pivot
+                table[i:j] -= update
+
+        # Перерасчет элементов разрешающей строки и столбца
+        row /= pivot
+        table[:, pivot_col] = col / -pivot
+
+        # Перерасчет разрешающего элемента
+        table[pivot_row, pivot_col] = 1.0 / pivot
+
         # Обновление базиса
         old_basis = self.basis_indices[pivot_row]
         new_basis = self.free_indices[pivot_col]
         
         self.basis_indices[pivot_row] = new_basis
         self.free_indices[pivot_col] = old_basis
+        self.updates += 1
+        
+        if to_upper:
+            self.flip(pivot_col)
+        if not dual:
+            # Прямой шаг вырожден, если значение цели не изменилось (шаг нулевой)
+            degenerate = abs(table[-1, -1] - objective) <= PIVOT_TOLERANCE * max(1.0, abs(objective))
+            self.degenerate_steps = self.degenerate_steps + 1 if degenerate else 0
+    
+    def flip(self, pivot_col):
+        """
+        Переход свободной переменной на другую границу без смены базиса:
+        ~x = u - x, столбец меняет знак, столбец b уменьшается на u * столбец.
+        """
+        j = self.free_indices[pivot_col]
+        column = self.table[:, pivot_col]
+        self.table[:, -1] -= column * self.upper[j]
+        self.table[:, pivot_col] = 0.0 - column
+        self.flipped[j] = not self.flipped[j]
+        self.updates += 1
+        self.degenerate_steps = 0  # Переменная проходит весь отрезок [0, u] - шаг не вырожден
+    
+    def perturb(self):
+        """
+        Возмущение значений базисных переменных на случайные величины порядка
+        PERTURBATION: базисное решение перестает быть вырожденным, и шаги снова
+        меняют значение цели. Возмущение запоминается в пространстве правых
+        частей задачи (B delta), поэтому сохраняется при rebuild.
+        """
+        b = self.table[:-1, -1]
+        rng = np.random.default_rng(len(b))
+        delta = PERTURBATION * (1.0 + np.abs(b)) * rng.uniform(0.5, 1.0, len(b))
+        # Переменная у верхней границы смещается внутрь отрезка [0, u]
+        upper = self._basic_upper()
+        delta[b > upper / 2] *= -1.0
+        b += delta
+
+        c, _ = self._costs()
+        self.table[-1, -1] -= np.dot(c[self.basis_indices], delta)
+        sign = np.where(self.flipped[self.basis_indices], -1.0, 1.0)
+        B = take_columns(self.problem.A, self.basis_indices) * sign
+        if self.rows is not None:
+            B = B[self.rows]
+        self.perturbation = B @ delta
+        self.degenerate_steps = 0
+
+    def remove_perturbation(self):
+        """
+        Снятие возмущения правых частей: таблица строится заново по текущему
+        базису (оценки не меняются, базисное решение может стать недопустимым)
+        """
+        self.perturbation = None
+        self.degenerate_steps = 0
+        self.rebuild()
+
+    @property
+    def needs_rebuild(self):
+        frequency = self.rebuild_frequency or max(REBUILD_FREQUENCY, len(self.basis_indices))
+        return self.updates >= frequency
+    
+    def rebuild(self):
+        """
+        Построение таблицы заново по текущему базису: B^(-1) [A_N | b] и оценки
+        вычисляются из данных задачи, а не накопленными обновлениями шагов.
+        Переменные ~x = u - x входят со столбцами -a_j, b уменьшается на a_j u_j.
+        Если базисная матрица численно вырождена, таблица не меняется.
+        """
+        self.updates = 0
+        A, b = self.problem.A, np.asarray(self.problem.b, dtype=float)
+        sign = np.where(self.flipped, -1.0, 1.0)
+        B = take_columns(A, self.basis_indices) * sign[self.basis_indices]
+        N = take_columns(A, self.free_indices) * sign[self.free_indices]
+        flipped = np.flatnonzero(self.flipped)
+        if len(flipped):
+            b = b - take_columns(A, flipped) @ self.upper[flipped]
+        if self.rows is not None:
+            B, N, b = B[self.rows], N[self.rows], b[self.rows]
+        if self.perturbation is not None:
+            b = b + self.perturbation
+        try:
+            self.table[:-1, :] = np.linalg.solve(B, np.column_stack([N, b])) + 0.0
+        except np.linalg.LinAlgError:
+            return
+        self._recalculate_estimates()
     
-    def replace_objective(self, new_c, new_var_names=None):
-        """Замена целевой функции на исходную"""
+    def replace_objective(self, new_c, new_var_names=None, offset=None):
+        """Замена целевой функции на исходную (offset - ее постоянное слагаемое)"""
         self.problem.c = new_c
         if new_var_names is not None:
             self.problem.var_names = new_var_names
+        if offset is not None:
+            self.objective_offset = offset
         
         # Пересчитываем оценки с новой целевой функцией
         self._recalculate_estimates()
-    
+        self.pricing.reset(self)
+
+    def replace_rhs(self, A, b):
+        """
+        Замена правых частей при том же базисе.
+        A - матрица ограничений с теми же столбцами (знаки строк могут отличаться).
+        Задача таблицы заменяется копией с новыми A и b, и таблица строится
+        заново по базису (rebuild): последующие пересчеты используют новые данные.
+        """
+        b = np.asarray(b, dtype=float)
+        if self.rows is not None and len(self.rows) < len(b):
+            # Линейно зависимые строки удалены: система совместна не для любых b
+            B = take_columns(A, self.basis_indices)
+            rhs = b
+            flipped = np.flatnonzero(self.flipped)
+            if len(flipped):
+                # Переменные ~x = u - x: b - A_j u_j, базисные столбцы меняют знак
+                rhs = b - take_columns(A, flipped) @ self.upper[flipped]
+                B = np.where(self.flipped[self.basis_indices], -1.0, 1.0) * B
+            x_basis = np.linalg.lstsq(B, rhs, rcond=None)[0]
+            if np.linalg.norm(B @ x_basis - rhs) > 1e-8 * (1 + np.linalg.norm(rhs)):
+                raise ValueError("Исходная задача не имеет допустимых решений")
+        
+        self.problem = copy.copy(self.problem)
+        self.problem.A, self.problem.b = A, b
+        self.feasibility_tolerance = TOLERANCE * max(1.0, np.max(np.abs(b), initial=0.0))
+        self.rebuild()
+
     def remove_auxiliary_columns(self, n_original):
         """Удаление столбцов вспомогательных переменных, которые стали свободными (только для вспомогательной задачи)"""
-        to_remove = []
+        to_remove = np.flatnonzero(self.free_indices >= n_original)  # Вспомогательные переменные
+        
+        if len(to_remove):
+            self.table = np.delete(self.table, to_remove, axis=1)
+            self.free_indices = np.delete(self.free_indices, to_remove)
+    
+    def remove_rows(self, rows):
+        """Удаление строк линейно зависимых ограничений вместе с их базисными переменными"""
+        self.table = np.delete(self.table, rows, axis=0)
+        self.basis_indices = np.delete(self.basis_indices, rows)
+        kept = np.arange(len(self.problem.b)) if self.rows is None else self.rows
+        self.rows = np.delete(kept, rows)
+    
+    def add_row(self, problem):
+        """
+        Добавление ограничения без смены базиса (ветвление, отсечение).
+        problem - задача таблицы с новой последней строкой и ее фиктивной
+        переменной (последний столбец); фиктивная переменная становится базисной.
+        Оценки не меняются, поэтому при нарушенной правой части допустимость
+        восстанавливается двойственным симплекс-методом.
+        """
+        n = len(self.problem.c)
+        a = np.asarray(row(problem.A, len(problem.b) - 1), dtype=float)
+        coefficients, constant = a[:n] / a[n], problem.b[-1] / a[n]
         
-        for j, free_idx in enumerate(self.free_indices):
-            if free_idx >= n_original:  # Это вспомогательная переменная
-                to_remove.append(j)
+        # Переменные ~x = u - x
+        flipped = np.flatnonzero(self.flipped)
+        if len(flipped):
+            constant -= coefficients[flipped] @ self.upper[flipped]
+            coefficients[flipped] = 0.0 - coefficients[flipped]
         
-        # Удаляем столбцы в обратном порядке
-        for j in sorted(to_remove, reverse=True):
-            self.table = np.delete(self.table, j, axis=1)
-            self.free_indices = np.delete(self.free_indices, j)
+        # Базисные переменные выражаются через свободные: x_B = b - T x_N
+        basic = coefficients[self.basis_indices]
+        new_row = np.empty(self.table.shape[1])
+        new_row[:-1] = coefficients[self.free_indices] - basic @ self.table[:-1, :-1]
+        new_row[-1] = constant - basic @ self.table[:-1, -1]
+        
+        self.table = np.vstack([self.table[:-1], new_row, self.table[-1:]])
+        self.basis_indices = np.append(self.basis_indices, n)
+        if self.rows is not None:
+            self.rows = np.append(self.rows, len(problem.b) - 1)
+        self.flipped = np.append(self.flipped, False)
+        if problem.upper is not None:
+            self.upper = np.asarray(problem.upper, dtype=float)
+        self.problem = problem
+        self.pricing.reset(self)
+    
+    def copy(self):
+        """Копия таблицы для продолжения решения из того же базиса (задача общая)"""
+        table = copy.copy(self)
+        table.table = self.table.copy()
+        table.basis_indices = self.basis_indices.copy()
+        table.free_indices = self.free_indices.copy()
+        table.flipped = self.flipped.copy()
+        table.pricing = copy.deepcopy(self.pricing)
+        return table
     
     def get_solution(self):
         """Получение текущего решения"""
@@ -143,31 +469,44 @@ class SimplexTable:
         for i, basis_idx in enumerate(self.basis_indices):
             solution[basis_idx] = self.table[i, -1]
         
+        # Переменные ~x = u - x
+        flipped = np.flatnonzero(self.flipped[:len(solution)])
+        if len(flipped):
+            solution[flipped] = self.upper[flipped] - solution[flipped]
+        
         objective_value = -self.table[-1, -1]
         
         return solution, objective_value
     
+    @property
+    def var_names(self):
+        """Имена переменных; переменная, замененная на ~x = u - x, обозначается ~x"""
+        names = self.problem.var_names
+        if not np.any(self.flipped):
+            return names
+        return [f"~{name}" if flipped else name for name, flipped in zip(names, self.flipped)]
+    
     def __str__(self):
-        result = "Симплекс-таблица:\n"
-        result += f"Базисные: {[self.problem.var_names[i] for i in self.basis_indices]}\n"
-        result += f"Свободные: {[self.problem.var_names[i] for i in self.free_indices]}\n\n"
-        
+        return format_table(self.table, self.basis_indices, self.free_indices, self.var_names)
+
+
+def format_table(table, basis_indices, free_indices, var_names):
+    """Текстовое представление симплекс-таблицы (строка форматируется одним шаблоном)"""
+    row_format = "%8.3f " * table.shape[1]
+    lines = [
+        "Симплекс-таблица:",
+        f"Базисные: {[var_names[i] for i in basis_indices]}",
+        f"Свободные: {[var_names[i] for i in free_indices]}",
+        "",
         # Заголовки
-        result += "     "
-        for j in self.free_indices:
-            result += f"{self.problem.var_names[j]:>8} "
-        result += "        b\n"
-        
-        # Строки базисных переменных
-        for i, basis_idx in enumerate(self.basis_indices):
-            result += f"{self.problem.var_names[basis_idx]:>3} |"
-            for j in range(self.table.shape[1]):
-                result += f"{self.table[i, j]:8.3f} "
-            result += "\n"
-        
-        # Строка оценок
-        result += " W  |"
-        for j in range(self.table.shape[1]):
-            result += f"{self.table[-1, j]:8.3f} "
-        
-        return result
\ No newline at end of file
+        "     " + "".join(f"{var_names[j]:>8} " for j in free_indices) + "        b",
+    ]
+    
+    # Строки базисных переменных
+    for i, basis_idx in enumerate(basis_indices):
+        lines.append(f"{var_names[basis_idx]:>3} |" + row_format % tuple(table[i].tolist()))
+    
+    # Строка оценок
+    lines.append(" W  |" + row_format % tuple(table[-1].tolist()))
+    
+    return "\n".join(lines)
@@ -1,54 +1,403 @@
+import copy
+import numpy as np
 from .auxiliary import AuxiliaryProblemSolver
+from .revised_simplex import RevisedSimplexSolver
+from .interior_point import InteriorPointSolver
+from .trace import as_trace, timed_phase, SUMMARY, PIVOTS
+from .pricing import PRICING_RULES
+from .simplex_table import SimplexTable, BOUND_FLIP
+from .sparse import issparse, leading_block, equal_up_to_row_signs
+
+# auto - метод внутренней точки для больших задач, симплекс-таблица для остальных
+METHODS = ('tableau', 'revised', 'interior', 'auto')
+
+# Размер задачи (m * n), начиная с которого method='auto' выбирает метод внутренней точки:
+# на плотных задачах такого размера симплекс-таблице нужно около сотни шагов,
+# а методу внутренней точки - 10-15 итераций при сопоставимом времени
+AUTO_INTERIOR_SIZE = 5000
+
+# Двойственный симплекс-метод: выбор автоматически, всегда или никогда
+DUAL_MODES = ('auto', 'always', 'never')
 
 class LinearProgrammingSolver:
     """Основной решатель задач линейного программирования"""
     
-    def __init__(self):
+    def __init__(self, method='tableau', refactor_frequency=50, pricing='dantzig', harris=False,
+                 dual='auto', crossover=True, max_iterations=None):
+        if method not in METHODS:
+            raise ValueError(f"Неизвестный метод: {method}")
+        if pricing not in PRICING_RULES:
+            raise ValueError(f"Неизвестное правило выбора столбца: {pricing}")
+        if dual not in DUAL_MODES:
+            raise ValueError(f"Неизвестный режим двойственного симплекс-метода: {dual}")
+        self.method = method
+        self.refactor_frequency = refactor_frequency
+        self.pricing = pricing  # Правило выбора разрешающего столбца (симплекс-таблица)
+        self.harris = harris    # Тест отношений Харриса
+        self.dual = dual        # Двойственный симплекс-метод из базиса фиктивных переменных
+        self.crossover = crossover  # Переход от решения метода внутренней точки к вершине
+        self.max_iterations = max_iterations  # Шагов симплекс-метода на этап (None - 10 * (m + n))
         self.solution = None
         self.objective_value = None
         self.status = "not solved"
+        self.iterations = 0
+        # Время и число шагов этапов последнего решения: phase1 - вспомогательная задача,
+        # phase2 - основная (или двойственный симплекс-метод), interior, crossover
+        self.phases = {}
+        
+        # Оптимальная симплекс-таблица последней решенной задачи (для повторной оптимизации)
+        self.table = None
+        self.problem = None
+    
+    def solve(self, canonical_problem, log_file=None, method=None):
+        """
+        Решение канонической задачи ЛП (log_file - файл журнала или Trace).
+        method - метод для этого вызова вместо заданного в конструкторе.
+        """
+        self.table = None
+        self.status = "not solved"
+        self.iterations = 0
+        self.phases = {}
+        trace = as_trace(log_file)
+        method = method or self.method
+        if method not in METHODS:
+            raise ValueError(f"Неизвестный метод: {method}")
+        if canonical_problem.A.shape[0] == 0:
+            return self._solve_unconstrained(canonical_problem)
+        if method == 'auto':
+            m, n = canonical_problem.A.shape
+            method = 'interior' if m * n >= AUTO_INTERIOR_SIZE else 'tableau'
+        if method == 'revised':
+            return self._solve_revised(canonical_problem, trace)
+        if method == 'interior':
+            return self._solve_interior(canonical_problem, trace)
+        return self._solve_tableau(canonical_problem, trace)
     
-    def solve(self, canonical_problem, log_file=None):
-        """Решение канонической задачи ЛП"""
-        if log_file:
-            log_file.write("=== РЕШЕНИЕ ВСПОМОГАТЕЛЬНОЙ ЗАДАЧИ ===\n")
+    def _solve_tableau(self, canonical_problem, trace):
+        """Решение симплекс-таблицей: двойственный симплекс-метод или два этапа"""
+        # Двойственно допустимый начальный базис: вспомогательная задача не нужна
+        if self.dual != 'never':
+            table = self._dual_start_table(canonical_problem)
+            if table is not None:
+                return self._solve_dual(table, canonical_problem, trace)
+            if self.dual == 'always':
+                raise ValueError("Базис из фиктивных переменных не является двойственно допустимым")
         
-        auxiliary_solver = AuxiliaryProblemSolver(canonical_problem)
+        trace.message(SUMMARY, "=== РЕШЕНИЕ ВСПОМОГАТЕЛЬНОЙ ЗАДАЧИ ===\n")
         
-        try:
-            table = auxiliary_solver.solve(log_file)
-        except ValueError as e:
-            self.status = "infeasible"
-            raise e
+        auxiliary_solver = AuxiliaryProblemSolver(canonical_problem, self.pricing, self.harris,
+                                                  self.max_iterations)
+        
+        with timed_phase(self, 'phase1'):
+            try:
+                table = auxiliary_solver.solve(trace)
+            except ValueError as e:
+                self.status = auxiliary_solver.status
+                raise e
+            finally:
+                self.iterations += auxiliary_solver.iterations
         
-        if log_file:
-            log_file.write("\n=== РЕШЕНИЕ ОСНОВНОЙ ЗАДАЧИ ===\n")
+        trace.message(SUMMARY, "\n=== РЕШЕНИЕ ОСНОВНОЙ ЗАДАЧИ ===\n")
+        
+        with timed_phase(self, 'phase2'):
+            self._run_primal(table, trace)
+        self.table, self.problem = table, canonical_problem
+        
+        return self.solution, self.objective_value
+    
+    def _solve_unconstrained(self, canonical_problem):
+        """
+        Задача без ограничений (например, после presolve): x = 0 при c >= 0,
+        переменные с c < 0 - на верхней границе
+        """
+        self.iterations = 0
+        c = np.asarray(canonical_problem.c, dtype=float)
+        upper = canonical_problem.upper
+        if upper is None:
+            upper = np.full(len(c), np.inf)
+        negative = c < -1e-10
+        if np.any(negative & ~np.isfinite(upper)):
+            self.status = "unbounded"
+            raise ValueError("Целевая функция не ограничена")
+        
+        self.solution = np.where(negative, upper, 0.0)
+        self.objective_value = float(np.dot(c[negative], upper[negative])) + canonical_problem.objective_offset
+        self.status = "solved"
+        return self.solution, self.objective_value
+    
+    def _dual_start_table(self, canonical_problem):
+        """
+        Начальная таблица двойственного симплекс-метода с базисом из фиктивных переменных.
+        Оценки в этом базисе равны c (фиктивные переменные не входят в целевую функцию),
+        поэтому он двойственно допустим при c >= 0; переменные с c < 0 и верхней
+        границей ставятся на эту границу. Иначе (или если у какой-то строки
+        нет фиктивной переменной) возвращается None.
+        """
+        slack = canonical_problem.slack_indices
+        if slack is None or len(slack) == 0 or np.any(slack < 0):
+            return None
+        negative = np.asarray(canonical_problem.c) < -1e-10
+        upper = canonical_problem.upper
+        if upper is None:
+            upper = np.full(len(negative), np.inf)
+        if np.any(negative & ~np.isfinite(upper)):
+            return None
+        
+        # Копия задачи: таблица меняет c и имена переменных при повторной оптимизации
+        problem = copy.copy(canonical_problem)
+        table = SimplexTable.from_basis(problem, slack, self.pricing, self.harris)
+        for pivot_col in np.flatnonzero(negative[table.free_indices]):
+            table.flip(pivot_col)
+        return table
+    
+    def _solve_dual(self, table, canonical_problem, trace):
+        """Решение двойственным симплекс-методом из двойственно допустимой таблицы"""
+        trace.message(SUMMARY, "=== ДВОЙСТВЕННЫЙ СИМПЛЕКС-МЕТОД ===\n")
+        trace.table(table, "Начальная симплекс-таблица (базис из фиктивных переменных):\n")
         
+        with timed_phase(self, 'phase2'):
+            self._run_dual(table, trace)
+        self.table, self.problem = table, canonical_problem
+        
+        return self.solution, self.objective_value
+    
+    def reoptimize(self, canonical_problem, log_file=None):
+        """
+        Повторная оптимизация задачи, отличающейся от последней решенной
+        только целевой функцией c и/или правыми частями b либо одним добавленным
+        ограничением (последняя строка и ее фиктивная переменная, см. CanonicalProblem.add_row).
+        
+        Решение продолжается из последнего оптимального базиса без вспомогательной задачи:
+        после замены c базис остается допустимым (прямой симплекс-метод),
+        после замены b или добавления строки - остается оптимальным по оценкам
+        (двойственный симплекс-метод). Если базиса нет, матрица ограничений
+        изменилась (не считая знаков строк) или обе допустимости нарушены,
+        задача решается заново.
+        """
+        trace = as_trace(log_file)
+        table, previous = self.table, self.problem
+        if table is None or previous is None:
+            return self.solve(canonical_problem, trace)
+        
+        m, n = previous.A.shape
+        row_added = canonical_problem.A.shape == (m + 1, n + 1)
+        upper = canonical_problem.upper
+        if row_added and upper is not None and np.isinf(upper[n]):
+            upper = upper[:n]  # Фиктивная переменная новой строки не ограничена сверху
+        if ((canonical_problem.A.shape != previous.A.shape and not row_added)
+                or not np.array_equal(upper, previous.upper)):
+            return self.solve(canonical_problem, trace)
+        # Базис переносится, только если матрица ограничений та же (знаки строк
+        # могут отличаться после приведения правых частей к b >= 0)
+        A = leading_block(canonical_problem.A, m, n) if row_added else canonical_problem.A
+        if not equal_up_to_row_signs(A, previous.A):
+            trace.message(SUMMARY, "Матрица ограничений изменилась: задача решается заново\n\n")
+            return self.solve(canonical_problem, trace)
+        
+        self.table = None
+        self.status = "not solved"
+        self.iterations = 0
+        self.phases = {}
+        c_changed = b_changed = False
+        if row_added:
+            table.add_row(canonical_problem)
+        else:
+            c_changed = (not np.array_equal(canonical_problem.c, previous.c)
+                         or canonical_problem.objective_offset != previous.objective_offset)
+            b_changed = not np.array_equal(canonical_problem.b, previous.b)
+        
+        if c_changed:
+            table.replace_objective(canonical_problem.c, canonical_problem.var_names,
+                                    canonical_problem.objective_offset)
+        if b_changed:
+            try:
+                table.replace_rhs(canonical_problem.A, canonical_problem.b)
+            except ValueError as e:
+                self.status = "infeasible"
+                raise e
+        
+        trace.message(SUMMARY, "=== ПОВТОРНАЯ ОПТИМИЗАЦИЯ ИЗ ПОСЛЕДНЕГО БАЗИСА ===\n")
+        trace.table(table)
+        
+        if table.is_primal_feasible():
+            with timed_phase(self, 'phase2'):
+                self._run_primal(table, trace)
+        elif table.is_dual_feasible():
+            with timed_phase(self, 'phase2'):
+                self._run_dual(table, trace)
+        else:
+            trace.message(SUMMARY, "\nБазис не допустим ни в прямой, ни в двойственной задаче\n\n")
+            return self.solve(canonical_problem, trace)
+        
+        self.table, self.problem = table, canonical_problem
+        return self.solution, self.objective_value
+    
+    def _finish(self, table, trace):
+        """Запись оптимального решения"""
+        self.solution, self.objective_value = table.get_solution()
+        self.status = "solved"
+        trace.message(SUMMARY, "\nОптимальное решение найдено!\n")
+        trace.table(table, "Финальная симплекс-таблица:\n")
+    
+    def _max_iterations(self, table):
+        return self.max_iterations or 10 * (len(table.basis_indices) + len(table.problem.c))
+    
+    def _rebuild(self, table, trace):
+        """Периодическое построение таблицы заново по базису (ошибки округления шагов)"""
+        if table.needs_rebuild:
+            table.rebuild()
+            trace.message(PIVOTS, "\nТаблица пересчитана по базису\n")
+    
+    def _run_primal(self, table, trace):
+        """Прямой симплекс-метод из допустимого базиса"""
         iteration = 0
-        while iteration < 100:
-            pivot_row, pivot_col = table.find_pivot()
+        while iteration < self._max_iterations(table):
+            self._rebuild(table, trace)
+            try:
+                pivot_row, pivot_col = table.find_pivot()
+            except ValueError as e:
+                self.status = "unbounded"
+                raise e
+            
+            if pivot_row is None and table.perturbation is not None:
+                # Снятие возмущения правых частей: базис остается оптимальным
+                # по оценкам, допустимость восстанавливается двойственным методом
+                table.remove_perturbation()
+                trace.message(PIVOTS, "\nВозмущение правых частей снято\n")
+                if not table.is_primal_feasible():
+                    self._run_dual(table, trace)
+                    break
+                continue
             
             if pivot_row is None:
-                self.solution, self.objective_value = table.get_solution()
-                self.status = "solved"
-                if log_file:
-                    log_file.write("\nОптимальное решение найдено!\n")
-                    log_file.write(f"Финальная симплекс-таблица:\n")
-                    log_file.write(str(table) + "\n")
+                self._finish(table, trace)
                 break
-                
-            if log_file:
-                log_file.write(f"\nШаг {iteration + 1}:\n")
-                log_file.write(f"Разрешающий элемент: строка {pivot_row}, столбец {pivot_col}\n")
             
-            table.pivot(pivot_row, pivot_col)
+            if pivot_row == BOUND_FLIP:
+                trace.message(PIVOTS, "\nШаг {}:\nПеременная {} переходит на другую границу\n",
+                              iteration + 1, table.var_names[table.free_indices[pivot_col]])
+                table.flip(pivot_col)
+            else:
+                trace.message(PIVOTS, "\nШаг {}:\nРазрешающий элемент: строка {}, столбец {}\n",
+                              iteration + 1, pivot_row, pivot_col)
+                table.pivot(pivot_row, pivot_col)
             
-            if log_file:
-                log_file.write(str(table) + "\n")
+            trace.table(table, step=iteration + 1)
             
             iteration += 1
+            self.iterations += 1
         else:
             self.status = "max iterations reached"
             raise ValueError("Достигнуто максимальное число итераций")
+    
+    def _run_dual(self, table, trace):
+        """Двойственный симплекс-метод из базиса с неотрицательными оценками"""
+        iteration = 0
+        while iteration < self._max_iterations(table):
+            self._rebuild(table, trace)
+            try:
+                pivot_row, pivot_col = table.find_dual_pivot()
+            except ValueError as e:
+                self.status = "infeasible"
+                raise e
+            
+            if pivot_row is None:
+                self._finish(table, trace)
+                break
+            
+            trace.message(PIVOTS, "\nШаг {} (двойственный):\nРазрешающий элемент: строка {}, столбец {}\n",
+                          iteration + 1, pivot_row, pivot_col)
+            
+            table.pivot(pivot_row, pivot_col, dual=True)
+            
+            trace.table(table, step=iteration + 1)
+            
+            iteration += 1
+            self.iterations += 1
+        else:
+            self.status = "max iterations reached"
+            raise ValueError("Достигнуто максимальное число итераций")
+    
+    def _solve_interior(self, canonical_problem, trace):
+        """Решение методом внутренней точки с переходом к базисному решению (crossover)"""
+        interior_solver = InteriorPointSolver(canonical_problem)
+        try:
+            with timed_phase(self, 'interior'):
+                try:
+                    solution, objective_value = interior_solver.solve(trace)
+                finally:
+                    self.iterations += interior_solver.iterations
+        except ValueError:
+            # Несовместность и неограниченность метод не различает: их устанавливает симплекс-метод
+            trace.message(SUMMARY, "\nМетод внутренней точки не сошелся, решение симплекс-методом\n\n")
+            return self._solve_tableau(canonical_problem, trace)
+        
+        if self.crossover:
+            try:
+                with timed_phase(self, 'crossover'):
+                    return self._crossover(interior_solver, canonical_problem, trace)
+            except (ValueError, np.linalg.LinAlgError) as e:
+                self.table = None
+                trace.message(SUMMARY, "\nПереход к базисному решению не удался: {}\n", e)
+        
+        self.solution = solution
+        self.objective_value = objective_value + canonical_problem.objective_offset
+        self.status = "solved"
+        return self.solution, self.objective_value
+    
+    def _crossover(self, interior_solver, canonical_problem, trace):
+        """
+        Переход к вершине: таблица строится для базиса, выбранного по решению метода
+        внутренней точки, и дорешивается прямым (базис допустим) или двойственным
+        (оценки неотрицательны) симплекс-методом - обычно за несколько шагов.
+        """
+        basis, at_upper, rows = interior_solver.crossover_basis()
+        problem = copy.copy(canonical_problem)
+        trace.message(SUMMARY, "\n=== ПЕРЕХОД К БАЗИСНОМУ РЕШЕНИЮ ===\n")
+        if len(rows) < len(problem.b):
+            # Линейно зависимые ограничения не входят в таблицу, как после вспомогательной задачи
+            redundant = np.setdiff1d(np.arange(len(problem.b)), rows)
+            trace.message(SUMMARY, "Линейно зависимые ограничения удалены: {}\n",
+                          ", ".join(str(r + 1) for r in redundant))
+            problem.A = problem.A.take_rows(rows) if issparse(problem.A) else problem.A[rows]
+            problem.b = np.asarray(problem.b, dtype=float)[rows]
+        
+        table = SimplexTable.from_basis(problem, basis, self.pricing, self.harris)
+        for pivot_col in np.flatnonzero(at_upper[table.free_indices]):
+            table.flip(pivot_col)
+        
+        trace.table(table, "Симплекс-таблица базиса по решению метода внутренней точки:\n")
+        
+        if table.is_dual_feasible() and not table.is_primal_feasible():
+            self._run_dual(table, trace)
+        else:
+            if not table.is_primal_feasible():
+                # При нулевой цели любой базис двойственно допустим: двойственный
+                # симплекс-метод восстанавливает прямую допустимость, затем цель возвращается
+                table.replace_objective(np.zeros(len(canonical_problem.c)), offset=0.0)
+                self._run_dual(table, trace)
+                table.replace_objective(canonical_problem.c, offset=canonical_problem.objective_offset)
+                trace.table(table, "Допустимый базис, исходная целевая функция:\n")
+            self._run_primal(table, trace)
+        
+        self.table, self.problem = table, canonical_problem
+        return self.solution, self.objective_value
+    
+    def _solve_revised(self, canonical_problem, trace=None):
+        """Решение модифицированным симплекс-методом (без полной таблицы)"""
+        if canonical_problem.upper is not None:
+            raise ValueError("Модифицированный симплекс-метод не поддерживает верхние границы "
+                             "переменных: используйте to_canonical_form(..., bounded=False)")
+        revised_solver = RevisedSimplexSolver(canonical_problem, self.refactor_frequency,
+                                              self.max_iterations)
+        
+        try:
+            self.solution, self.objective_value = revised_solver.solve(trace)
+        finally:
+            self.status = revised_solver.status
+            self.iterations = revised_solver.iterations
+            self.phases = revised_solver.phases
         
-        return self.solution, self.objective_value
\ No newline at end of file
+        if canonical_problem.objective_offset:
+            self.objective_value += canonical_problem.objective_offset
+        return self.solution, self.objective_value
@@ -0,0 +1,329 @@
+import numpy as np
+
+
+class SparseMatrix:
+    """
+    Разреженная матрица в сжатом формате по строкам (CSR) или столбцам (CSC).
+
+    Хранятся только ненулевые элементы: data - значения, indices - номера
+    столбцов (CSR) или строк (CSC), indptr - границы строк (столбцов).
+    """
+
+    def __init__(self, data, indices, indptr, shape, format='csr'):
+        if format not in ('csr', 'csc'):
+            raise ValueError(f"Неизвестный формат разреженной матрицы: {format}")
+        self.data = np.asarray(data, dtype=float)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.shape = (int(shape[0]), int(shape[1]))
+        self.format = format
+        self._major_ids = None  # Номер строки (CSR) или столбца (CSC) для каждого элемента
+
+    @classmethod
+    def from_triplets(cls, rows, cols, values, shape, format='csr'):
+        """Построение из троек (строка, столбец, значение); повторы суммируются"""
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        values = np.asarray(values, dtype=float)
+
+        major, minor = (rows, cols) if format == 'csr' else (cols, rows)
+        n_major = shape[0] if format == 'csr' else shape[1]
+
+        # Сортировка по (major, minor) и суммирование повторов
+        order = np.lexsort((minor, major))
+        major, minor, values = major[order], minor[order], values[order]
+        if len(values) > 1:
+            starts = np.ones(len(values), dtype=bool)
+            starts[1:] = (major[1:] != major[:-1]) | (minor[1:] != minor[:-1])
+            if not np.all(starts):
+                positions = np.flatnonzero(starts)
+                values = np.add.reduceat(values, positions)
+                major, minor = major[positions], minor[positions]
+
+        nonzero = values != 0
+        major, minor, values = major[nonzero], minor[nonzero], values[nonzero]
+
+        indptr = np.zeros(n_major + 1, dtype=np.int64)
+        np.cumsum(np.bincount(major, minlength=n_major), out=indptr[1:])
+
+        return cls(values, minor, indptr, shape, format)
+
+    @classmethod
+    def from_dense(cls, A, format='csr'):
+        """Построение из плотной матрицы"""
+        A = np.asarray(A, dtype=float)
+        rows, cols = np.nonzero(A)
+        return cls.from_triplets(rows, cols, A[rows, cols], A.shape, format)
+
+    @property
+    def nnz(self):
+        return len(self.data)
+
+    @property
+    def T(self):
+        """Транспонирование без копирования: CSR(A) и CSC(A^T) совпадают"""
+        transposed_format = 'csc' if self.format == 'csr' else 'csr'
+        return SparseMatrix(self.data, self.indices, self.indptr,
+                            (self.shape[1], self.shape[0]), transposed_format)
+
+    def __len__(self):
+        return self.shape[0]
+
+    def _major(self):
+        """Номер строки (CSR) или столбца (CSC) каждого элемента"""
+        if self._major_ids is None:
+            self._major_ids = np.repeat(np.arange(len(self.indptr) - 1), np.diff(self.indptr))
+        return self._major_ids
+
+    def to_triplets(self):
+        """Тройки (строки, столбцы, значения)"""
+        if self.format == 'csr':
+            return self._major(), self.indices, self.data
+        return self.indices, self._major(), self.data
+
+    def tocsr(self):
+        if self.format == 'csr':
+            return self
+        return SparseMatrix.from_triplets(*self.to_triplets(), self.shape, 'csr')
+
+    def tocsc(self):
+        if self.format == 'csc':
+            return self
+        return SparseMatrix.from_triplets(*self.to_triplets(), self.shape, 'csc')
+
+    def toarray(self):
+        """Плотная копия матрицы"""
+        dense = np.zeros(self.shape)
+        rows, cols, values = self.to_triplets()
+        dense[rows, cols] = values
+        return dense
+
+    def _slice(self, k):
+        """Строка (CSR) или столбец (CSC) с номером k в плотном виде"""
+        length = self.shape[1] if self.format == 'csr' else self.shape[0]
+        vector = np.zeros(length)
+        start, end = self.indptr[k], self.indptr[k + 1]
+        vector[self.indices[start:end]] = self.data[start:end]
+        return vector
+
+    def _cross_slice(self, k):
+        """Столбец (CSR) или строка (CSC) с номером k: просмотр всех элементов"""
+        length = self.shape[0] if self.format == 'csr' else self.shape[1]
+        vector = np.zeros(length)
+        hit = self.indices == k
+        vector[self._major()[hit]] = self.data[hit]
+        return vector
+
+    def row(self, i):
+        """Строка i в плотном виде"""
+        if self.format == 'csr':
+            return self._slice(i)
+        return self._cross_slice(i)
+
+    def column(self, j):
+        """Столбец j в плотном виде"""
+        if self.format == 'csc':
+            return self._slice(j)
+        return self._cross_slice(j)
+
+    def _take_major(self, keys):
+        """Плотные строки (CSR) или столбцы (CSC) с заданными номерами, по одной в строке результата"""
+        keys = np.asarray(keys, dtype=np.int64)
+        length = self.shape[1] if self.format == 'csr' else self.shape[0]
+        result = np.zeros((len(keys), length))
+
+        # Номера элементов выбранных строк (столбцов) в массивах data/indices
+        starts = self.indptr[keys]
+        lengths = self.indptr[keys + 1] - starts
+        positions = np.repeat(np.arange(len(keys)), lengths)
+        offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        elements = np.repeat(starts, lengths) + offsets
+
+        result[positions, self.indices[elements]] = self.data[elements]
+        return result
+
+    def take_columns(self, columns):
+        """Плотная подматрица из заданных столбцов"""
+        return self.tocsc()._take_major(columns).T
+
+    def take_rows(self, rows):
+        """Плотная подматрица из заданных строк"""
+        return self.tocsr()._take_major(rows)
+
+    def scale_rows(self, factors):
+        """Умножение строк на множители (на месте)"""
+        factors = np.asarray(factors, dtype=float)
+        if self.format == 'csr':
+            self.data *= factors[self._major()]
+        else:
+            self.data *= factors[self.indices]
+
+    def __getitem__(self, key):
+        """Доступ к элементу A[i, j] и столбцу A[:, j]"""
+        i, j = key
+        if isinstance(i, slice) and i == slice(None):
+            return self.column(j)
+        if isinstance(j, slice) and j == slice(None):
+            return self.row(i)
+        return self.row(i)[j]
+
+    def __matmul__(self, x):
+        """Произведение матрицы на вектор"""
+        x = np.asarray(x, dtype=float)
+        if self.format == 'csr':
+            return np.bincount(self._major(), weights=self.data * x[self.indices],
+                               minlength=self.shape[0])
+        return np.bincount(self.indices, weights=self.data * x[self._major()],
+                           minlength=self.shape[0])
+
+
+class AugmentedMatrix:
+    """
+    Матрица [A | I] вспомогательной задачи без явного построения блока I.
+
+    Столбцы с номерами n, ..., n + m - 1 - единичные векторы
+    вспомогательных переменных, они строятся только по запросу.
+    """
+
+    def __init__(self, A, transposed=False):
+        self.A = A
+        self.transposed = transposed
+        m, n = A.shape
+        self.shape = (n + m, m) if transposed else (m, n + m)
+
+    @property
+    def T(self):
+        return AugmentedMatrix(self.A, not self.transposed)
+
+    def __len__(self):
+        return self.shape[0]
+
+    def column(self, j):
+        """Столбец j в плотном виде"""
+        m, n = self.A.shape
+        if j < n:
+            return column(self.A, j)
+        unit = np.zeros(m)
+        unit[j - n] = 1.0
+        return unit
+
+    def take_columns(self, columns):
+        """Плотная подматрица из заданных столбцов"""
+        m, n = self.A.shape
+        columns = np.asarray(columns, dtype=np.int64)
+        result = np.zeros((m, len(columns)))
+        structural = columns < n
+        result[:, structural] = take_columns(self.A, columns[structural])
+        artificial = np.flatnonzero(~structural)
+        result[columns[artificial] - n, artificial] = 1.0
+        return result
+
+    def __getitem__(self, key):
+        """Доступ к элементу A[i, j] и столбцу A[:, j]"""
+        i, j = key
+        if isinstance(i, slice) and i == slice(None):
+            return self.column(j)
+        return self.column(j)[i]
+
+    def __matmul__(self, x):
+        """Произведение матрицы (или транспонированной матрицы) на вектор"""
+        m, n = self.A.shape
+        x = np.asarray(x, dtype=float)
+        if self.transposed:
+            # [A | I]^T y = (A^T y, y)
+            return np.concatenate([self.A.T @ x, x])
+        return self.A @ x[:n] + x[n:]
+
+
+def issparse(A):
+    """Матрица хранится не в виде плотного массива numpy"""
+    return isinstance(A, (SparseMatrix, AugmentedMatrix))
+
+
+def column(A, j):
+    """Столбец j матрицы любого формата"""
+    if issparse(A):
+        return A.column(j)
+    return A[:, j]
+
+
+def row(A, i):
+    """Строка i матрицы любого формата"""
+    if isinstance(A, SparseMatrix):
+        return A.row(i)
+    if isinstance(A, AugmentedMatrix):
+        unit = np.zeros(A.A.shape[0])
+        unit[i] = 1.0
+        return np.concatenate([row(A.A, i), unit])
+    return A[i, :]
+
+
+def take_columns(A, columns):
+    """Плотная подматрица из заданных столбцов матрицы любого формата"""
+    if issparse(A):
+        return A.take_columns(columns)
+    return A[:, columns]
+
+
+def leading_block(A, m, n):
+    """Подматрица A[:m, :n] в том же формате"""
+    if isinstance(A, SparseMatrix):
+        rows, cols, values = A.to_triplets()
+        keep = (rows < m) & (cols < n)
+        return SparseMatrix.from_triplets(rows[keep], cols[keep], values[keep], (m, n), A.format)
+    return A[:m, :n]
+
+
+def equal_up_to_row_signs(A, B):
+    """
+    Матрицы (плотные или SparseMatrix) совпадают с точностью до знаков строк:
+    A = D B, D = diag(+-1). Приведение к канонической форме меняет знак строк
+    с отрицательной правой частью, поэтому задачи с общей матрицей ограничений
+    и разными b могут отличаться знаками строк A.
+    """
+    if A.shape != B.shape:
+        return False
+    if not isinstance(A, SparseMatrix) and not isinstance(B, SparseMatrix):
+        A, B = np.asarray(A, dtype=float), np.asarray(B, dtype=float)
+        return bool(np.all(np.all(A == B, axis=1) | np.all(A == -B, axis=1)))
+
+    A, B = (M.tocsr() if isinstance(M, SparseMatrix) else SparseMatrix.from_dense(M) for M in (A, B))
+    if not (np.array_equal(A.indptr, B.indptr) and np.array_equal(A.indices, B.indices)):
+        return False
+    rows = A._major()
+    plus = np.bincount(rows, weights=A.data != B.data, minlength=A.shape[0])
+    minus = np.bincount(rows, weights=A.data != -B.data, minlength=A.shape[0])
+    return bool(np.all((plus == 0) | (minus == 0)))
+
+
+class GrowableArray:
+    """Одномерный массив numpy с амортизированным удвоением емкости"""
+
+    def __init__(self, dtype=float, capacity=16):
+        self._data = np.empty(capacity, dtype=dtype)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def _reserve(self, size):
+        if size > len(self._data):
+            new_data = np.empty(max(size, 2 * len(self._data)), dtype=self._data.dtype)
+            new_data[:self._size] = self._data[:self._size]
+            self._data = new_data
+
+    def append(self, value):
+        self._reserve(self._size + 1)
+        self._data[self._size] = value
+        self._size += 1
+
+    def extend(self, values):
+        values = np.asarray(values, dtype=self._data.dtype)
+        self._reserve(self._size + len(values))
+        self._data[self._size:self._size + len(values)] = values
+        self._size += len(values)
+
+    @property
+    def view(self):
+        """Заполненная часть массива без копирования"""
+        return self._data[:self._size]
@@ -0,0 +1,154 @@
+import struct
+import sys
+import time
+from contextlib import contextmanager
+import numpy as np
+
+# Уровни детализации журнала
+SUMMARY = 0  # Только этапы и итоговые результаты
+PIVOTS = 1   # Плюс разрешающие элементы каждого шага
+TABLES = 2   # Плюс полные симплекс-таблицы
+LEVELS = {'summary': SUMMARY, 'pivots': PIVOTS, 'tables': TABLES}
+
+# Двоичный дамп таблиц: заголовок файла и записи вида (тип, длина, данные)
+DUMP_MAGIC = b"SXTRACE1"
+_RECORD = struct.Struct('<cI')
+_TABLE_HEADER = struct.Struct('<II')
+
+
+class Trace:
+    """
+    Журнал решения с уровнями детализации и отложенным форматированием.
+
+    Сообщение форматируется только если его уровень не выше заданного,
+    поэтому на уровне SUMMARY шаги симплекс-метода ничего не стоят.
+    Симплекс-таблицы можно дополнительно записывать в двоичный дамп
+    (без форматирования) и выводить в текст позже функцией render_dump.
+    """
+
+    def __init__(self, log_file=None, level=SUMMARY, dump_file=None):
+        self.log_file = log_file
+        self.level = LEVELS.get(level, level)
+        self.dump_file = dump_file
+        self._var_names = None  # Имена переменных последней записанной таблицы
+
+        if dump_file is not None:
+            dump_file.write(DUMP_MAGIC)
+
+    def enabled(self, level):
+        """Сообщения уровня level попадают в текстовый журнал"""
+        return self.log_file is not None and level <= self.level
+
+    def message(self, level, text, *args):
+        """Запись сообщения; аргументы подставляются в text только при записи"""
+        if self.log_file is not None and level <= self.level:
+            self.log_file.write(text.format(*args) if args else text)
+
+    def table(self, table, title=None, *args, step=None):
+        """
+        Запись симплекс-таблицы (заголовок title форматируется так же, как в message).
+        step - номер шага, заголовок таблицы в дампе вместо title.
+        """
+        if self.dump_file is not None:
+            if step is not None:
+                title_text = f"\nШаг {step}:\n"
+            else:
+                title_text = title.format(*args) if title and args else title or ""
+            self._dump(table, title_text)
+        if self.log_file is not None and TABLES <= self.level:
+            if title:
+                self.log_file.write(title.format(*args) if args else title)
+            self.log_file.write(str(table) + "\n")
+
+    def _write_record(self, kind, payload):
+        self.dump_file.write(_RECORD.pack(kind, len(payload)))
+        self.dump_file.write(payload)
+
+    def _dump(self, table, title):
+        var_names = table.var_names
+        if var_names is not self._var_names and var_names != self._var_names:
+            self._write_record(b'N', "\0".join(var_names).encode('utf-8'))
+            self._var_names = list(var_names)
+
+        m, k = len(table.basis_indices), table.table.shape[1]
+        title = title.encode('utf-8')
+        self._write_record(b'T', b"".join([
+            struct.pack('<H', len(title)), title,
+            _TABLE_HEADER.pack(m, k),
+            np.asarray(table.basis_indices, dtype='<i8').tobytes(),
+            np.asarray(table.free_indices, dtype='<i8').tobytes(),
+            np.ascontiguousarray(table.table, dtype='<f8').tobytes(),
+        ]))
+
+
+def as_trace(log_file):
+    """
+    Журнал решения по аргументу log_file: Trace используется как есть,
+    обычный файл получает полный текстовый журнал (уровень TABLES).
+    """
+    if isinstance(log_file, Trace):
+        return log_file
+    return Trace(log_file, TABLES if log_file else SUMMARY)
+
+
+@contextmanager
+def timed_phase(solver, name):
+    """
+    Учет этапа решения: время и число шагов (прирост solver.iterations)
+    записываются в solver.phases[name], даже если этап завершился исключением.
+    """
+    start, iterations = time.perf_counter(), solver.iterations
+    try:
+        yield
+    finally:
+        solver.phases[name] = {'time': time.perf_counter() - start,
+                               'iterations': solver.iterations - iterations}
+
+
+def read_dump(dump_file):
+    """Чтение двоичного дампа: последовательность (заголовок, базис, свободные, таблица, имена)"""
+    if dump_file.read(len(DUMP_MAGIC)) != DUMP_MAGIC:
+        raise ValueError("Неверный формат дампа симплекс-таблиц")
+
+    var_names = None
+    while True:
+        header = dump_file.read(_RECORD.size)
+        if len(header) < _RECORD.size:
+            return
+        kind, length = _RECORD.unpack(header)
+        payload = dump_file.read(length)
+
+        if kind == b'N':
+            var_names = payload.decode('utf-8').split("\0")
+        elif kind == b'T':
+            (title_length,) = struct.unpack_from('<H', payload)
+            offset = 2 + title_length
+            title = payload[2:offset].decode('utf-8')
+            m, k = _TABLE_HEADER.unpack_from(payload, offset)
+            offset += _TABLE_HEADER.size
+            basis = np.frombuffer(payload, dtype='<i8', count=m, offset=offset)
+            offset += 8 * m
+            free = np.frombuffer(payload, dtype='<i8', count=k - 1, offset=offset)
+            offset += 8 * (k - 1)
+            table = np.frombuffer(payload, dtype='<f8', offset=offset).reshape(m + 1, k)
+            yield title, basis, free, table, var_names
+
+
+def render_dump(dump_filename, out=None):
+    """Вывод таблиц двоичного дампа в текстовом виде"""
+    from .simplex_table import format_table
+
+    out = out or sys.stdout
+    with open(dump_filename, 'rb') as dump_file:
+        for title, basis, free, table, var_names in read_dump(dump_file):
+            if title:
+                out.write(title)
+            out.write(format_table(table, basis, free, var_names) + "\n")
+
+
+if __name__ == "__main__":
+    # python -m src.trace dump.bin
+    if len(sys.argv) != 2:
+        print("Использование: python -m src.trace <файл дампа>")
+        sys.exit(1)
+    render_dump(sys.argv[1])
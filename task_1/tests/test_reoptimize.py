@@ -0,0 +1,111 @@
+"""
+Повторная оптимизация из последнего базиса (LinearProgrammingSolver.reoptimize)
+сравнивается с решением каждой задачи заново.
+
+Запуск из каталога task_1:
+    python -m pytest tests
+"""
+import numpy as np
+import pytest
+from src.batch import ProblemFamily, solve_batch
+from src.converter import to_canonical_form
+from src.problem import LinearProgrammingProblem
+from src.solver import LinearProgrammingSolver
+
+
+def random_rhs(m, rng):
+    """
+    Правые части: 2/3 строк - A x <= b, b > 0, остальные - A x >= b с b
+    разных знаков (отрицательная правая часть меняет знак строки канонической задачи)
+    """
+    m_le = 2 * m // 3
+    return np.concatenate([rng.uniform(10.0, 50.0, m_le), rng.uniform(-5.0, 5.0, m - m_le)])
+
+
+def random_problem(m, n, rng):
+    """max c x при A x <= b (2/3 строк) и A x >= b (остальные), A >= 0, c > 0, x >= 0"""
+    problem = LinearProgrammingProblem()
+    problem.objective = 'max'
+    problem.c = list(rng.integers(1, 10, n).astype(float))
+    A = rng.integers(0, 10, (m, n)).astype(float)
+    rows, cols = np.nonzero(A)
+    m_le = 2 * m // 3
+    problem.set_constraints(rows, cols, A[rows, cols], ['<='] * m_le + ['>='] * (m - m_le),
+                            random_rhs(m, rng))
+    problem.non_negative_vars = list(range(n))
+    return problem
+
+
+def with_rhs(problem, b, values=None):
+    """Та же задача с правыми частями b (и ненулевыми коэффициентами A values)"""
+    other = LinearProgrammingProblem()
+    other.objective, other.c = problem.objective, problem.c
+    other.set_constraints(problem.rows.view, problem.cols.view,
+                          problem.values.view if values is None else values,
+                          problem.inequalities, b)
+    other.non_negative_vars = problem.non_negative_vars
+    return other
+
+
+def cold_solve(canonical):
+    """Статус и значение цели при решении задачи заново"""
+    solver = LinearProgrammingSolver()
+    try:
+        return solver.solve(canonical)[1], solver.status
+    except ValueError:
+        return None, solver.status
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_reoptimize_rhs_with_rebuild(seed):
+    """Таблица пересчитывается по базису на каждом шаге после замены правых частей"""
+    rng = np.random.default_rng(seed)
+    m, n = 15, 20
+    base = random_problem(m, n, rng)
+    warm = LinearProgrammingSolver()
+    warm.solve(to_canonical_form(base))
+
+    for _ in range(150):
+        canonical = to_canonical_form(with_rhs(base, random_rhs(m, rng)))
+        expected, expected_status = cold_solve(canonical)
+        if warm.table is not None:
+            warm.table.rebuild_frequency = 1
+        try:
+            objective = warm.reoptimize(canonical)[1]
+        except ValueError:
+            objective = None
+
+        assert warm.status == expected_status
+        if expected is not None:
+            assert objective == pytest.approx(expected, rel=1e-7, abs=1e-7)
+
+
+@pytest.mark.parametrize('sparse', [False, True])
+def test_reoptimize_changed_matrix(sparse):
+    """Задача с другой матрицей ограничений (те же b и c) решается заново"""
+    rng = np.random.default_rng(0)
+    first = random_problem(15, 20, rng)
+    second = with_rhs(first, first.constants.view, first.values.view + rng.integers(1, 5, len(first.values)))
+    warm = LinearProgrammingSolver()
+    warm.solve(to_canonical_form(first, sparse=sparse))
+
+    canonical = to_canonical_form(second, sparse=sparse)
+    expected, expected_status = cold_solve(canonical)
+    objective = warm.reoptimize(canonical)[1]
+    assert warm.status == expected_status
+    assert objective == pytest.approx(expected, rel=1e-7, abs=1e-7)
+
+
+@pytest.mark.parametrize('sparse', [False, True])
+def test_warm_start_family(sparse):
+    """Семейство задач с разными b: решение из предыдущего базиса совпадает с решением заново"""
+    rng = np.random.default_rng(1)
+    m, n = 15, 20
+    family = ProblemFamily(random_problem(m, n, rng), rhs=[random_rhs(m, rng) for _ in range(100)])
+    warm = solve_batch(family, sparse=sparse, processes=1, warm_start=True)
+    cold = solve_batch(family, sparse=sparse, processes=1)
+
+    for warm_result, cold_result in zip(warm, cold):
+        assert warm_result['status'] == cold_result['status']
+        if cold_result['objective'] is not None:
+            assert warm_result['objective'] == pytest.approx(cold_result['objective'], rel=1e-7, abs=1e-7)
@@ -0,0 +1,48 @@
+"""
+Бенчмарк поиска минимума функций нескольких переменных (BoxOptimizer).
+
+Для функций Растригина и Экли из src.functions (минимум 0 в начале координат,
+область несимметрична относительно него) и N = 2, 3, 5, 10 сравнивает выбор
+параллелепипеда с наименьшей оценкой J(c) - L r и выбор потенциально
+оптимальных параллелепипедов DIRECT при одинаковом числе вычислений функции:
+найденное значение, нижнюю оценку минимума, время и вычислений в секунду.
+
+Запуск из каталога task_2:
+    python -m benchmarks.boxes
+"""
+import time
+from src.boxes import BoxOptimizer, SELECTION
+from src.functions import functions_nd
+
+# Области поиска [lower, upper]^N
+DOMAINS = {
+    'rastrigin': (-2.0, 3.0),
+    'ackley': (-3.0, 4.0),
+}
+
+DIMENSIONS = (2, 3, 5, 10)
+EPS = 1e-3
+MAX_EVALUATIONS = 20000
+
+
+def main():
+    print(f"eps = {EPS}, не больше {MAX_EVALUATIONS} вычислений функции\n")
+    print(f"{'функция':>10} {'N':>3} {'выбор':>7} {'итераций':>9} {'вычислений':>11} "
+          f"{'min J':>10} {'оценка':>10} {'время, с':>9} {'выч./с':>9}")
+    for name, (lower, upper) in DOMAINS.items():
+        for dim in DIMENSIONS:
+            for selection in SELECTION:
+                optimizer = BoxOptimizer(functions_nd[name], [lower] * dim, [upper] * dim,
+                                         eps=EPS, selection=selection)
+                start = time.perf_counter()
+                _, best_f = optimizer.optimize(max_iter=MAX_EVALUATIONS, max_evaluations=MAX_EVALUATIONS,
+                                               callbacks=[])
+                elapsed = time.perf_counter() - start
+                evaluations = len(optimizer.values)
+                print(f"{name:>10} {dim:>3} {selection:>7} {optimizer.iterations:>9} {evaluations:>11} "
+                      f"{best_f:10.6f} {optimizer.lower_bound():10.4f} {elapsed:9.2f} "
+                      f"{evaluations / elapsed:9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Бенчмарк поиска минимума нижней огибающей p_n(u).
+
+Для каждой функции из src.functions сравнивает три способа выбора
+следующей точки метода ломаных:
+  grid-scalar - перебор 1000 точек сетки, p_n(u) в цикле Python по точкам;
+  grid-vector - та же сетка, p_n(u) одной векторной операцией NumPy;
+  exact       - куча интервалов с точным минимумом огибающей (BrokenLineOptimizer).
+Выводит число итераций, итераций в секунду и найденное значение функции.
+
+Запуск из каталога task_2:
+    python -m benchmarks.envelope
+"""
+import time
+import numpy as np
+from src.broken_line import BrokenLineOptimizer
+from src.functions import functions, intervals
+
+EPS = 1e-4
+MAX_ITER = 10000
+N_GRID = 1000
+
+
+def scalar_envelope(u, points, values, L):
+    return max(values[i] - L * abs(u - points[i]) for i in range(len(points)))
+
+
+def vector_envelope(u, points, values, L):
+    return (np.asarray(values) - L * np.abs(np.asarray(u)[..., np.newaxis] - points)).max(axis=-1)
+
+
+def grid_optimize(func, a, b, L, envelope, vectorized):
+    """Метод ломаных с поиском минимума огибающей на сетке (остановка по зазору в новой точке)"""
+    u0 = (a + b) / 2
+    points, values = [u0], [func(u0)]
+    grid = np.linspace(a, b, N_GRID)
+    for iteration in range(MAX_ITER):
+        if vectorized:
+            p_vals = envelope(grid, points, values, L)
+        else:
+            p_vals = [envelope(x, points, values, L) for x in grid]
+        u_new = grid[np.argmin(p_vals)]
+        f_new = func(u_new)
+        gap = f_new - envelope(u_new, points, values, L)
+        points.append(u_new)
+        values.append(f_new)
+        if gap < EPS:
+            break
+    return iteration + 1, min(values)
+
+
+def exact_optimize(func, a, b, L):
+    optimizer = BrokenLineOptimizer(func, a, b, L=L, eps=EPS)
+    _, best_f = optimizer.optimize(max_iter=MAX_ITER, callbacks=[])
+    return optimizer.iterations, best_f
+
+
+def main():
+    methods = {
+        'grid-scalar': lambda func, a, b, L: grid_optimize(func, a, b, L, scalar_envelope, False),
+        'grid-vector': lambda func, a, b, L: grid_optimize(func, a, b, L, vector_envelope, True),
+        'exact': exact_optimize,
+    }
+    print(f"eps = {EPS}, не больше {MAX_ITER} итераций, сетка: {N_GRID} точек\n")
+    print(f"{'функция':>20} {'способ':>12} {'итераций':>9} {'ит/с':>10} {'min J':>14}")
+    for name, func in functions.items():
+        a, b = intervals[name]
+        L = BrokenLineOptimizer(func, a, b).estimate_L()
+        for method, optimize in methods.items():
+            start = time.perf_counter()
+            iterations, best_f = optimize(func, a, b, L)
+            elapsed = time.perf_counter() - start
+            print(f"{name:>20} {method:>12} {iterations:>9} {iterations / elapsed:10.1f} {best_f:14.8f}")
+
+
+if __name__ == "__main__":
+    main()
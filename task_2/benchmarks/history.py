@@ -0,0 +1,88 @@
+"""
+Бенчмарк хранения истории вычислений.
+
+Для n = 10^3, 10^4, 10^5, 10^6 точек сравнивает хранение в списках Python
+(как до EvaluationHistory) и в буферах float64: память на одну точку,
+время добавления точки и время вычисления огибающей p_n(u) в 1000 точках
+сетки - матрицей всех пар (точка сетки, u_i), как раньше (только
+для n <= 10^4, иначе матрица занимает гигабайты), и проходом
+по упорядоченным точкам (BrokenLineOptimizer.p_function).
+
+Запуск из каталога task_2:
+    python -m benchmarks.history
+"""
+import time
+import tracemalloc
+import numpy as np
+from src.broken_line import BrokenLineOptimizer
+from src.history import EvaluationHistory
+
+SIZES = (10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6)
+MATRIX_MAX_SIZE = 10 ** 4
+N_GRID = 1000
+L = 10.0
+
+
+def fill_lists(points, values):
+    # Каждое значение - отдельный объект float, как результат вычисления функции
+    stored_points, stored_values = [], []
+    for u, f in zip(points, values):
+        stored_points.append(u + 0.0)
+        stored_values.append(f + 0.0)
+    return stored_points, stored_values
+
+
+def fill_history(points, values):
+    history = EvaluationHistory()
+    for u, f in zip(points, values):
+        history.append(u + 0.0, f + 0.0)
+    return history
+
+
+def measure(fill, points, values):
+    """Память на точку (байт) и время добавления точки (мкс)"""
+    start = time.perf_counter()
+    fill(points, values)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    stored = fill(points, values)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del stored
+    return memory / len(points), elapsed / len(points) * 1e6
+
+
+def matrix_envelope(u, points, values):
+    return (np.asarray(values) - L * np.abs(u[:, np.newaxis] - np.asarray(points))).max(axis=1)
+
+
+def main():
+    rng = np.random.default_rng(0)
+    grid = np.linspace(0, 1, N_GRID)
+    print(f"{'точек':>8} {'память, Б/точку':>28} {'добавление, мкс':>24} {'огибающая, мс':>24}")
+    print(f"{'':>8} {'списки':>13} {'буферы':>14} {'списки':>11} {'буферы':>12} {'матрица':>11} {'проход':>12}")
+    for n in SIZES:
+        points = rng.random(n).tolist()
+        values = rng.random(n).tolist()
+        list_memory, list_time = measure(fill_lists, points, values)
+        buffer_memory, buffer_time = measure(fill_history, points, values)
+
+        optimizer = BrokenLineOptimizer(None, 0.0, 1.0, L=L)
+        optimizer.history = fill_history(points, values)
+        optimizer.p_function(grid)  # Упорядочение точек - один раз после добавления
+        start = time.perf_counter()
+        p_vals = optimizer.p_function(grid)
+        sweep_time = (time.perf_counter() - start) * 1e3
+        if n <= MATRIX_MAX_SIZE:
+            start = time.perf_counter()
+            expected = matrix_envelope(grid, points, values)
+            matrix_time = f"{(time.perf_counter() - start) * 1e3:11.2f}"
+            assert np.allclose(p_vals, expected)
+        else:
+            matrix_time = f"{'-':>11}"
+        print(f"{n:>8} {list_memory:13.1f} {buffer_memory:14.1f} {list_time:11.3f} {buffer_time:12.3f} "
+              f"{matrix_time} {sweep_time:12.2f}")
+
+
+if __name__ == "__main__":
+    main()
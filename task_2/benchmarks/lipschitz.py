@@ -0,0 +1,49 @@
+"""
+Бенчмарк локальных оценок константы Липшица.
+
+Для каждой функции из src.functions сравнивает метод ломаных с одной
+константой L (оценка по 1000 точкам с запасом 20%) и с локальными
+оценками на интервалах (local_L=True): число вычислений функции до
+достижения eps, включая вычисления для оценки L, и погрешность найденного
+минимума относительно перебора по мелкой сетке.
+
+Запуск из каталога task_2:
+    python -m benchmarks.lipschitz
+"""
+import numpy as np
+from src.broken_line import BrokenLineOptimizer
+from src.evaluation import evaluate
+from src.functions import functions, intervals
+
+EPS = 1e-4
+N_ESTIMATE = 1000   # Точек для оценки глобальной константы L
+N_REFERENCE = 10 ** 6
+
+
+def run(func, a, b, local_L):
+    """Число вычислений функции и найденное значение"""
+    optimizer = BrokenLineOptimizer(func, a, b, eps=EPS, local_L=local_L)
+    _, best_f = optimizer.optimize(callbacks=[])
+    evaluations = len(optimizer.points) + (0 if local_L else N_ESTIMATE)
+    return evaluations, best_f
+
+
+def main():
+    print(f"eps = {EPS}\n")
+    print(f"{'функция':>20} {'вычислений (L)':>15} {'вычислений (local)':>19} "
+          f"{'погрешность (L)':>16} {'погрешность (local)':>20}")
+    totals = [0, 0]
+    for name, func in functions.items():
+        a, b = intervals[name]
+        reference = evaluate(func, np.linspace(a, b, N_REFERENCE)).min()
+        global_evaluations, global_f = run(func, a, b, False)
+        local_evaluations, local_f = run(func, a, b, True)
+        totals[0] += global_evaluations
+        totals[1] += local_evaluations
+        print(f"{name:>20} {global_evaluations:>15} {local_evaluations:>19} "
+              f"{global_f - reference:16.2e} {local_f - reference:20.2e}")
+    print(f"{'всего':>20} {totals[0]:>15} {totals[1]:>19}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Бенчмарк одновременного вычисления функции в нескольких точках.
+
+Дорогая целевая функция имитируется задержкой DELAY секунд перед вычислением
+функции из src.functions. Для batch_size = 1, 2, 4, 8 (пул потоков) выводит
+суммарное по функциям число итераций, вычислений функции и время работы
+до достижения eps, а также ускорение относительно batch_size = 1.
+
+Запуск из каталога task_2:
+    python -m benchmarks.parallel
+"""
+import time
+from src.broken_line import BrokenLineOptimizer
+from src.functions import functions, intervals
+
+EPS = 1e-4
+DELAY = 0.005
+BATCH_SIZES = (1, 2, 4, 8)
+
+
+class Expensive:
+    """Функция с задержкой перед вычислением (сериализуется pickle для пула процессов)"""
+
+    def __init__(self, func, delay):
+        self.func = func
+        self.delay = delay
+
+    def __call__(self, x):
+        time.sleep(self.delay)
+        return self.func(x)
+
+
+def run(batch_size, local_L):
+    """Суммарные число итераций, вычислений и время по всем функциям"""
+    iterations, evaluations, elapsed = 0, 0, 0.0
+    for name, func in functions.items():
+        a, b = intervals[name]
+        optimizer = BrokenLineOptimizer(Expensive(func, DELAY), a, b, eps=EPS,
+                                        local_L=local_L, batch_size=batch_size)
+        start = time.perf_counter()
+        optimizer.optimize(callbacks=[])
+        elapsed += time.perf_counter() - start
+        iterations += optimizer.iterations
+        evaluations += len(optimizer.points)
+    return iterations, evaluations, elapsed
+
+
+def main():
+    print(f"eps = {EPS}, задержка функции: {DELAY * 1e3:.0f} мс, функций: {len(functions)}\n")
+    print(f"{'оценка L':>10} {'k':>3} {'итераций':>9} {'вычислений':>11} {'время, с':>9} {'ускорение':>10}")
+    for local_L in (False, True):
+        base = None
+        for batch_size in BATCH_SIZES:
+            iterations, evaluations, elapsed = run(batch_size, local_L)
+            base = base or elapsed
+            print(f"{'local' if local_L else 'global':>10} {batch_size:>3} {iterations:>9} "
+                  f"{evaluations:>11} {elapsed:9.2f} {base / elapsed:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Бенчмарк событий итераций метода ломаных.
+
+Для каждой функции из src.functions (одна константа L и локальные оценки)
+записывает события итераций в EventRecorder и выводит, сколько времени
+ушло на вычисление функции и на работу с огибающей (выбор минимума p_n(u)
+и добавление точки), а также время оптимизации (с оценкой L) на итерацию
+без обработчиков событий и с EventRecorder.
+
+Запуск из каталога task_2:
+    python -m benchmarks.progress
+"""
+from src.broken_line import BrokenLineOptimizer
+from src.functions import functions, intervals
+from src.progress import EventRecorder
+
+EPS = 1e-4
+REPEAT = 5
+
+
+def run(func, a, b, local_L, callbacks):
+    """Наименьшее за REPEAT запусков время итерации (мкс) и оптимизатор"""
+    best = float('inf')
+    for _ in range(REPEAT):
+        optimizer = BrokenLineOptimizer(func, a, b, eps=EPS, local_L=local_L)
+        optimizer.optimize(callbacks=callbacks)
+        best = min(best, optimizer.optimization_time / optimizer.iterations * 1e6)
+    return best, optimizer
+
+
+def main():
+    print(f"eps = {EPS}, время на итерацию - лучшее из {REPEAT} запусков\n")
+    print(f"{'функция':>20} {'L':>6} {'итераций':>9} {'функция, %':>11} {'огибающая, %':>13} "
+          f"{'мкс/ит':>8} {'мкс/ит (запись)':>16}")
+    for name, func in functions.items():
+        a, b = intervals[name]
+        for local_L in (False, True):
+            plain, _ = run(func, a, b, local_L, [])
+            recorder = EventRecorder()
+            recorded, optimizer = run(func, a, b, local_L, [recorder])
+            total = recorder.evaluation_time + recorder.envelope_time
+            print(f"{name:>20} {'local' if local_L else 'global':>6} {optimizer.iterations:>9} "
+                  f"{100 * recorder.evaluation_time / total:11.1f} "
+                  f"{100 * recorder.envelope_time / total:13.1f} {plain:8.2f} {recorded:16.2f}")
+
+
+if __name__ == "__main__":
+    main()
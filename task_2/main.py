@@ -1,9 +1,43 @@
+import argparse
+import os
+import time
+from src.batch import make_jobs, run_batch
 from src.broken_line import BrokenLineOptimizer
+from src.evaluation import CachedFunction
 from src.functions import functions
 from src.visualizer import Visualizer
 
 def main():
     """Основная демонстрация"""
+    parser = argparse.ArgumentParser(description="Метод ломаных - демонстрация")
+    parser.add_argument("--cache-dir", default=None,
+                        help="Каталог для сохранения вычисленных значений функций между запусками")
+    batch = parser.add_argument_group("пакетный режим (без графиков)")
+    batch.add_argument("--batch", metavar="OUTPUT", default=None,
+                       help="Оптимизация по сетке заданий в пуле процессов с записью результатов в CSV-файл")
+    batch.add_argument("--functions", nargs="+", choices=list(functions), default=None,
+                       help="Функции (по умолчанию - все)")
+    batch.add_argument("--scales", nargs="+", type=float, default=[1.0],
+                       help="Коэффициенты растяжения отрезков функций относительно середины")
+    batch.add_argument("--eps", nargs="+", type=float, default=[1e-4], help="Точности")
+    batch.add_argument("--local-L", nargs="+", choices=["global", "local"], default=["global"],
+                       help="Способы оценки константы Липшица")
+    batch.add_argument("--processes", type=int, default=None,
+                       help="Число процессов (по умолчанию - число процессоров)")
+    batch.add_argument("--max-iter", type=int, default=10000, help="Наибольшее число итераций")
+    args = parser.parse_args()
+
+    if args.batch:
+        jobs = make_jobs(args.functions, args.scales, args.eps,
+                         [mode == "local" for mode in args.local_L])
+        print(f"=== Метод ломаных - пакетный режим: {len(jobs)} заданий ===\n")
+        start_time = time.perf_counter()
+        results = run_batch(jobs, args.batch, args.processes, max_iter=args.max_iter)
+        solved = sum(result['status'] == "solved" for result in results)
+        print(f"\nРешено {solved} из {len(results)} за {time.perf_counter() - start_time:.2f} с, "
+              f"результаты: {args.batch}")
+        return
+
     print("=== Метод ломаных - демонстрация ===\n")
     
     # Точнсть
@@ -18,11 +52,21 @@ def main():
         ("multi_minima", -2, 2, eps)
     ]
     
+    # Кэш значений каждой функции общий для оценки L, оптимизации, графика
+    # и всех отрезков, на которых она исследуется
+    caches = {}
+    
     for func_name, a, b, eps in test_cases:
         print(f"\n--- Функция: {func_name} на [{a}, {b}] ---")
         
+        if func_name not in caches:
+            path = os.path.join(args.cache_dir, f"{func_name}.dat") if args.cache_dir else None
+            caches[func_name] = CachedFunction(functions[func_name], path=path)
+        func = caches[func_name]
+        misses, hits = func.misses, func.hits
+        
         # Создание оптимизатора
-        optimizer = BrokenLineOptimizer(functions[func_name], a, b, eps=eps)
+        optimizer = BrokenLineOptimizer(func, a, b, eps=eps)
         
         # Оптимизация
         x_opt, f_opt = optimizer.optimize()
@@ -37,6 +81,11 @@ def main():
         # Визуализация
         visualizer = Visualizer(optimizer)
         visualizer.plot(save_path=f"{func_name}.png")
+        print(f"Новых вычислений функции (с оценкой L и графиком): {func.misses - misses}, "
+              f"взято из кэша: {func.hits - hits}")
+    
+    for func in caches.values():
+        func.flush()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
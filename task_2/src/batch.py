@@ -0,0 +1,111 @@
+import contextlib
+import csv
+import itertools
+import os
+import time
+from multiprocessing import Pool
+from .broken_line import BrokenLineOptimizer
+from .functions import functions, intervals
+
+# Столбцы таблицы результатов (по одному значению в ячейке, как в Parquet)
+COLUMNS = ('job', 'function', 'a', 'b', 'eps', 'local_L', 'status', 'x', 'f',
+           'iterations', 'evaluations', 'time', 'error')
+
+
+def make_jobs(names=None, scales=(1,), eps_values=(1e-4,), local_L=(False,)):
+    """
+    Сетка заданий: все сочетания функций names (по умолчанию - все функции
+    библиотеки), отрезков, точностей и способов оценки L. Отрезок - отрезок
+    функции по умолчанию, растянутый в scale раз относительно своей середины.
+    """
+    jobs = []
+    names = list(functions) if names is None else names
+    for name, scale, eps, local in itertools.product(names, scales, eps_values, local_L):
+        if name not in functions:
+            raise ValueError(f"Неизвестная функция: {name}")
+        if scale <= 0:
+            raise ValueError(f"Коэффициент растяжения отрезка должен быть положительным: {scale}")
+        a, b = intervals[name]
+        center, half = (a + b) / 2, (b - a) / 2 * scale
+        jobs.append({'job': len(jobs), 'function': name, 'a': center - half, 'b': center + half,
+                     'eps': eps, 'local_L': local})
+    return jobs
+
+
+def run_job(job, max_iter=10000):
+    """Оптимизация по одному заданию без вывода на экран; результат - словарь"""
+    result = dict(job, status="error", x=None, f=None, iterations=0, evaluations=0,
+                  time=0.0, error=None)
+    start_time = time.perf_counter()
+    optimizer = None
+    try:
+        optimizer = BrokenLineOptimizer(functions[job['function']], job['a'], job['b'],
+                                        eps=job['eps'], local_L=job['local_L'])
+        result['x'], result['f'] = optimizer.optimize(max_iter, callbacks=[])
+        result['status'] = optimizer.status
+    except Exception as e:
+        # Ошибка одного задания не должна останавливать весь пакет
+        result['error'] = f"{type(e).__name__}: {e}"
+    if optimizer is not None:
+        result['iterations'] = optimizer.iterations
+        result['evaluations'] = len(optimizer.points)
+    result['time'] = time.perf_counter() - start_time
+    return result
+
+
+# Состояние процесса-исполнителя: задается один раз при запуске пула
+_worker = {}
+
+
+def _init_worker(max_iter):
+    _worker['max_iter'] = max_iter
+
+
+def _run_task(task):
+    """Выполнение одного задания пакета в процессе-исполнителе"""
+    index, job = task
+    return index, run_job(job, _worker['max_iter'])
+
+
+def run_batch(jobs, output=None, processes=None, chunksize=None, max_iter=10000):
+    """
+    Пакетная оптимизация в пуле процессов.
+
+    Результаты записываются в CSV-файл output по мере готовности (строки -
+    в порядке завершения, номер задания - в столбце job), на экран выводится
+    ход выполнения. Возвращаются результаты в порядке входных заданий.
+    """
+    tasks = list(enumerate(jobs))
+    if processes is None:
+        processes = os.cpu_count() or 1
+    processes = max(1, min(processes, len(tasks)))
+
+    # Крупные порции заданий снижают накладные расходы на обмен между процессами
+    if chunksize is None:
+        chunksize = max(1, len(tasks) // (4 * processes))
+
+    results = [None] * len(tasks)
+    with contextlib.ExitStack() as stack:
+        writer = None
+        if output is not None:
+            f = stack.enter_context(open(output, 'w', encoding='utf-8', newline=''))
+            writer = csv.DictWriter(f, COLUMNS, extrasaction='ignore')
+            writer.writeheader()
+
+        if processes == 1:
+            _init_worker(max_iter)
+            completed = map(_run_task, tasks)
+        else:
+            pool = stack.enter_context(Pool(processes, initializer=_init_worker, initargs=(max_iter,)))
+            completed = pool.imap_unordered(_run_task, tasks, chunksize)
+
+        for done, (index, result) in enumerate(completed, 1):
+            results[index] = result
+            if writer is not None:
+                writer.writerow(result)
+                f.flush()
+            print(f"[{done}/{len(tasks)}] {result['function']} на [{result['a']:g}, {result['b']:g}], "
+                  f"eps={result['eps']:g}"
+                  f"{', локальные L' if result['local_L'] else ''}: {result['status']}, {result['time']:.3f} с")
+
+    return results
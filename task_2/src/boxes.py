@@ -0,0 +1,236 @@
+import heapq
+import numpy as np
+import time
+from typing import Callable
+from .evaluation import evaluate_rows
+from .progress import BoxEvent, BoxProgressPrinter, notify
+
+# Выбор параллелепипедов для деления: bound - с наименьшей оценкой J(c) - L r
+# (как вершина ломаной), direct - потенциально оптимальные по методу DIRECT
+# (наименьшая оценка хотя бы при одной константе Липшица)
+SELECTION = ('bound', 'direct')
+
+# Параметр DIRECT: делятся только параллелепипеды, оценка которых может
+# улучшить рекорд больше чем на DIRECT_EPS * |рекорд|
+DIRECT_EPS = 1e-4
+
+
+class BoxOptimizer:
+    """
+    Поиск глобального минимума липшицевой функции N переменных на параллелепипеде
+    [lower, upper] - обобщение метода ломаных.
+
+    Область делится на параллелепипеды, как в методе DIRECT: функция вычисляется
+    в центре c каждого, нижняя оценка на параллелепипеде с половиной диагонали r
+    равна J(c) - L r (аналог вершины ломаной). Параллелепипеды одного размера
+    хранятся в куче по J(c), поэтому наименьшая оценка - среди вершин куч.
+    Выбранный параллелепипед делится на три части по всем своим самым длинным
+    сторонам: центры c +- delta e_i всех выбранных на итерации параллелепипедов
+    вычисляются одним вызовом функции, сначала делятся стороны с наименьшим
+    min(J(c + delta e_i), J(c - delta e_i)).
+
+    В optimize после каждой итерации вызываются callbacks с событием
+    BoxEvent (см. src/progress.py); по умолчанию - вывод хода каждые
+    1000 итераций, оценки L и итогов (BoxProgressPrinter)
+    """
+
+    def __init__(self, func: Callable, lower, upper, L: float = None, eps: float = 1e-4,
+                 selection: str = 'bound'):
+        if selection not in SELECTION:
+            raise ValueError(f"Неизвестное правило выбора: {selection}")
+        self.func = func
+        self.lower = np.asarray(lower, dtype=float)
+        self.upper = np.asarray(upper, dtype=float)
+        if self.lower.shape != self.upper.shape or np.any(self.lower >= self.upper):
+            raise ValueError("Границы области должны задавать непустой параллелепипед")
+        self.eps = eps
+        self.L = L
+        self.selection = selection
+
+        # История вычислений в буферах, емкость которых при заполнении удваивается
+        self._points = np.empty((64, len(self.lower)))
+        self._values = np.empty(64)
+        self._size = 0
+        self.iterations = 0
+        self.status = "not solved"
+
+        # Параллелепипеды по половине диагонали r: куча (J(c), номер, c, число делений сторон на 3)
+        self._groups = {}
+        self._counter = 0
+
+    @property
+    def points(self):
+        """Вычисленные точки - строки массива (без копирования)"""
+        return self._points[:self._size]
+
+    @property
+    def values(self):
+        """Значения функции в вычисленных точках"""
+        return self._values[:self._size]
+
+    def estimate_L(self, n_points=1000):
+        """
+        Оценка константы Липшица: наибольшая норма разностного градиента
+        в n_points случайных точках с запасом 20%
+        """
+        rng = np.random.default_rng(0)
+        dim = len(self.lower)
+        h = np.linalg.norm(self.upper - self.lower) / n_points
+        x = self.lower + rng.random((n_points, dim)) * (self.upper - self.lower - h)
+        shifted = x[:, np.newaxis, :] + h * np.eye(dim)
+        values = evaluate_rows(self.func, np.concatenate([x, shifted.reshape(-1, dim)]))
+        gradients = (values[n_points:].reshape(n_points, dim) - values[:n_points, np.newaxis]) / h
+        return float(np.max(np.linalg.norm(gradients, axis=1))) * 1.2  # Запас 20%
+
+    def _add(self, points, values):
+        size = self._size + len(points)
+        if size > len(self._values):
+            capacity = max(size, 2 * len(self._values))
+            self._points = np.concatenate([self.points, np.empty((capacity - self._size, self._points.shape[1]))])
+            self._values = np.concatenate([self.values, np.empty(capacity - self._size)])
+        self._points[self._size:size] = points
+        self._values[self._size:size] = values
+        self._size = size
+
+    def _push(self, centers, values, levels):
+        """Добавление параллелепипедов с центрами centers и levels делениями сторон"""
+        radii = np.linalg.norm((self.upper - self.lower) / 3.0 ** levels, axis=-1) / 2
+        for radius, value, center, level in zip(radii.tolist(), values.tolist(), centers, levels):
+            self._counter += 1
+            heapq.heappush(self._groups.setdefault(radius, []), (value, self._counter, center, level))
+
+    def _group_minima(self):
+        """Половины диагоналей групп и наименьшие J(c) в них (по возрастанию r)"""
+        radii = np.array(sorted(self._groups))
+        minima = np.array([self._groups[radius][0][0] for radius in radii.tolist()])
+        return radii, minima
+
+    def lower_bound(self):
+        """Нижняя оценка глобального минимума: min (J(c) - L r) по всем параллелепипедам"""
+        radii, minima = self._group_minima()
+        return float(np.min(minima - self.L * radii))
+
+    def _select(self, best_f):
+        """Половины диагоналей групп, вершины куч которых делятся на этой итерации"""
+        radii, minima = self._group_minima()
+        if self.selection == 'bound':
+            return [radii[np.argmin(minima - self.L * radii)]]
+
+        # DIRECT: нижняя правая часть выпуклой оболочки точек (r, min J(c)),
+        # начиная с наименьшего значения (при равенстве - с наибольшего r)
+        start = len(minima) - 1 - int(np.argmin(minima[::-1]))
+        hull = []
+        for i in range(start, len(radii)):
+            while len(hull) >= 2:
+                j, k = hull[-2], hull[-1]
+                # k не на оболочке, если лежит не ниже отрезка j - i
+                if (minima[k] - minima[j]) * (radii[i] - radii[j]) >= \
+                        (minima[i] - minima[j]) * (radii[k] - radii[j]):
+                    hull.pop()
+                else:
+                    break
+            hull.append(i)
+
+        selected = []
+        for position, i in enumerate(hull):
+            if position + 1 < len(hull):
+                # Наибольшая константа, при которой оценка i не хуже соседа справа
+                j = hull[position + 1]
+                K = (minima[j] - minima[i]) / (radii[j] - radii[i])
+                if minima[i] - K * radii[i] > best_f - DIRECT_EPS * abs(best_f):
+                    continue
+            selected.append(radii[i])
+        return selected or [radii[hull[-1]]]
+
+    def _divide(self, boxes):
+        """Деление параллелепипедов (J(c), c, levels) по всем самым длинным сторонам"""
+        centers, parts = [], []
+        for value, center, levels in boxes:
+            sides = (self.upper - self.lower) / 3.0 ** levels
+            dims = np.flatnonzero(np.isclose(sides, sides.max()))
+            delta = np.zeros((len(dims), len(center)))
+            delta[np.arange(len(dims)), dims] = sides[dims] / 3
+            centers += [center + delta, center - delta]
+            parts.append(dims)
+
+        # Новые центры всех параллелепипедов - одним вызовом функции
+        centers = np.concatenate(centers)
+        values = evaluate_rows(self.func, centers)
+        self._add(centers, values)
+
+        start = 0
+        for (value, center, levels), dims in zip(boxes, parts):
+            m = len(dims)
+            box_centers, box_values = centers[start:start + 2 * m], values[start:start + 2 * m]
+            start += 2 * m
+
+            # Сначала делятся стороны с наименьшим значением в новых центрах
+            order = np.argsort(np.minimum(box_values[:m], box_values[m:]), kind='stable')
+            child_levels = np.repeat(levels[np.newaxis, :], m, axis=0)
+            for k, i in enumerate(order):
+                child_levels[k:, dims[i]] += 1
+            middle_levels = child_levels[-1:]
+            child_levels = child_levels[np.argsort(order)]
+            self._push(box_centers, box_values, np.concatenate([child_levels, child_levels]))
+            self._push(center[np.newaxis, :], np.array([value]), middle_levels)
+        return centers, values
+
+    def optimize(self, max_iter=10000, max_evaluations=None, callbacks=None):
+        """
+        Поиск минимума: возвращает лучшую найденную точку и значение в ней.
+        Останавливается также, когда вычислений функции не меньше max_evaluations
+        """
+        if callbacks is None:
+            callbacks = [BoxProgressPrinter()]
+        start_time = time.time()
+
+        # Оценка L если не задана
+        if self.L is None:
+            self.L = self.estimate_L()
+            notify(callbacks, 'lipschitz', self.L)
+
+        # Начальная точка - центр области
+        center = (self.lower + self.upper) / 2
+        value = evaluate_rows(self.func, center[np.newaxis, :])
+        self._size = 0
+        self._add(center[np.newaxis, :], value)
+        self._groups, self._counter = {}, 0
+        self._push(center[np.newaxis, :], value, np.zeros((1, len(center)), dtype=int))
+
+        best_x, best_f = center, float(value[0])
+
+        self.status = "max iterations reached"
+        for iteration in range(max_iter):
+            self.iterations = iteration + 1
+
+            # Делим выбранные параллелепипеды
+            boxes = []
+            for radius in self._select(best_f):
+                value, _, center, levels = heapq.heappop(self._groups[radius])
+                if not self._groups[radius]:
+                    del self._groups[radius]
+                boxes.append((value, center, levels))
+            centers, values = self._divide(boxes)
+
+            k = int(np.argmin(values))
+            if values[k] < best_f:
+                best_x, best_f = centers[k], float(values[k])
+
+            lower_bound = self.lower_bound()
+            if callbacks:
+                event = BoxEvent(iteration + 1, self._size, lower_bound, best_x, best_f)
+                for callback in callbacks:
+                    callback(event)
+
+            # Условие остановки
+            if best_f - lower_bound < self.eps:
+                self.status = "solved"
+                break
+            if max_evaluations is not None and self._size >= max_evaluations:
+                self.status = "max evaluations reached"
+                break
+
+        self.optimization_time = time.time() - start_time
+        notify(callbacks, 'finish', self.status, self.iterations)
+
+        return best_x, best_f
@@ -1,98 +1,288 @@
+import heapq
 import numpy as np
 import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from typing import Callable
+from .evaluation import evaluate
+from .history import EvaluationHistory
+from .progress import IterationEvent, ProgressPrinter, notify
+
+# Нижняя граница локальных оценок константы Липшица
+XI = 1e-8
+
+# С локальными оценками нижняя граница p_n надежна только после уточнения:
+# остановка требует еще, чтобы разделенный интервал был короче MIN_WIDTH * (b - a)
+MIN_WIDTH = 1e-3
+
+# Пулы для одновременного вычисления функции в нескольких точках: thread - потоки
+# (функция освобождает GIL, например, ждет внешний процесс), process - процессы
+# (функция должна сериализоваться pickle)
+POOLS = ('thread', 'process')
+
 
 class BrokenLineOptimizer:
     """
-    Реализация метода ломаных для поиска глобального минимума
+    Реализация метода ломаных для поиска глобального минимума.
+
+    При local_L=True вместо одной константы L для каждого интервала между
+    соседними точками используется своя оценка (локальная настройка
+    Стронгина-Сергеева) по уже вычисленным значениям функции, умноженная
+    на параметр надежности r > 1; предварительная оценка L не нужна.
+
+    При batch_size = k > 1 на каждой итерации выбираются минимумы p_n(u)
+    на k разных интервалах с наименьшими значениями p_n, функция вычисляется
+    в них одновременно в пуле из k потоков или процессов (pool)
+
+    В optimize после каждой итерации вызываются callbacks с событием
+    IterationEvent (см. src/progress.py); по умолчанию - вывод хода
+    каждые 10 итераций, оценки L и итогов (ProgressPrinter)
     """
     
-    def __init__(self, func: Callable, a: float, b: float, L: float = None, eps: float = 1e-4):
+    def __init__(self, func: Callable, a: float, b: float, L: float = None, eps: float = 1e-4,
+                 local_L: bool = False, r: float = 1.5, batch_size: int = 1, pool: str = 'thread'):
+        if pool not in POOLS:
+            raise ValueError(f"Неизвестный пул: {pool}")
+        if r <= 1:
+            # При r <= 1 минимум p_n(u) может совпасть с вычисленной точкой
+            raise ValueError(f"Параметр надежности r должен быть больше 1: {r}")
         self.func = func
         self.a = a
         self.b = b
         self.eps = eps
         self.L = L
+        self.local_L = local_L
+        self.r = r
+        self.batch_size = max(1, batch_size)
+        self.pool = pool
         
-        # История вычислений
-        self.points = []  # Точки u_i
-        self.values = []  # Значения J(u_i)
+        # История вычислений: точки u_i и значения J(u_i)
+        self.history = EvaluationHistory()
         self.iterations = 0
+        self.status = "not solved"
+
+        # Куча интервалов между соседними точками по минимуму p_n(u) на интервале:
+        # (p_min, номер, u_min, u_left, J_left, u_right, J_right); у крайних
+        # интервалов [a, u_0] и [u_n, b] граница отрезка еще не вычислена (None)
+        self._intervals = []
+        self._counter = 0
+
+    @property
+    def points(self):
+        """Точки u_i в порядке вычисления (массив без копирования)"""
+        return self.history.points
+
+    @property
+    def values(self):
+        """Значения J(u_i) в порядке вычисления"""
+        return self.history.values
         
-    def estimate_L(self, n_points=1000):
+    def estimate_L(self, n_points=1000, map_points=map):
         """Оценка константы Липшица"""
         x = np.linspace(self.a, self.b, n_points)
-        y = [self.func(xi) for xi in x]
+        y = evaluate(self.func, x, map_points)
         
-        L = 0
-        for i in range(1, len(x)):
-            L = max(L, abs(y[i] - y[i-1]) / abs(x[i] - x[i-1]))
+        L = np.max(np.abs(np.diff(y)) / np.diff(x))
         
-        return L * 1.2  # Запас 20%
+        return float(L) * 1.2  # Запас 20%
     
     def p_function(self, u):
-        """Функция p_n(u) = max_i [J(u_i) - L|u - u_i|]"""
-        if not self.points:
-            return -np.inf
-            
-        return max(self.values[i] - self.L * abs(u - self.points[i]) 
-                   for i in range(len(self.points)))
+        """
+        Функция p_n(u) = max_i [J(u_i) - L|u - u_i|].
+        Для массива u значения вычисляются сразу для всех точек
+        """
+        u = np.asarray(u, dtype=float)
+        if not len(self.history):
+            return np.full(u.shape, -np.inf) if u.ndim else -np.inf
+        if self.local_L:
+            return self._local_p_function(u)
+
+        # По упорядоченным точкам: для u_i <= u максимум J(u_i) - L(u - u_i) равен
+        # max(J(u_i) + L u_i) - L u - префиксный максимум, для u_i > u - суффиксный
+        x, z = self.history.sorted_points, self.history.sorted_values
+        left = np.maximum.accumulate(z + self.L * x)
+        right = np.maximum.accumulate((z - self.L * x)[::-1])[::-1]
+        j = np.searchsorted(x, u, side='right')
+        p_vals = np.maximum(np.where(j > 0, left[j - 1] - self.L * u, -np.inf),
+                            np.where(j < len(x), right[np.minimum(j, len(x) - 1)] + self.L * u, -np.inf))
+        return p_vals if u.ndim else float(p_vals)
     
-    def find_min_p(self, n_grid=1000):
-        """Поиск минимума p_n(u) на сетке"""
-        grid = np.linspace(self.a, self.b, n_grid)
-        p_vals = [self.p_function(x) for x in grid]
-        return grid[np.argmin(p_vals)]
+    def _push_interval(self, u_left, f_left, u_right, f_right):
+        """Добавление интервала в кучу с точным минимумом p_n(u) на нем"""
+        if u_left is None:
+            # Крайний интервал [a, u_right]: минимум на границе отрезка
+            u_min, p_min = self.a, f_right - self.L * (u_right - self.a)
+        elif u_right is None:
+            u_min, p_min = self.b, f_left - self.L * (self.b - u_left)
+        else:
+            # Вершина пересечения J_left - L(u - u_left) и J_right - L(u_right - u)
+            u_min = (u_left + u_right) / 2 + (f_left - f_right) / (2 * self.L)
+            u_min = min(max(u_min, u_left), u_right)
+            p_min = (f_left + f_right) / 2 - self.L * (u_right - u_left) / 2
+        self._counter += 1
+        heapq.heappush(self._intervals, (p_min, self._counter, u_min,
+                                         u_left, f_left, u_right, f_right))
+
+    def local_estimates(self):
+        """
+        Локальные оценки константы Липшица на интервалах между соседними точками:
+        mu_i = r * max(lambda_i, gamma_i, XI), где lambda_i - наибольший наклон
+        ломаной на интервале и двух соседних с ним, gamma_i = M h_i / h_max
+        (M - наибольший наклон, h_i - длина интервала) сохраняет глобальную
+        сходимость на длинных интервалах
+        """
+        x, z = self.history.sorted_points, self.history.sorted_values
+        h = np.diff(x)
+        slopes = np.abs(np.diff(z)) / h
+        lam = slopes.copy()
+        lam[1:] = np.maximum(lam[1:], slopes[:-1])
+        lam[:-1] = np.maximum(lam[:-1], slopes[1:])
+        gamma = slopes.max() * h / h.max()
+        mu = self.r * np.maximum(np.maximum(lam, gamma), XI)
+        return x, z, mu
+
+    def _local_p_function(self, u):
+        """p_n(u) с локальными оценками: на интервале i - максимум двух прямых с наклоном mu_i"""
+        x, z, mu = self.local_estimates()
+        i = np.clip(np.searchsorted(x, u) - 1, 0, len(mu) - 1)
+        p_vals = np.maximum(z[i] - mu[i] * (u - x[i]), z[i + 1] - mu[i] * (x[i + 1] - u))
+        return p_vals if u.ndim else float(p_vals)
+
+    def _local_minima(self):
+        """Минимумы p_n(u) на интервалах при локальных оценках: точки и значения"""
+        x, z, mu = self.local_estimates()
+        p_vals = (z[1:] + z[:-1]) / 2 - mu * np.diff(x) / 2
+        u_min = (x[1:] + x[:-1]) / 2 - np.diff(z) / (2 * mu)
+        return u_min, p_vals
+
+    def find_min_p(self):
+        """Точка минимума p_n(u) на [a, b] и значение p_n в ней"""
+        if self.local_L:
+            u_min, p_vals = self._local_minima()
+            i = int(np.argmin(p_vals))
+            return float(u_min[i]), float(p_vals[i])
+        p_min, _, u_min = self._intervals[0][:3]
+        return u_min, p_min
+
+    def _select(self, k):
+        """
+        Минимумы p_n(u) на k интервалах с наименьшими значениями p_n по возрастанию p_n:
+        список (u, p_n(u), интервал); интервалы из кучи извлекаются
+        """
+        if self.local_L:
+            u_min, p_vals = self._local_minima()
+            order = np.argsort(p_vals, kind='stable')[:k]
+            return [(float(u_min[i]), float(p_vals[i]), None) for i in order]
+        entries = [heapq.heappop(self._intervals) for _ in range(min(k, len(self._intervals)))]
+        return [(entry[2], entry[0], entry) for entry in entries]
+
+    def _add_point(self, u, f, interval):
+        """Добавление вычисленной точки минимума p_n(u); возвращает длину разделенного ею интервала"""
+        self.history.append(u, f)
+        if self.local_L:
+            x = self.history.sorted_points
+            k = np.searchsorted(x, u)
+            return x[k + 1] - x[k - 1]
+
+        # Интервал, извлеченный из кучи, делится точкой на два
+        _, _, _, u_left, f_left, u_right, f_right = interval
+        u_left_end = self.a if u_left is None else u_left
+        u_right_end = self.b if u_right is None else u_right
+        if u != u_left_end:
+            self._push_interval(u_left, f_left, u, f)
+        if u != u_right_end:
+            self._push_interval(u, f, u_right, f_right)
+        return u_right_end - u_left_end
     
-    def optimize(self, max_iter=1000):
-        """Основной алгоритм метода ломаных"""
+    def optimize(self, max_iter=10000, callbacks=None, max_evaluations=None, max_time=None):
+        """
+        Основной алгоритм метода ломаных. Останавливается также, когда вычислений
+        функции не меньше max_evaluations или с начала прошло max_time секунд
+        """
+        if callbacks is None:
+            callbacks = [ProgressPrinter()]
+        if self.batch_size == 1:
+            return self._optimize(max_iter, map, callbacks, max_evaluations, max_time)
+        executor_class = ThreadPoolExecutor if self.pool == 'thread' else ProcessPoolExecutor
+        with executor_class(self.batch_size) as executor:
+            return self._optimize(max_iter, executor.map, callbacks, max_evaluations, max_time)
+
+    def _optimize(self, max_iter, map_points, callbacks, max_evaluations, max_time):
+        """Метод ломаных; функция в нескольких точках вычисляется через map_points (см. evaluate)"""
         start_time = time.time()
+        clock = time.perf_counter
+        start = clock()
         
         # Оценка L если не задана
-        if self.L is None:
-            self.L = self.estimate_L()
-            print(f"Константа Липшица: {self.L:.4f}")
+        if self.L is None and not self.local_L:
+            self.L = self.estimate_L(map_points=map_points)
+            notify(callbacks, 'lipschitz', self.L)
         
         # Начальная точка - середина отрезка
         u0 = (self.a + self.b) / 2
-        self.points = [u0]
-        self.values = [self.func(u0)]
+        self._intervals, self._counter = [], 0
+        self.history.clear()
+        if self.local_L:
+            # Для локальных оценок нужны значения на концах отрезка
+            points = [u0, self.a, self.b]
+            self.history.extend(points, evaluate(self.func, points, map_points))
+        else:
+            f0 = float(evaluate(self.func, [u0])[0])
+            self.history.append(u0, f0)
+            self._push_interval(None, None, u0, f0)
+            self._push_interval(u0, f0, None, None)
         
-        best_x, best_f = u0, self.values[0]
+        self.status = "max iterations reached"
+        best = int(np.argmin(self.values))
+        best_x, best_f = float(self.points[best]), float(self.values[best])
         
         for iteration in range(max_iter):
             self.iterations = iteration + 1
             
-            # Находим минимум p_n(u)
-            u_new = self.find_min_p()
+            # Находим минимум p_n(u) (при batch_size > 1 - минимумы на нескольких интервалах)
+            t0 = clock()
+            selected = self._select(self.batch_size)
             
-            # Вычисляем J(u_new)
-            f_new = self.func(u_new)
+            # Вычисляем J(u_new) (в пуле - одновременно во всех точках)
+            t1 = clock()
+            f_selected = evaluate(self.func, [u for u, _, _ in selected], map_points).tolist()
             
-            # Вычисляем p_n(u_new)
-            p_val = self.p_function(u_new)
+            # Добавляем точки, первая из них - минимум p_n(u)
+            t2 = clock()
+            widths = [self._add_point(u, f, interval)
+                      for (u, _, interval), f in zip(selected, f_selected)]
+            t3 = clock()
+            u_new, p_val, _ = selected[0]
+            f_new, width = f_selected[0], widths[0]
             
             # Зазор
             gap = f_new - p_val
             
-            # Добавляем точку
-            self.points.append(u_new)
-            self.values.append(f_new)
-            
             # Обновляем лучшее решение
-            if f_new < best_f:
-                best_x, best_f = u_new, f_new
+            f_min = min(f_selected)
+            if f_min < best_f:
+                best_x, best_f = selected[f_selected.index(f_min)][0], f_min
             
-            # Вывод прогресса
-            if (iteration + 1) % 10 == 0:
-                print(f"Итерация {iteration+1}: u={u_new:.6f}, J={f_new:.6f}, зазор={gap:.6f}, лучший={best_f:.6f}")
+            # Событие итерации (при batch_size > 1 - о первой точке, минимуме p_n(u))
+            if callbacks:
+                event = IterationEvent(iteration + 1, u_new, f_new, p_val, gap, best_x, best_f,
+                                       len(self.history), t2 - t1, (t1 - t0) + (t3 - t2), t3 - start)
+                for callback in callbacks:
+                    callback(event)
             
             # Условие остановки
-            if gap < self.eps:
-                print(f"Достигнута точность на итерации {iteration+1}")
+            if best_f - p_val < self.eps and \
+                    (not self.local_L or width < MIN_WIDTH * (self.b - self.a)):
+                self.status = "solved"
+                break
+            if max_evaluations is not None and len(self.history) >= max_evaluations:
+                self.status = "max evaluations reached"
+                break
+            if max_time is not None and clock() - start >= max_time:
+                self.status = "time limit reached"
                 break
         
         self.optimization_time = time.time() - start_time
+        notify(callbacks, 'finish', self.status, self.iterations)
         
         # Возвращаем лучшую найденную точку
         return best_x, best_f
\ No newline at end of file
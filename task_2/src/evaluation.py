@@ -0,0 +1,135 @@
+import os
+import threading
+from collections import OrderedDict
+import numpy as np
+
+
+def vectorized(func):
+    """Пометка функции, которая принимает массив точек и возвращает массив значений"""
+    func.vectorized = True
+    return func
+
+
+def evaluate(func, u, map_points=map):
+    """
+    Значения функции в массиве точек u: векторизованная функция (см. vectorized)
+    вызывается один раз для всего массива, остальные - для каждой точки
+    через map_points (например, map пула потоков). Для CachedFunction
+    вычисляются только точки, которых нет в кэше
+    """
+    u = np.asarray(u, dtype=float)
+    if isinstance(func, CachedFunction):
+        return func.evaluate(u, map_points)
+    if getattr(func, 'vectorized', False):
+        return np.asarray(func(u), dtype=float)
+    return np.array(list(map_points(func, u.ravel())), dtype=float).reshape(u.shape)
+
+
+def evaluate_rows(func, points, map_points=map):
+    """Значения функции нескольких переменных в точках - строках массива points (см. evaluate)"""
+    points = np.asarray(points, dtype=float)
+    if getattr(func, 'vectorized', False):
+        return np.asarray(func(points), dtype=float)
+    return np.array(list(map_points(func, points)), dtype=float)
+
+
+class CachedFunction:
+    """
+    Функция с кэшем вычисленных значений.
+
+    Ключ - точка, округленная до tolerance, поэтому точки, отличающиеся
+    меньше чем на tolerance / 2, считаются одной. В памяти хранится не больше
+    max_size значений, при переполнении удаляется давно не использованное (LRU).
+    Если задан path, все вычисленные пары (x, J(x)) дописываются в файл,
+    отображаемый в память, и загружаются из него при следующем создании:
+    значения сохраняются между запусками (файл относится к одной функции).
+    """
+
+    # Начальное число пар в файле; при заполнении файл увеличивается вдвое
+    STORE_CAPACITY = 1024
+
+    def __init__(self, func, tolerance=1e-12, max_size=100000, path=None):
+        self.func = func
+        self.tolerance = tolerance
+        self.max_size = max_size
+        self.path = path
+        self.hits = 0     # Значений взято из кэша
+        self.misses = 0   # Значений вычислено
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()  # Кэш используется из потоков пула
+        self._store = None
+        self._count = 0
+        if path is not None:
+            self._open_store()
+
+    def __call__(self, x):
+        values = self.evaluate(np.asarray(x, dtype=float))
+        return values if values.ndim else float(values)
+
+    def _keys(self, u):
+        return np.rint(u / self.tolerance).tolist()
+
+    def evaluate(self, u, map_points=map):
+        """Значения в массиве точек u: из кэша или вычисленные функцией (см. evaluate)"""
+        u = np.asarray(u, dtype=float)
+        flat = u.ravel()
+        keys = self._keys(flat)
+        values = np.empty(len(flat))
+        missing = []
+        with self._lock:
+            for i, key in enumerate(keys):
+                value = self._cache.get(key)
+                if value is None:
+                    missing.append(i)
+                else:
+                    self._cache.move_to_end(key)
+                    values[i] = value
+            self.hits += len(flat) - len(missing)
+
+        if missing:
+            computed = evaluate(self.func, flat[missing], map_points)
+            values[missing] = computed
+            with self._lock:
+                self.misses += len(missing)
+                for i, value in zip(missing, computed.tolist()):
+                    self._remember(keys[i], value)
+                    if self._store is not None:
+                        self._append(flat[i], value)
+        return values.reshape(u.shape)
+
+    def _remember(self, key, value):
+        self._cache[key] = value
+        self._cache.move_to_end(key)
+        if len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+
+    def _open_store(self):
+        """Открытие файла пар (x, J(x)); свободные строки заполнены NaN"""
+        if not os.path.exists(self.path):
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            np.full((self.STORE_CAPACITY, 2), np.nan).tofile(self.path)
+        capacity = os.path.getsize(self.path) // 16
+        self._store = np.memmap(self.path, dtype=np.float64, mode='r+', shape=(capacity, 2))
+        empty = np.flatnonzero(np.isnan(self._store[:, 0]))
+        self._count = int(empty[0]) if len(empty) else capacity
+
+        # В памяти - последние max_size значений
+        stored = np.asarray(self._store[max(0, self._count - self.max_size):self._count])
+        for key, value in zip(self._keys(stored[:, 0]), stored[:, 1].tolist()):
+            self._remember(key, value)
+
+    def _append(self, x, value):
+        capacity = len(self._store)
+        if self._count == capacity:
+            self._store.flush()
+            self._store = None
+            with open(self.path, 'ab') as file:
+                np.full((capacity, 2), np.nan).tofile(file)
+            self._store = np.memmap(self.path, dtype=np.float64, mode='r+', shape=(2 * capacity, 2))
+        self._store[self._count] = (x, value)
+        self._count += 1
+
+    def flush(self):
+        """Запись файла значений на диск"""
+        if self._store is not None:
+            self._store.flush()
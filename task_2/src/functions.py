@@ -1,40 +1,50 @@
-import math
+import numpy as np
+from .evaluation import vectorized
 
+# Функции вычисляются средствами NumPy и принимают как число, так и массив точек
+
+@vectorized
 def rastrigin(x):
     """Функция Растригина"""
-    return 10 + x**2 - 10 * math.cos(2 * math.pi * x)
+    return 10 + x**2 - 10 * np.cos(2 * np.pi * x)
 
+@vectorized
 def shifted_rastrigin(x: float, shift: float = 1.5) -> float:
     """
     Сдвинутая функция Растригина
     """
     return rastrigin(x - shift)
 
+@vectorized
 def ackley(x):
     """Функция Экли"""
-    return -20 * math.exp(-0.2 * math.sqrt(0.5 * x**2)) - \
-           math.exp(0.5 * math.cos(2 * math.pi * x)) + 20 + math.exp(1)
+    return -20 * np.exp(-0.2 * np.sqrt(0.5 * x**2)) - \
+           np.exp(0.5 * np.cos(2 * np.pi * x)) + 20 + np.exp(1)
 
+@vectorized
 def multimodal(x):
     """Функция с несколькими минимумами"""
-    return math.sin(5*x) + 0.5 * math.cos(10*x) + 0.1 * x**2
+    return np.sin(5*x) + 0.5 * np.cos(10*x) + 0.1 * x**2
 
+@vectorized
 def complex_oscillatory(x: float) -> float:
     """
     Сложная осциллирующая функция с ярко выраженными локальными минимумами
     """
-    return math.sin(3*x) * math.cos(5*x) + 0.2 * (x - 1)**2 + 0.1 * math.sin(10*x)
+    return np.sin(3*x) * np.cos(5*x) + 0.2 * (x - 1)**2 + 0.1 * np.sin(10*x)
 
+@vectorized
 def simple_quadratic(x):
     """Простая квадратичная функция"""
     return (x - 1)**2 + 2
 
+@vectorized
 def multi_minima(x: float) -> float:
     """
     Функция с несколькими явными минимумами
     f(x) = (x^2 - 1)^2 + sin(10*x)^2
     """
-    return (x**2 - 1)**2 + math.sin(10*x)**2
+    return (x**2 - 1)**2 + np.sin(10*x)**2
 
 # Словарь функций
 functions = {
@@ -45,4 +55,37 @@ functions = {
     'quadratic': simple_quadratic,
     'complex_oscillatory': complex_oscillatory,
     'multi_minima': multi_minima
-}
\ No newline at end of file
+}
+
+# Отрезки поиска по умолчанию для функций библиотеки
+intervals = {
+    'rastrigin': (-2, 2),
+    'shifted_rastrigin': (-0.5, 3.5),
+    'ackley': (-5, 5),
+    'multimodal': (-3, 3),
+    'quadratic': (-2, 4),
+    'complex_oscillatory': (-2, 4),
+    'multi_minima': (-2, 2)
+}
+
+
+# Функции нескольких переменных: точка - последняя ось массива x (форма (..., N))
+
+@vectorized
+def rastrigin_nd(x):
+    """Функция Растригина N переменных, минимум 0 в начале координат"""
+    x = np.asarray(x, dtype=float)
+    return 10 * x.shape[-1] + np.sum(x**2 - 10 * np.cos(2 * np.pi * x), axis=-1)
+
+@vectorized
+def ackley_nd(x):
+    """Функция Экли N переменных, минимум 0 в начале координат"""
+    x = np.asarray(x, dtype=float)
+    return -20 * np.exp(-0.2 * np.sqrt(np.mean(x**2, axis=-1))) - \
+           np.exp(np.mean(np.cos(2 * np.pi * x), axis=-1)) + 20 + np.exp(1)
+
+# Словарь функций нескольких переменных
+functions_nd = {
+    'rastrigin': rastrigin_nd,
+    'ackley': ackley_nd
+}
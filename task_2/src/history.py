@@ -0,0 +1,96 @@
+import numpy as np
+
+
+class EvaluationHistory:
+    """
+    История вычислений: точки u_i и значения J(u_i) в непрерывных буферах
+    float64, которые при заполнении увеличиваются вдвое.
+
+    points и values - точки в порядке вычисления, sorted_points и
+    sorted_values - по возрастанию u; все четыре - представления буферов
+    без копирования (только для чтения). Упорядоченные буферы дополняются
+    новыми точками при первом обращении к ним после добавления.
+    """
+
+    # Начальная емкость буферов
+    CAPACITY = 64
+
+    def __init__(self, capacity=CAPACITY):
+        capacity = max(1, capacity)
+        self._points = np.empty(capacity)
+        self._values = np.empty(capacity)
+        self._sorted_points = np.empty(capacity)
+        self._sorted_values = np.empty(capacity)
+        self._size = 0
+        self._sorted_size = 0  # Сколько первых точек уже в упорядоченных буферах
+
+    def __len__(self):
+        return self._size
+
+    def _view(self, buffer, size):
+        view = buffer[:size]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def points(self):
+        return self._view(self._points, self._size)
+
+    @property
+    def values(self):
+        return self._view(self._values, self._size)
+
+    @property
+    def sorted_points(self):
+        self._merge()
+        return self._view(self._sorted_points, self._size)
+
+    @property
+    def sorted_values(self):
+        self._merge()
+        return self._view(self._sorted_values, self._size)
+
+    def clear(self):
+        self._size = self._sorted_size = 0
+
+    def _reserve(self, size):
+        """Увеличение буферов (не меньше чем вдвое), если в них не помещается size точек"""
+        if size <= len(self._points):
+            return
+        capacity = max(size, 2 * len(self._points))
+        for name in ('_points', '_values', '_sorted_points', '_sorted_values'):
+            buffer = np.empty(capacity)
+            buffer[:self._size] = getattr(self, name)[:self._size]
+            setattr(self, name, buffer)
+
+    def append(self, u, f):
+        """Добавление точки u со значением f"""
+        self._reserve(self._size + 1)
+        self._points[self._size] = u
+        self._values[self._size] = f
+        self._size += 1
+
+    def extend(self, points, values):
+        """Добавление нескольких точек"""
+        points = np.asarray(points, dtype=float).ravel()
+        values = np.asarray(values, dtype=float).ravel()
+        size = self._size + len(points)
+        self._reserve(size)
+        self._points[self._size:size] = points
+        self._values[self._size:size] = values
+        self._size = size
+
+    def _merge(self):
+        """Вставка новых точек в упорядоченные буферы"""
+        if self._sorted_size == self._size:
+            return
+        new_points = self._points[self._sorted_size:self._size]
+        new_values = self._values[self._sorted_size:self._size]
+        order = np.argsort(new_points, kind='stable')
+        new_points, new_values = new_points[order], new_values[order]
+        sorted_points = self._sorted_points[:self._sorted_size]
+        positions = np.searchsorted(sorted_points, new_points, side='right')
+        self._sorted_points[:self._size] = np.insert(sorted_points, positions, new_points)
+        self._sorted_values[:self._size] = np.insert(self._sorted_values[:self._sorted_size],
+                                                     positions, new_values)
+        self._sorted_size = self._size
@@ -0,0 +1,98 @@
+from collections import namedtuple
+import numpy as np
+
+# Событие итерации метода ломаных: номер итерации, новая точка u и J(u), значение
+# p_n в ней, зазор J(u) - p_n(u), лучшая точка и значение, число вычислений функции,
+# время вычисления функции и работы с огибающей на итерации, время с начала (с)
+IterationEvent = namedtuple('IterationEvent', [
+    'iteration', 'u', 'f', 'p', 'gap', 'best_x', 'best_f', 'evaluations',
+    'evaluation_time', 'envelope_time', 'elapsed'])
+
+# Событие итерации BoxOptimizer: номер итерации, число вычислений функции,
+# наименьшая оценка min (J(c) - L r), лучшая точка и значение
+BoxEvent = namedtuple('BoxEvent', ['iteration', 'evaluations', 'lower_bound', 'best_x', 'best_f'])
+
+# Тип элемента кольцевого буфера EventRecorder
+EVENT_DTYPE = np.dtype([(name, np.int64 if name in ('iteration', 'evaluations') else np.float64)
+                        for name in IterationEvent._fields])
+
+
+def notify(callbacks, name, *args):
+    """
+    Вызов необязательного метода name обработчиков событий, у которых он есть:
+    lipschitz(L) - константа Липшица оценена перед итерациями,
+    finish(status, iterations) - оптимизация завершена
+    """
+    for callback in callbacks:
+        method = getattr(callback, name, None)
+        if method is not None:
+            method(*args)
+
+
+class ProgressPrinter:
+    """Вывод хода оптимизации каждые every итераций, оценки L и итогов"""
+
+    def __init__(self, every=10):
+        self.every = every
+
+    def __call__(self, event):
+        if event.iteration % self.every == 0:
+            print(f"Итерация {event.iteration}: u={event.u:.6f}, J={event.f:.6f}, "
+                  f"зазор={event.gap:.6f}, лучший={event.best_f:.6f}")
+
+    def lipschitz(self, L):
+        print(f"Константа Липшица: {L:.4f}")
+
+    def finish(self, status, iterations):
+        if status == "solved":
+            print(f"Достигнута точность на итерации {iterations}")
+
+
+class BoxProgressPrinter(ProgressPrinter):
+    """Вывод хода BoxOptimizer каждые every итераций (события BoxEvent)"""
+
+    def __init__(self, every=1000):
+        super().__init__(every)
+
+    def __call__(self, event):
+        if event.iteration % self.every == 0:
+            print(f"Итерация {event.iteration}: вычислений={event.evaluations}, "
+                  f"оценка={event.lower_bound:.6f}, лучший={event.best_f:.6f}")
+
+
+class EventRecorder:
+    """
+    Запись событий итераций в кольцевой буфер: хранятся последние capacity
+    событий, суммарное время вычисления функции и работы с огибающей
+    считается по всем итерациям. Запись события - только присваивание
+    элементу списка; в массив NumPy события собираются при чтении.
+    """
+
+    def __init__(self, capacity=10000):
+        self._buffer = [None] * capacity
+        self.count = 0               # Всего записано событий
+        self.evaluation_time = 0.0
+        self.envelope_time = 0.0
+
+    def __call__(self, event):
+        self._buffer[self.count % len(self._buffer)] = event
+        self.count += 1
+        self.evaluation_time += event.evaluation_time
+        self.envelope_time += event.envelope_time
+
+    def __len__(self):
+        return min(self.count, len(self._buffer))
+
+    @property
+    def events(self):
+        """Сохраненные события в порядке итераций - структурированный массив (EVENT_DTYPE)"""
+        if self.count <= len(self._buffer):
+            events = self._buffer[:self.count]
+        else:
+            start = self.count % len(self._buffer)
+            events = self._buffer[start:] + self._buffer[:start]
+        return np.array(events, dtype=EVENT_DTYPE)
+
+    def clear(self):
+        self.count = 0
+        self.evaluation_time = self.envelope_time = 0.0
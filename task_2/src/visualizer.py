@@ -1,6 +1,7 @@
 import matplotlib.pyplot as plt
 import numpy as np
 import os
+from .evaluation import evaluate
 
 class Visualizer:
     """Визуализатор"""
@@ -18,8 +19,8 @@ class Visualizer:
         
         # Сетка для построения
         x = np.linspace(self.optimizer.a, self.optimizer.b, 1000)
-        y_func = [self.optimizer.func(xi) for xi in x]
-        y_p = [self.optimizer.p_function(xi) for xi in x]
+        y_func = evaluate(self.optimizer.func, x)
+        y_p = self.optimizer.p_function(x)
         
         fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 5))
         